@@ -20,6 +20,19 @@ export const db = new sqlite3.Database(dbPath, (err) => {
   }
 });
 
+// 导入事务持有写锁时，其他连接的写语句最多等这么久，超时才报 SQLITE_BUSY
+const BUSY_TIMEOUT = 5000;
+db.configure('busyTimeout', BUSY_TIMEOUT);
+
+// 数据导入专用连接：/data-import 的 BEGIN ... COMMIT 都在这个连接上执行，
+// 其他路由在 db 上的语句不会混进导入事务，也不会跟着它一起提交或回滚
+export const importDb = new sqlite3.Database(dbPath, (err) => {
+  if (err) {
+    console.error('导入连接打开失败:', err.message);
+  }
+});
+importDb.configure('busyTimeout', BUSY_TIMEOUT);
+
 export const initDatabase = (): Promise<void> => {
   return new Promise((resolve, reject) => {
     console.log('开始初始化数据库...');
@@ -2,6 +2,7 @@ import cors from 'cors';
 import express from 'express';
 import { initDatabase } from './database/init';
 import { authenticateToken } from './middleware/auth';
+import { BODY_LIMIT, decompressBody } from './middleware/decompress';
 import authRoutes from './routes/auth';
 import customerRoutes from './routes/customers';
 import dataImportRoutes from './routes/data-import';
@@ -30,6 +31,12 @@ app.use(cors({
   methods: ['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'],
   allowedHeaders: ['Content-Type', 'Authorization']
 }));
+
+// 数据导入：先验证令牌，再解压（gzip/deflate 由 express.json 自行解压，br 先由 decompressBody 解压）
+// 并按 BODY_LIMIT 解析几 MB 的批量请求体；要挂在全局解析器之前，否则请求体先被默认的 100kb 上限拒绝。
+// 其他路由（包括未登录就能访问的 /api/auth）仍用默认的解析器，不为匿名请求解压和缓冲大请求体
+app.use('/api/data-import', authenticateToken, decompressBody, express.json({ limit: BODY_LIMIT }), dataImportRoutes);
+
 app.use(express.json());
 app.use(express.urlencoded({ extended: true }));
 
@@ -42,7 +49,6 @@ initDatabase().then(() => {
 
 // 路由
 app.use('/api/auth', authRoutes);
-app.use('/api/data-import', authenticateToken, dataImportRoutes);
 app.use('/api/items', authenticateToken, itemRoutes);
 app.use('/api/suppliers', authenticateToken, supplierRoutes);
 app.use('/api/customers', authenticateToken, customerRoutes);
@@ -0,0 +1,78 @@
+import { NextFunction, Request, Response } from 'express';
+import { Readable } from 'stream';
+import zlib from 'zlib';
+
+// 请求体（解压后）的大小上限，express.json / express.raw 和这里共用
+export const BODY_LIMIT = process.env.JSON_BODY_LIMIT || '10mb';
+
+const parseLimit = (limit: string) => {
+  const match = /^(\d+(?:\.\d+)?)\s*(b|kb|mb|gb)?$/i.exec(limit.trim());
+  if (!match) return 10 * 1024 * 1024;
+  const units: any = { b: 1, kb: 1024, mb: 1024 ** 2, gb: 1024 ** 3 };
+  return Math.floor(parseFloat(match[1]) * units[(match[2] || 'b').toLowerCase()]);
+};
+
+const maxBodyBytes = parseLimit(BODY_LIMIT);
+
+const contentEncoding = (req: Request) =>
+  String(req.headers['content-encoding'] || 'identity').trim().toLowerCase();
+
+// 按 Content-Encoding 返回解压后的请求体流，未压缩时就是 req 本身；不支持的编码返回 null
+// 供 /data-import/stream 这类边收边处理的接口使用
+export const decodedStream = (req: Request): Readable | null => {
+  switch (contentEncoding(req)) {
+    case 'identity': return req;
+    case 'gzip': return req.pipe(zlib.createGunzip());
+    case 'deflate': return req.pipe(zlib.createInflate());
+    case 'br': return req.pipe(zlib.createBrotliDecompress());
+  }
+  return null;
+};
+
+// express.json / express.raw 自带 gzip 和 deflate 解压，但不支持 br：
+// 这里先把 br 请求体整体读出并解压，再按 Content-Type 解析，设置 req._body 让后面的解析器跳过。
+// 流式 NDJSON 请求由路由自己用 decodedStream 解压，这里不缓冲
+export const decompressBody = (req: Request, res: Response, next: NextFunction) => {
+  if (contentEncoding(req) !== 'br' || req.is('application/x-ndjson')) {
+    return next();
+  }
+
+  const chunks: Buffer[] = [];
+  let received = 0;
+  let failed = false;
+
+  req.on('data', (chunk: Buffer) => {
+    received += chunk.length;
+    if (received > maxBodyBytes && !failed) {
+      failed = true;
+      res.status(413).json({ error: '请求体过大' });
+      return;
+    }
+    chunks.push(chunk);
+  });
+
+  req.on('end', () => {
+    if (failed) return;
+    zlib.brotliDecompress(Buffer.concat(chunks), { maxOutputLength: maxBodyBytes }, (err, body) => {
+      if (err) {
+        return res.status(400).json({ error: '请求体解压失败', details: err.message });
+      }
+
+      try {
+        if (req.is('application/json')) {
+          req.body = body.length ? JSON.parse(body.toString('utf8')) : {};
+        } else {
+          req.body = body;
+        }
+      } catch (parseError: any) {
+        return res.status(400).json({ error: '请求体不是合法的 JSON', details: parseError.message });
+      }
+
+      (req as any)._body = true;
+      delete req.headers['content-encoding'];
+      next();
+    });
+  });
+
+  req.on('error', next);
+};
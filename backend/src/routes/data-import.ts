@@ -1,10 +1,40 @@
 import express from 'express';
-import { db } from '../database/init';
+import { db, importDb } from '../database/init';
+import { BODY_LIMIT, decodedStream } from '../middleware/decompress';
+import { decodeMsgpack } from '../utils/msgpack';
 import fs from 'fs';
 import path from 'path';
+import { StringDecoder } from 'string_decoder';
 
 const router = express.Router();
 
+// 允许导入的表（安全检查）
+const allowedTables = [
+  'items', 'suppliers', 'customers', 'warehouses',
+  'sales_orders', 'sales_order_items', 
+  'purchase_orders', 'purchase_order_items',
+  'inventory', 'inventory_transactions'
+];
+
+// 列名只允许小写字母、数字和下划线，防止通过列名注入SQL
+const columnPattern = /^[a-z_][a-z0-9_]*$/;
+
+// 导入请求都在专用连接 importDb 上执行（其他路由用 db，语句进不了导入事务），
+// 这里再让导入请求之间按顺序逐个执行，避免彼此的语句混进对方的事务
+let writeChain: Promise<void> = Promise.resolve();
+const withWriteLock = (task: (done: () => void) => void) => {
+  writeChain = writeChain.then(() => new Promise<void>(resolve => task(resolve)));
+};
+
+// 写锁被占用属于临时繁忙，返回 503 + Retry-After 让客户端降速重试
+const sendImportError = (res: express.Response, err: any, extra: any = {}) => {
+  if (err.code === 'SQLITE_BUSY') {
+    res.set('Retry-After', '1');
+    return res.status(503).json({ error: '数据库繁忙', details: err.message, ...extra });
+  }
+  return res.status(500).json({ error: '数据导入失败', details: err.message, ...extra });
+};
+
 // 数据导入端点（仅限管理员）
 router.post('/import', (req, res) => {
   try {
@@ -14,34 +44,489 @@ router.post('/import', (req, res) => {
       return res.status(400).json({ error: '缺少表名或数据' });
     }
 
-    // 验证表名（安全检查）
-    const allowedTables = [
-      'items', 'suppliers', 'customers', 'warehouses',
-      'sales_orders', 'sales_order_items', 
-      'purchase_orders', 'purchase_order_items',
-      'inventory', 'inventory_transactions'
-    ];
-
     if (!allowedTables.includes(tableName)) {
       return res.status(400).json({ error: '不允许的表名' });
     }
 
     // 执行SQL导入
-    db.exec(data, (err) => {
+    withWriteLock(done => {
+      importDb.exec(data, (err: any) => {
+        if (err) {
+          // exec 在出错的语句处停下，脚本自己开的事务（BEGIN; ... COMMIT;）不会结束，
+          // 这里回滚，免得后面的导入落进这个事务；没有进行中的事务时 ROLLBACK 的报错忽略即可
+          return importDb.run('ROLLBACK', () => {
+            done();
+            console.error('数据导入错误:', err);
+            sendImportError(res, err);
+          });
+        }
+        done();
+        res.json({ message: `${tableName} 数据导入成功` });
+      });
+    });
+
+  } catch (error) {
+    console.error('数据导入错误:', error);
+    res.status(500).json({ error: '服务器错误' });
+  }
+});
+
+// 批量导入中的一张表：行数据由 row(i) 按需取出，JSON 和列式载荷共用同一段插入逻辑
+// replace 为 true 时先删掉表中原有的行再插入，删除与插入在同一个事务里提交
+interface BulkTable {
+  tableName: string;
+  columns: string[];
+  rowCount: number;
+  replace: boolean;
+  row: (index: number) => any[];
+}
+
+const validColumns = (columns: any) =>
+  Array.isArray(columns) && columns.length > 0 &&
+  columns.every((column: any) => typeof column === 'string' && columnPattern.test(column));
+
+// 各表实际存在的列（PRAGMA table_info），第一次用到时读取一次；
+// validColumns 只检查列名的格式，表里没有的列要在排入任何语句之前挡下来
+let tableColumns: Map<string, Set<string>> | null = null;
+const loadTableColumns = (callback: (err: any) => void) => {
+  if (tableColumns) return callback(null);
+  const columns = new Map<string, Set<string>>();
+  let pending = allowedTables.length;
+  let failed = false;
+  allowedTables.forEach(tableName => {
+    db.all(`PRAGMA table_info(${tableName})`, (err: any, rows: any[]) => {
+      if (failed) return;
       if (err) {
-        console.error('数据导入错误:', err);
-        return res.status(500).json({ error: '数据导入失败', details: err.message });
+        failed = true;
+        return callback(err);
+      }
+      columns.set(tableName, new Set(rows.map((row: any) => row.name)));
+      if (--pending === 0) {
+        tableColumns = columns;
+        callback(null);
       }
-      
-      res.json({ message: `${tableName} 数据导入成功` });
+    });
+  });
+};
+
+// 表里没有的列的错误信息，列全部存在时返回 null（须在 loadTableColumns 之后调用）
+const unknownColumns = (tableName: string, columns: string[]) => {
+  const known = tableColumns!.get(tableName);
+  const unknown = columns.filter(column => !known || !known.has(column));
+  return unknown.length ? `${tableName} 没有这些列: ${unknown.join(', ')}` : null;
+};
+
+// JSON 载荷：{ tables: [{ tableName, columns: [...], rows: [[...], ...], replace? }, ...] }
+const parseJsonTables = (body: any): BulkTable[] | string => {
+  const { tables } = body || {};
+  if (!Array.isArray(tables) || tables.length === 0) return '缺少导入数据';
+
+  for (const table of tables) {
+    if (!allowedTables.includes(table.tableName)) return `不允许的表名: ${table.tableName}`;
+    if (!validColumns(table.columns)) return `列名不合法: ${table.tableName}`;
+    if (!Array.isArray(table.rows) ||
+        !table.rows.every((row: any) => Array.isArray(row) && row.length === table.columns.length)) {
+      return `行数据与列数不一致: ${table.tableName}`;
+    }
+  }
+  return tables.map((table: any) => ({
+    tableName: table.tableName,
+    columns: table.columns,
+    rowCount: table.rows.length,
+    replace: table.replace === true,
+    row: (index: number) => table.rows[index]
+  }));
+};
+
+// 列式载荷（MessagePack）：{ tables: [{ tableName, rowCount, columns: [{ name, type, data }], replace? }] }
+// type 为 i8 / i16 / i32 / i64 / f64 时 data 是小端序的定长数组，any 时 data 是普通数组
+const columnWidths: any = { i8: 1, i16: 2, i32: 4, i64: 8, f64: 8 };
+
+const columnReader = (column: any, rowCount: number): ((index: number) => any) | null => {
+  const { type, data } = column;
+  if (type === 'any') {
+    return Array.isArray(data) && data.length === rowCount ? (index: number) => data[index] : null;
+  }
+  if (!columnWidths[type] || !Buffer.isBuffer(data) || data.length !== rowCount * columnWidths[type]) return null;
+  switch (type) {
+    case 'i8': return (index: number) => data.readInt8(index);
+    case 'i16': return (index: number) => data.readInt16LE(index * 2);
+    case 'i32': return (index: number) => data.readInt32LE(index * 4);
+    case 'i64': return (index: number) => Number(data.readBigInt64LE(index * 8));
+    case 'f64': return (index: number) => data.readDoubleLE(index * 8);
+  }
+  return null;
+};
+
+const parseColumnarTables = (buffer: Buffer): BulkTable[] | string => {
+  let payload: any;
+  try {
+    payload = decodeMsgpack(buffer);
+  } catch (err: any) {
+    return `列式数据解码失败: ${err.message}`;
+  }
+  const { tables } = payload || {};
+  if (!Array.isArray(tables) || tables.length === 0) return '缺少导入数据';
+
+  const result: BulkTable[] = [];
+  for (const table of tables) {
+    const { tableName, rowCount, columns } = table;
+    if (!allowedTables.includes(tableName)) return `不允许的表名: ${tableName}`;
+    if (!Array.isArray(columns) || !validColumns(columns.map((column: any) => column && column.name))) {
+      return `列名不合法: ${tableName}`;
+    }
+    if (!Number.isInteger(rowCount) || rowCount < 0) return `行数不合法: ${tableName}`;
+
+    const readers = columns.map((column: any) => columnReader(column, rowCount));
+    if (readers.some((reader: any) => reader === null)) return `列数据与行数不一致: ${tableName}`;
+
+    result.push({
+      tableName,
+      columns: columns.map((column: any) => column.name),
+      rowCount,
+      replace: table.replace === true,
+      row: (index: number) => readers.map((reader: any) => reader(index))
+    });
+  }
+  return result;
+};
+
+// 批量导入端点：一个请求携带多张表的行，用预编译语句在同一个事务中插入，按数组顺序插入
+// 请求体为 JSON，或 Content-Type: application/msgpack 的列式载荷
+router.post('/bulk', express.raw({ type: 'application/msgpack', limit: BODY_LIMIT }), (req, res) => {
+  try {
+    const tables = Buffer.isBuffer(req.body) ? parseColumnarTables(req.body) : parseJsonTables(req.body);
+    if (typeof tables === 'string') {
+      return res.status(400).json({ error: tables });
+    }
+
+    loadTableColumns((err: any) => {
+      if (err) {
+        console.error('批量导入错误:', err);
+        return sendImportError(res, err);
+      }
+      const unknown = tables.map(table => unknownColumns(table.tableName, table.columns)).find(Boolean);
+      if (unknown) {
+        return res.status(400).json({ error: unknown });
+      }
+
+      withWriteLock(done => {
+        // BEGIN 成功后才排入插入语句，否则这些语句会在自动提交模式下逐行生效
+        importDb.run('BEGIN IMMEDIATE TRANSACTION', (err: any) => {
+          if (err) {
+            done();
+            console.error('批量导入错误:', err);
+            return sendImportError(res, err);
+          }
+
+          let failure: any = null;
+          const counts: any = {};
+          let totalRows = 0;
+
+          importDb.serialize(() => {
+            // 同一表和列组合只预编译一次
+            const statements = new Map<string, any>();
+            tables.forEach((table, index) => {
+              if (table.replace) {
+                importDb.run(`DELETE FROM ${table.tableName}`, (err: any) => {
+                  if (err && !failure) failure = { err, table: table.tableName, batch: index };
+                });
+              }
+              const key = `${table.tableName}(${table.columns.join(',')})`;
+              let stmt = statements.get(key);
+              if (!stmt) {
+                const placeholders = table.columns.map(() => '?').join(', ');
+                // 预编译失败时 Statement 会抛出 'error' 事件，没有回调接住就会让进程崩溃
+                stmt = importDb.prepare(`INSERT INTO ${table.tableName} (${table.columns.join(', ')}) VALUES (${placeholders})`,
+                  (err: any) => {
+                    if (err && !failure) failure = { err, table: table.tableName, batch: index };
+                  });
+                statements.set(key, stmt);
+              }
+              for (let rowIndex = 0; rowIndex < table.rowCount; rowIndex++) {
+                stmt.run(table.row(rowIndex), (err: any) => {
+                  if (err && !failure) failure = { err, table: table.tableName, batch: index, row: rowIndex };
+                });
+              }
+              counts[table.tableName] = (counts[table.tableName] || 0) + table.rowCount;
+              totalRows += table.rowCount;
+            });
+            statements.forEach(stmt => stmt.finalize());
+
+            // 前面的语句都执行完后再决定提交还是回滚
+            importDb.get('SELECT 1', () => {
+              if (failure) {
+                const { err: cause, ...where } = failure;
+                console.error('批量导入错误:', cause);
+                return importDb.run('ROLLBACK', () => {
+                  done();
+                  sendImportError(res, cause, where);
+                });
+              }
+              importDb.run('COMMIT', (err: any) => {
+                if (err) {
+                  // COMMIT 失败（如读者持有共享锁时的 SQLITE_BUSY）事务仍未结束，回滚后再放开写锁，
+                  // 否则 importDb 一直停在这个事务里，之后的 BEGIN 全部失败
+                  console.error('批量导入错误:', err);
+                  return importDb.run('ROLLBACK', () => {
+                    done();
+                    sendImportError(res, err);
+                  });
+                }
+                done();
+                res.json({ message: `批量导入成功：${totalRows} 行`, tables: counts, rows: totalRows });
+              });
+            });
+          });
+        });
+      });
     });
 
   } catch (error) {
-    console.error('数据导入错误:', error);
+    console.error('批量导入错误:', error);
     res.status(500).json({ error: '服务器错误' });
   }
 });
 
+// 流式导入时排队等待执行的 INSERT 超过上限就暂停读取请求体，降到下限再继续，
+// 使服务器内存占用与总行数无关
+const STREAM_HIGH_WATER = 1000;
+const STREAM_LOW_WATER = 100;
+
+// 流式导入端点：请求体是分块传输的 NDJSON，边接收边插入，整个请求在一个事务中提交
+// 对象行 {"tableName": ..., "columns": [...]} 切换当前表，数组行 [...] 是当前表的一行数据
+// 请求体可以用 gzip / br 压缩（Content-Encoding），边解压边处理
+router.post('/stream', (req, res) => {
+  const source = decodedStream(req);
+  if (!source) {
+    return res.status(415).json({ error: '不支持的 Content-Encoding' });
+  }
+
+  // 断开监听在排队等写锁之前就挂上：排队期间断开的请求不会再触发 end，拿到写锁后要直接放弃，
+  // 否则事务永远不结束、写锁永远不释放；事务开始后断开则回滚，已插入的行不会留下
+  let gone: any = null;
+  let onGone: ((err: any) => void) | null = null;
+  const abort = (err: any) => {
+    if (gone) return;
+    gone = err;
+    if (onGone) onGone(err);
+  };
+  req.on('error', abort);
+  if (source !== req) source.on('error', abort);
+  req.on('aborted', () => abort(new Error('客户端中断了上传')));
+  req.on('close', () => {
+    if (!req.complete) abort(new Error('客户端中断了上传'));
+  });
+
+  // 表头行要同步检查列是否存在，先读好各表的列再排队等写锁
+  loadTableColumns((err: any) => {
+    if (err) {
+      console.error('流式导入错误:', err);
+      source.resume();
+      return sendImportError(res, err);
+    }
+
+    withWriteLock(done => {
+      if (gone || req.destroyed) {
+        done();
+        return res.status(400).json({ error: gone ? gone.message : '客户端中断了上传' });
+      }
+
+      const decoder = new StringDecoder('utf8');
+      const statements = new Map<string, any>();
+      const counts: any = {};
+      let buffer = '';
+      let lineNo = 0;
+      let totalRows = 0;
+      let current: any = null;
+      let queued = 0;
+      let paused = false;
+      let ended = false;
+      let finished = false;
+      let failure: any = null;
+
+      const fail = (status: number, err: any, extra: any = {}) => {
+        if (!failure) failure = { status, err, ...extra };
+      };
+
+      const handleLine = (text: string) => {
+        lineNo++;
+        if (failure || !text.trim()) return;
+
+        let value: any;
+        try {
+          value = JSON.parse(text);
+        } catch (err) {
+          return fail(400, err, { line: lineNo });
+        }
+
+        if (!Array.isArray(value)) {
+          const { tableName, columns } = value || {};
+          if (!allowedTables.includes(tableName)) {
+            return fail(400, new Error('不允许的表名'), { line: lineNo, table: tableName });
+          }
+          if (!validColumns(columns)) {
+            return fail(400, new Error('列名不合法'), { line: lineNo, table: tableName });
+          }
+          const unknown = unknownColumns(tableName, columns);
+          if (unknown) {
+            return fail(400, new Error(unknown), { line: lineNo, table: tableName });
+          }
+          const key = `${tableName}(${columns.join(',')})`;
+          if (!statements.has(key)) {
+            const placeholders = columns.map(() => '?').join(', ');
+            // 预编译失败时 Statement 会抛出 'error' 事件，没有回调接住就会让进程崩溃
+            const line = lineNo;
+            statements.set(key, importDb.prepare(`INSERT INTO ${tableName} (${columns.join(', ')}) VALUES (${placeholders})`,
+              (err: any) => {
+                if (err) fail(500, err, { line, table: tableName });
+              }));
+          }
+          current = { tableName, width: columns.length, stmt: statements.get(key) };
+          return;
+        }
+
+        if (!current) {
+          return fail(400, new Error('数据行之前缺少表头行'), { line: lineNo });
+        }
+        if (value.length !== current.width) {
+          return fail(400, new Error('行数据与列数不一致'), { line: lineNo, table: current.tableName });
+        }
+
+        const line = lineNo;
+        const tableName = current.tableName;
+        queued++;
+        importDb.serialize(() => {
+          current.stmt.run(value, (err: any) => {
+            queued--;
+            if (err) fail(500, err, { line, table: tableName });
+            if (paused && queued <= STREAM_LOW_WATER) {
+              paused = false;
+              source.resume();
+            }
+            finish();
+          });
+        });
+        counts[tableName] = (counts[tableName] || 0) + 1;
+        totalRows++;
+        if (!paused && queued >= STREAM_HIGH_WATER) {
+          paused = true;
+          source.pause();
+        }
+      };
+
+      // 请求体读完且排队的 INSERT 全部执行后，提交或回滚
+      const finish = () => {
+        if (!ended || queued > 0 || finished) return;
+        finished = true;
+        statements.forEach(stmt => stmt.finalize());
+
+        if (failure) {
+          const { status, err, ...where } = failure;
+          console.error('流式导入错误:', err);
+          return importDb.run('ROLLBACK', () => {
+            done();
+            if (status === 400) {
+              return res.status(400).json({ error: err.message, ...where });
+            }
+            sendImportError(res, err, where);
+          });
+        }
+        importDb.run('COMMIT', (err: any) => {
+          if (err) {
+            // 与 /bulk 相同：COMMIT 失败时事务仍未结束，回滚后再放开写锁
+            console.error('流式导入错误:', err);
+            return importDb.run('ROLLBACK', () => {
+              done();
+              sendImportError(res, err);
+            });
+          }
+          done();
+          res.json({ message: `流式导入成功：${totalRows} 行`, tables: counts, rows: totalRows });
+        });
+      };
+
+      importDb.run('BEGIN IMMEDIATE TRANSACTION', (err: any) => {
+        if (err) {
+          done();
+          console.error('流式导入错误:', err);
+          source.resume();
+          return sendImportError(res, err);
+        }
+
+        onGone = (err: any) => {
+          fail(400, err);
+          ended = true;
+          finish();
+        };
+        if (gone) return onGone(gone);
+
+        source.on('data', (chunk: Buffer) => {
+          const lines = (buffer + decoder.write(chunk)).split('\n');
+          buffer = lines.pop() || '';
+          lines.forEach(handleLine);
+        });
+        source.on('end', () => {
+          handleLine(buffer + decoder.end());
+          ended = true;
+          finish();
+        });
+      });
+    });
+  });
+});
+
+// 单次预留的主键数量上限
+const MAX_ALLOCATE_IDS = 1000000;
+
+// 预留主键区间：把表的 AUTOINCREMENT 计数器推进 count，返回 [start, end]
+// 客户端用这段 id 显式插入主表行并直接写进明细行的外键，不必先插入再回查 id；
+// 之后其他请求自增出的 id 都在 end 之后，不会冲突
+router.post('/allocate-ids', (req, res) => {
+  const { tableName, count } = req.body || {};
+  if (!allowedTables.includes(tableName)) {
+    return res.status(400).json({ error: '不允许的表名' });
+  }
+  if (!Number.isInteger(count) || count <= 0 || count > MAX_ALLOCATE_IDS) {
+    return res.status(400).json({ error: `预留数量必须是 1-${MAX_ALLOCATE_IDS} 的整数` });
+  }
+
+  withWriteLock(done => {
+    const fail = (err: any) => {
+      done();
+      console.error('预留主键错误:', err);
+      sendImportError(res, err);
+    };
+    importDb.run('BEGIN IMMEDIATE TRANSACTION', (err: any) => {
+      if (err) return fail(err);
+      // 计数器可能落后于显式插入的最大 id，两者取大
+      importDb.get(
+        `SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = ?), 0),
+                COALESCE((SELECT MAX(id) FROM ${tableName}), 0)) AS last`,
+        [tableName],
+        (err: any, row: any) => {
+          if (err) return importDb.run('ROLLBACK', () => fail(err));
+          const start = row.last + 1;
+          const end = row.last + count;
+          importDb.run('UPDATE sqlite_sequence SET seq = ? WHERE name = ?', [end, tableName], function (this: any, err: any) {
+            if (err) return importDb.run('ROLLBACK', () => fail(err));
+            // 从未插入过行的表在 sqlite_sequence 中还没有记录
+            const sql = this.changes ? 'SELECT 1' : 'INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)';
+            importDb.run(sql, this.changes ? [] : [tableName, end], (err: any) => {
+              if (err) return importDb.run('ROLLBACK', () => fail(err));
+              importDb.run('COMMIT', (err: any) => {
+                if (err) return importDb.run('ROLLBACK', () => fail(err));
+                done();
+                res.json({ tableName, start, end });
+              });
+            });
+          });
+        }
+      );
+    });
+  });
+});
+
 // 获取表数据统计
 router.get('/stats', (req, res) => {
   try {
@@ -99,17 +584,21 @@ router.post('/clear-all', (req, res) => {
       'DELETE FROM warehouses'
     ];
 
-    let completed = 0;
-    
-    clearQueries.forEach(query => {
-      db.run(query, (err) => {
-        if (err) {
-          console.error('清空数据错误:', err);
-        }
-        completed++;
-        if (completed === clearQueries.length) {
-          res.json({ message: '所有数据已清空' });
-        }
+    // 和导入共用 importDb，排进写锁，免得 DELETE 落进正在进行的导入事务
+    withWriteLock(done => {
+      let completed = 0;
+
+      clearQueries.forEach(query => {
+        importDb.run(query, (err) => {
+          if (err) {
+            console.error('清空数据错误:', err);
+          }
+          completed++;
+          if (completed === clearQueries.length) {
+            done();
+            res.json({ message: '所有数据已清空' });
+          }
+        });
       });
     });
 
@@ -0,0 +1,84 @@
+// 最小的 MessagePack 解码器，只支持批量导入用到的类型：nil / bool / 整数 / 浮点 / str / bin / array / map
+// bin 直接返回原 Buffer 的切片，不复制数据
+export const decodeMsgpack = (buffer: Buffer): any => {
+  let pos = 0;
+
+  const take = (length: number) => {
+    if (pos + length > buffer.length) {
+      throw new Error('MessagePack 数据不完整');
+    }
+    const start = pos;
+    pos += length;
+    return start;
+  };
+
+  const readString = (length: number) => {
+    const start = take(length);
+    return buffer.toString('utf8', start, start + length);
+  };
+
+  const readBinary = (length: number) => {
+    const start = take(length);
+    return buffer.subarray(start, start + length);
+  };
+
+  const readArray = (length: number) => {
+    const result = new Array(length);
+    for (let i = 0; i < length; i++) {
+      result[i] = read();
+    }
+    return result;
+  };
+
+  const readMap = (length: number) => {
+    const result: any = {};
+    for (let i = 0; i < length; i++) {
+      const key = read();
+      result[key] = read();
+    }
+    return result;
+  };
+
+  const read = (): any => {
+    const byte = buffer[take(1)];
+
+    if (byte <= 0x7f) return byte;
+    if (byte >= 0xe0) return byte - 0x100;
+    if (byte >= 0x80 && byte <= 0x8f) return readMap(byte & 0x0f);
+    if (byte >= 0x90 && byte <= 0x9f) return readArray(byte & 0x0f);
+    if (byte >= 0xa0 && byte <= 0xbf) return readString(byte & 0x1f);
+
+    switch (byte) {
+      case 0xc0: return null;
+      case 0xc2: return false;
+      case 0xc3: return true;
+      case 0xc4: return readBinary(buffer.readUInt8(take(1)));
+      case 0xc5: return readBinary(buffer.readUInt16BE(take(2)));
+      case 0xc6: return readBinary(buffer.readUInt32BE(take(4)));
+      case 0xca: return buffer.readFloatBE(take(4));
+      case 0xcb: return buffer.readDoubleBE(take(8));
+      case 0xcc: return buffer.readUInt8(take(1));
+      case 0xcd: return buffer.readUInt16BE(take(2));
+      case 0xce: return buffer.readUInt32BE(take(4));
+      case 0xcf: return Number(buffer.readBigUInt64BE(take(8)));
+      case 0xd0: return buffer.readInt8(take(1));
+      case 0xd1: return buffer.readInt16BE(take(2));
+      case 0xd2: return buffer.readInt32BE(take(4));
+      case 0xd3: return Number(buffer.readBigInt64BE(take(8)));
+      case 0xd9: return readString(buffer.readUInt8(take(1)));
+      case 0xda: return readString(buffer.readUInt16BE(take(2)));
+      case 0xdb: return readString(buffer.readUInt32BE(take(4)));
+      case 0xdc: return readArray(buffer.readUInt16BE(take(2)));
+      case 0xdd: return readArray(buffer.readUInt32BE(take(4)));
+      case 0xde: return readMap(buffer.readUInt16BE(take(2)));
+      case 0xdf: return readMap(buffer.readUInt32BE(take(4)));
+    }
+    throw new Error(`不支持的 MessagePack 类型 0x${byte.toString(16)}`);
+  };
+
+  const value = read();
+  if (pos !== buffer.length) {
+    throw new Error('MessagePack 数据末尾有多余字节');
+  }
+  return value;
+};
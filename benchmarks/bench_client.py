@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""连接池客户端微基准：对比旧脚本的裸 requests.post 与共享 ApiClient 的请求吞吐
+
+用法（先在 backend 目录 npm run dev 启动本地后端）：
+    python3 benchmarks/bench_client.py --url http://localhost:3001/api -n 200
+"""
+import argparse
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wms_data.client import ApiClient
+
+# 不写入任何数据的导入语句，只测量请求本身的开销
+NOOP_SQL = "SELECT 1;"
+
+
+def bench_bare(base_url, n):
+    """旧写法：每次登录 + 每批都用裸 requests.post（每次新建连接）"""
+    response = requests.post(f"{base_url}/auth/login",
+                             json={"username": "admin", "password": "123456"})
+    token = response.json().get("token")
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+
+    start = time.perf_counter()
+    for _ in range(n):
+        requests.post(f"{base_url}/data-import/import", headers=headers,
+                      json={"tableName": "items", "data": NOOP_SQL})
+    return n / (time.perf_counter() - start)
+
+
+def bench_pooled(base_url, n):
+    """新写法：共享会话 keep-alive + 缓存 token"""
+    client = ApiClient(base_url)
+    client.login()
+
+    start = time.perf_counter()
+    for _ in range(n):
+        client.import_data("items", NOOP_SQL)
+    elapsed = time.perf_counter() - start
+    client.close()
+    return n / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 客户端连接池基准")
+    parser.add_argument("--url", default="http://localhost:3001/api")
+    parser.add_argument("-n", type=int, default=200, help="每种方式发送的请求数")
+    args = parser.parse_args()
+
+    bare = bench_bare(args.url, args.n)
+    pooled = bench_pooled(args.url, args.n)
+
+    print(f"裸 requests.post : {bare:8.1f} req/s")
+    print(f"共享 ApiClient   : {pooled:8.1f} req/s")
+    print(f"提升             : {pooled / bare:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
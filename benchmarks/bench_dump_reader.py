@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""转储解析基准：DumpReader 读 sqlite3 .dump 的吞吐和内存，并与 SQLite 装载的结果逐行核对
+
+先读 data-export/ 下的每个文件，再生成一个 --mb 大小的合成转储（备注里有逗号、引号、换行、
+“);” 和伪造的 INSERT，还有 NULL、负数、科学计数法和 BLOB）。合成转储用 sqlite3 装载后
+与 DumpReader 的结果逐行比较，另外统计精确路径（不走 NumPy 快速路径）和多进程解析的速度作对照，
+以及列式缓存的建立、再次打开和整列读取的耗时；多进程和缓存读回的结果都要与单进程逐行相同：
+    python3 benchmarks/bench_dump_reader.py --mb 200 --workers 8
+"""
+import argparse
+import math
+import os
+import random
+import resource
+import sqlite3
+import sys
+import tempfile
+import time
+from itertools import zip_longest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from wms_data import dump_cache, dump_reader
+from wms_data.dump_reader import DumpReader
+from wms_data.dump_sink import DUMP_FOOTER, DUMP_HEADER, dump_literal
+
+CREATE = ("CREATE TABLE notes (id INTEGER PRIMARY KEY, order_no TEXT, amount DECIMAL(10,2), "
+          "quantity INTEGER, ratio REAL, remarks TEXT, payload BLOB)")
+REMARKS = ["", "加急", "客户说：\"尽快\"", "a, b, c", "O'Brien's order", "第一行\n第二行", "含 ); 的备注",
+           "\nINSERT INTO notes VALUES(1,'x');\n", "tab\there", "\r\nwindows"]
+
+
+def synthetic_dump(path, megabytes, seed):
+    """写一个约 megabytes MB 的转储，返回行数"""
+    rng = random.Random(seed)
+    size = megabytes * 1024 * 1024
+    rows = 0
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(DUMP_HEADER + CREATE + ";\n")
+        while f.tell() < size:
+            lines = []
+            for _ in range(1000):
+                rows += 1
+                remarks = rng.choice(REMARKS) if rng.random() < 0.05 else None
+                payload = rng.randbytes(4) if rng.random() < 0.001 else None
+                amount = rng.choice([round(rng.uniform(-1000, 100000), 2), rng.randint(0, 99999), 1.5e-7])
+                row = (rows, f"SO-{rows:08d}", amount, rng.randint(-5, 10 ** 12), rng.random(), remarks, payload)
+                lines.append(f"INSERT INTO notes VALUES({','.join(map(dump_literal, row))});\n")
+            f.write("".join(lines))
+        f.write(DUMP_FOOTER)
+    return rows
+
+
+def same(row, want):
+    """逐列比较；实数允许差最后一位（SQLite 解析实数不保证正确舍入，DumpReader 与 float() 一致）"""
+    return len(row) == len(want) and all(
+        value == expected or (isinstance(value, float) and math.isclose(value, expected, rel_tol=4e-16))
+        for value, expected in zip(row, want))
+
+
+def read_all(path, workers=1):
+    """读完整个文件，返回 (行数, 秒)"""
+    start = time.perf_counter()
+    count = 0
+    with DumpReader(path) as reader:
+        for name, columns in reader.blocks(workers=workers):
+            count += len(columns[0])
+    return count, time.perf_counter() - start
+
+
+def report(label, path, count, seconds):
+    megabytes = os.path.getsize(path) / 1024 / 1024
+    print(f"  {label:<28} {megabytes:8.1f} MB {count:>11,} 行  {seconds:7.2f} s  {megabytes / seconds:6.1f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="转储解析基准")
+    parser.add_argument("--mb", type=int, default=100, help="合成转储的大小（MB）")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="多进程解析的进程数")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    export = os.path.join(ROOT, "data-export")
+    print("data-export/：")
+    for name in sorted(os.listdir(export)):
+        if name.endswith(".sql"):
+            path = os.path.join(export, name)
+            report(name, path, *read_all(path))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "notes.sql")
+        rows = synthetic_dump(path, args.mb, args.seed)
+        print("合成转储：")
+        count, single = read_all(path)
+        report("NumPy 快速路径", path, count, single)
+        parallel_same = True
+        if args.workers > 1:
+            count, seconds = read_all(path, args.workers)
+            report(f"{args.workers} 进程（加速 {single / seconds:.1f}x）", path, count, seconds)
+            with DumpReader(path) as reader, DumpReader(path) as parallel:
+                parallel_same = all(a == b for a, b in zip_longest(reader.rows(), parallel.rows(workers=args.workers)))
+        block_bytes, dump_reader._BLOCK_BYTES = dump_reader._BLOCK_BYTES, 0
+        try:
+            report("精确路径", path, *read_all(path))
+        finally:
+            dump_reader._BLOCK_BYTES = block_bytes
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+        # 列式缓存：第一次打开时解析并写缓存，之后直接映射
+        start = time.perf_counter()
+        dump_cache.open_cache(path, args.workers)
+        built = time.perf_counter() - start
+        start = time.perf_counter()
+        cached = dump_cache.open_cache(path)["notes"]
+        opened = time.perf_counter() - start
+        start = time.perf_counter()
+        total_amount = float(cached.array("amount").sum())
+        summed = time.perf_counter() - start
+        with DumpReader(path) as reader:
+            cache_same = all(a == b for a, b in zip_longest(
+                reader.rows(), (row for _, columns in cached.blocks() for row in zip(*columns))))
+        print(f"  列式缓存：建立 {built:.2f} s，再次打开 {opened * 1000:.1f} ms，"
+              f"amount 整列求和 {summed * 1000:.1f} ms（{total_amount:,.0f}），读回{'与解析结果相同' if cache_same else '不同'}")
+
+        db = sqlite3.connect(os.path.join(tmp, "notes.db"))
+        with open(path, encoding="utf-8") as f:
+            db.executescript(f.read())
+        expected = db.execute("SELECT * FROM notes ORDER BY id")
+        with DumpReader(path) as reader:
+            mismatches = sum(not same(row, want) for row, want in zip(reader.rows(), expected))
+        total = db.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+        db.close()
+
+    ok = mismatches == 0 and total == rows and parallel_same and cache_same
+    print(f"  解析期间峰值 RSS {peak:.1f} MB；与 SQLite 装载结果 {rows - mismatches:,}/{total:,} 行一致，"
+          f"多进程与单进程{'相同' if parallel_same else '不同'}  {'✅' if ok else '❌'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""订单生成基准：逐单循环的 generate_realistic_sales_data 对比 NumPy 向量化版本
+
+同时打印两者的分布统计（订单金额、折扣、状态、时段），用于确认分布一致。
+逐单循环的订单金额由明细汇总（按金额预算从商品目录挑选），这里用一个价格密集的
+模拟目录，使明细金额贴近预算：
+    python3 benchmarks/bench_generator.py -n 10000000
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import itertools
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from wms_data.orders import Product
+from wms_data.vectorized import sales_order_arrays
+
+START = datetime(2025, 1, 1, 0, 0, 0)
+RENDER_CHUNK = 1_000_000
+# 售价 49, 99, ..., 4999，进价为售价的七成
+CATALOG = [Product(i, price, round(price * 0.7, 2)) for i, price in enumerate(range(49, 5000, 50), 1)]
+
+
+def load_script():
+    spec = importlib.util.spec_from_file_location(
+        "million_revenue", os.path.join(ROOT, "generate-million-revenue-data.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def loop_rows(script, n):
+    """反复调用原来的逐单循环，直到凑够 n 个订单"""
+    rows = []
+    ids = itertools.count(1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        while len(rows) < n:
+            for batch in script.generate_realistic_sales_data(START, CATALOG, ids):
+                if batch.table == "sales_orders":
+                    rows.extend(batch.values)
+    return rows[:n]
+
+
+def parse_loop_rows(rows):
+    """从表头行元组中取出 (小时, 金额, 折扣, 状态)"""
+    return [(int(row[4][11:13]), row[5], row[6], row[13]) for row in rows]
+
+
+def describe(name, hours, totals, discounts, statuses):
+    totals = np.asarray(totals)
+    discounts = np.asarray(discounts)
+    statuses = np.asarray(statuses)
+    discounted = discounts > 0
+    print(f"  {name}")
+    print(f"    订单金额 均值 {totals.mean():9.1f}  中位数 {np.median(totals):8.0f}  "
+          f"P95 {np.percentile(totals, 95):8.0f}  最大 {totals.max():6d}")
+    print(f"    有折扣 {discounted.mean():.3%}  "
+          f"折扣均值 {discounts[discounted].mean():6.2f}")
+    print("    状态 " + "  ".join(f"{s} {np.mean(statuses == s):.3%}"
+                                for s in ("completed", "pending", "cancelled")))
+    hist = np.bincount(np.asarray(hours), minlength=24)[9:21] / len(hours)
+    print("    时段 " + " ".join(f"{h:.3f}" for h in hist))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="订单生成器基准")
+    parser.add_argument("-n", type=int, default=10_000_000, help="向量化版本生成的订单数")
+    parser.add_argument("--loop-n", type=int, default=100_000, help="逐单循环生成的订单数（用于测速和对比分布）")
+    args = parser.parse_args()
+
+    script = load_script()
+    random.seed(1)
+    start = time.perf_counter()
+    rows = loop_rows(script, args.loop_n)
+    loop_seconds = time.perf_counter() - start
+    loop_rate = len(rows) / loop_seconds
+
+    rng = np.random.default_rng(1)
+    start = time.perf_counter()
+    orders = sales_order_arrays(rng, START, days=max(1, round(args.n / 66)))
+    generate_seconds = time.perf_counter() - start
+    # 分块渲染成行元组（与导入时一样逐块消费），避免千万行元组同时留在内存里
+    start = time.perf_counter()
+    for chunk_start in range(0, len(orders), RENDER_CHUNK):
+        orders.rows(chunk_start, chunk_start + RENDER_CHUNK)
+    render_seconds = time.perf_counter() - start
+    vector_rate = len(orders) / (generate_seconds + render_seconds)
+
+    print(f"逐单循环   {len(rows):>11,} 单  {loop_seconds:7.2f} s  {loop_rate:12,.0f} 单/s")
+    print(f"向量化     {len(orders):>11,} 单  生成 {generate_seconds:5.2f} s + 渲染 {render_seconds:5.2f} s  "
+          f"{vector_rate:12,.0f} 单/s  （{vector_rate / loop_rate:.0f}x）")
+    print(f"按循环速度生成 {len(orders):,} 单约需 {len(orders) / loop_rate / 60:.1f} 分钟")
+
+    print("\n分布对比：")
+    hours, totals, discounts, statuses = zip(*parse_loop_rows(rows))
+    describe("逐单循环", hours, totals, discounts, statuses)
+    describe("向量化", orders.hour, orders.total_amount, orders.discount_amount,
+             np.asarray(["completed", "pending", "cancelled"])[orders.status])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""库存推导基准：百万级出入库明细的分组累加、补货插入和期末库存
+
+随机生成已完成的采购入库和销售出库（出库多于入库，逼出补货），经 InventoryLedger.track 记录后
+分别统计 track 和 derive 的耗时，并核对：每组结存不为负，期末库存 = 期初 + 流水之和：
+    python3 benchmarks/bench_inventory.py --movements 5000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from wms_data.importer import InsertBatch
+from wms_data.inventory import InventoryLedger
+
+ITEMS = 2000
+WAREHOUSES = 5
+LINES_PER_ORDER = 2
+BATCH_ORDERS = 5000
+EPOCH = np.datetime64("2023-01-01T00:00:00")
+SPAN_SECONDS = 3 * 365 * 86400
+
+
+def order_batches(rng, table, item_table, quantity_column, cost_column, orders, first_id):
+    """一类订单的表头和明细批次（Python 值元组，与生成脚本的批次形式相同）"""
+    for start in range(0, orders, BATCH_ORDERS):
+        count = min(BATCH_ORDERS, orders - start)
+        ids = np.arange(first_id + start, first_id + start + count)
+        seconds = rng.integers(0, SPAN_SECONDS, count)
+        dates = np.datetime_as_string(EPOCH + seconds.astype("timedelta64[s]"), unit="s")
+        dates = np.char.replace(dates, "T", " ").tolist()
+        warehouses = rng.integers(1, WAREHOUSES + 1, count).tolist()
+        headers = [(order_id, warehouse, date, "completed")
+                   for order_id, warehouse, date in zip(ids.tolist(), warehouses, dates)]
+        yield InsertBatch(table, "id, warehouse_id, order_date, status", headers)
+
+        line_orders = np.repeat(ids, LINES_PER_ORDER).tolist()
+        items = rng.integers(1, ITEMS + 1, len(line_orders)).tolist()
+        quantities = rng.integers(1, 30, len(line_orders)).tolist()
+        costs = np.round(rng.uniform(5, 500, len(line_orders)), 2).tolist()
+        lines = list(zip(line_orders, items, quantities, costs))
+        yield InsertBatch(item_table, f"order_id, item_id, {quantity_column}, {cost_column}", lines)
+
+
+def synthetic_batches(movements, seed):
+    rng = np.random.default_rng(seed)
+    orders = movements // LINES_PER_ORDER
+    purchases = orders // 3
+    yield from order_batches(rng, "purchase_orders", "purchase_order_items", "received_quantity", "unit_price",
+                             purchases, 1)
+    yield from order_batches(rng, "sales_orders", "sales_order_items", "delivered_quantity", "unit_cost",
+                             orders - purchases, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="库存推导基准")
+    parser.add_argument("--movements", type=int, default=1_000_000, help="出入库明细行数")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    opening = [(item, warehouse, 50, 10.0) for item in range(1, ITEMS + 1, 7) for warehouse in (1, 2)]
+    ledger = InventoryLedger(opening)
+    start = time.perf_counter()
+    for _ in ledger.track(synthetic_batches(args.movements, args.seed)):
+        pass
+    tracked = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = ledger.derive()
+    derived = time.perf_counter() - start
+
+    movements, inventory = result["movements"], result["inventory"]
+    rows = len(movements["quantity"])
+    print(f"{rows:,} 条流水（含 {ledger.replenishments:,} 次补货），{len(inventory['quantity']):,} 组 (商品, 仓库)")
+    print(f"  track  {tracked:7.2f} s  {args.movements / tracked:12,.0f} 行/s")
+    print(f"  derive {derived:7.2f} s  {rows / derived:12,.0f} 行/s")
+
+    # 按 (商品, 仓库) 重放流水核对
+    key = movements["item_id"] << 32 | movements["warehouse_id"]
+    opening_key = {item << 32 | warehouse: quantity for item, warehouse, quantity, _ in opening}
+    closing_key = inventory["item_id"] << 32 | inventory["warehouse_id"]
+    group_start = np.flatnonzero(np.concatenate(([True], key[1:] != key[:-1])))
+    start_balance = np.array([opening_key.get(k, 0) for k in key[group_start].tolist()], dtype=np.int64)
+    counts = np.diff(np.append(group_start, rows))
+    total = np.cumsum(movements["quantity"])
+    balance = total - np.repeat(total[group_start] - movements["quantity"][group_start] - start_balance, counts)
+    closing = dict(zip(closing_key.tolist(), inventory["quantity"].tolist()))
+    ends = dict(zip(key[group_start + counts - 1].tolist(), balance[group_start + counts - 1].tolist()))
+    consistent = all(closing[k] == ends.get(k, opening_key.get(k, 0)) for k in closing)
+    ok = balance.min() >= 0 and consistent and len(np.unique(key[group_start])) == len(group_start)
+    print(f"  最低结存 {balance.min()}，期末库存与流水{'一致' if consistent else '不一致'}  {'✅' if ok else '❌'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
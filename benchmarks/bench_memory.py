@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""内存基准：千万级 sales_order_items 的生成 → 格式化 → 分批 → 写出，峰值 RSS 与数据量无关
+
+用 generate-massive-demo-data.py 的按月分片生成订单及明细，经 order_batches 分批写成 gzip SQL 转储
+（SqliteSink 有 256 MB 的页缓存，这里不用它）。每个规模在单独的子进程里跑，
+取子进程的峰值 RSS；任何一个规模超过 --limit-mb 时以退出码 1 结束，可以直接放进 CI：
+    python3 benchmarks/bench_memory.py --items 10000000 --limit-mb 200
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from wms_data.dump_sink import DumpSink
+
+NOW = datetime(2025, 9, 17, 12, 0, 0)
+SEED = 1
+# 每个销售订单平均约 1.86 条明细（1-3 个商品，部分预算只买得起一种）
+ITEMS_PER_ORDER = 1.86
+
+
+def load_script():
+    spec = importlib.util.spec_from_file_location(
+        "massive_demo", os.path.join(ROOT, "generate-massive-demo-data.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_child(orders, workers):
+    """在当前进程生成 orders 个销售订单，打印 明细行数 耗时 峰值RSS(MB)"""
+    script = load_script()
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(io.StringIO()):
+            with DumpSink(tmp) as sink:
+                script.generate_sales_orders(NOW, SEED, workers, sink.catalog(), orders, sink)
+                items = sink.rows.get("sales_order_items", 0)
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) / 1024
+    print(items, time.perf_counter() - start, peak)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="造数流水线内存基准")
+    parser.add_argument("--items", type=int, default=10_000_000, help="最大规模的 sales_order_items 行数")
+    parser.add_argument("--limit-mb", type=float, default=200, help="允许的峰值 RSS（MB）")
+    parser.add_argument("--workers", type=int, default=1, help="并行生成分片的进程数（峰值取单个进程）")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        run_child(args.child, args.workers)
+        return
+
+    failed = False
+    for items in (args.items // 100, args.items // 10, args.items):
+        orders = max(1, round(items / ITEMS_PER_ORDER))
+        command = [sys.executable, os.path.abspath(__file__), "--child", str(orders), "--workers", str(args.workers)]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout.split()
+        lines, seconds, peak = int(output[0]), float(output[1]), float(output[2])
+        ok = peak <= args.limit_mb
+        failed = failed or not ok
+        print(f"{orders:>11,} 单 {lines:>12,} 条明细  {seconds:7.1f} s  峰值 RSS {peak:6.1f} MB  "
+              f"{'✅' if ok else '❌ 超过 ' + format(args.limit_mb, 'g') + ' MB'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""整表迁移基准：data-export/ 每张表的全部行迁移进 wms.db 兼容的 SQLite 文件的速度
+
+转储先拷到临时目录（列式缓存建在临时目录里，不动 data-export/），每张表分别统计：
+- 建缓存：第一次迁移时完整解析转储、写列式缓存
+- 读取：从缓存读出、按列名映射、切成 --batch-rows 行一批（不写库）
+- 迁移：读取并经 SqliteSink 写入（凑满一个分片一次事务），重复 --repeat 次取最快
+最后核对每张表写入的行数与转储相同、外键没有悬空：
+    python3 benchmarks/bench_migration.py --repeat 5
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from wms_data.dump_cache import open_cache
+from wms_data.migration import DEFAULT_BATCH_ROWS, export_files, migration_batches
+from wms_data.sqlite_sink import SqliteSink
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def read_rows(files, batch_rows):
+    return sum(len(batch) for batch in migration_batches(files, batch_rows))
+
+
+def migrate(path, files, batch_rows):
+    """把 files 迁移进 path 处的新库，返回 {表: 秒} 和写入后的 {表: 行数}"""
+    seconds = {}
+    with contextlib.redirect_stdout(io.StringIO()), SqliteSink(path) as sink:
+        for table, _ in reversed(files):
+            sink.clear(table)
+        for entry in files:
+            _, seconds[entry[0]] = timed(sink.import_all, migration_batches([entry], batch_rows))
+        counts = {table: sink.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table, _ in files}
+        orphans = sink.conn.execute("PRAGMA foreign_key_check").fetchall()
+    return seconds, counts, orphans
+
+
+def main():
+    parser = argparse.ArgumentParser(description="整表迁移基准")
+    parser.add_argument("--dir", default=os.path.join(ROOT, "data-export"), help="转储目录")
+    parser.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS, help="每批的行数")
+    parser.add_argument("--repeat", type=int, default=3, help="迁移重复的次数，取最快的一次")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        export = os.path.join(tmp, "data-export")
+        shutil.copytree(args.dir, export, ignore=shutil.ignore_patterns(".columnar"))
+        files = export_files(export)
+
+        built = {}
+        totals = {}
+        for table, path in files:
+            tables, built[table] = timed(open_cache, path)
+            totals[table] = len(tables[table]) if table in tables else 0
+        read = {table: timed(read_rows, [(table, path)], args.batch_rows)[1] for table, path in files}
+
+        best = {}
+        for attempt in range(args.repeat):
+            db = os.path.join(tmp, f"wms-{attempt}.db")
+            seconds, counts, orphans = migrate(db, files, args.batch_rows)
+            os.remove(db)
+            for table, value in seconds.items():
+                best[table] = min(best.get(table, value), value)
+
+    print(f"{'表':<24}{'行数':>10}{'建缓存 s':>10}{'读取 s':>9}{'迁移 s':>9}{'迁移 行/s':>13}")
+    for table, _ in files:
+        rate = totals[table] / best[table] if best[table] > 0 else 0
+        print(f"{table:<24}{totals[table]:>10,}{built[table]:>10.3f}{read[table]:>9.3f}{best[table]:>9.3f}{rate:>13,.0f}")
+    rows = sum(totals.values())
+    seconds = sum(best.values())
+    print(f"{'合计':<24}{rows:>10,}{sum(built.values()):>10.3f}{sum(read.values()):>9.3f}"
+          f"{seconds:>9.3f}{rows / seconds:>13,.0f}")
+
+    ok = counts == totals and not orphans
+    print(f"写入行数与转储{'相同' if counts == totals else '不同'}，悬空外键 {len(orphans)} 处  {'✅' if ok else '❌'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""导入载荷基准：同样 10 万行 sales_order_items，对比三种请求体
+
+- SQL 字符串：现有 /data-import/import 路径，每批约 30 个订单的明细拼成一条 INSERT
+- JSON 信封：/data-import/bulk 的按行 JSON
+- 列式 MessagePack：/data-import/bulk 的列式载荷
+
+默认只在本地编码并比较线上字节数；加 --url 时实际发送到本地后端（会真的写入数据，请用测试库），
+再加 --server-pid 时读取后端进程的 /proc/<pid>/stat 统计服务器为每种载荷消耗的 CPU 时间：
+    python3 benchmarks/bench_payload.py --url http://localhost:3001/api --server-pid $(pgrep -f ts-node)
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wms_data.client import ApiClient
+from wms_data.columnar import encode_envelope
+from wms_data.importer import InsertBatch
+
+COLUMNS = "order_id, item_id, quantity, unit_price, discount, amount"
+# 现有脚本每批 30 个订单、平均每单约 1.9 行明细
+SQL_BATCH_ROWS = 57
+
+
+def generate_rows(n, seed=42):
+    """与 generate-million-revenue-data.py 相同分布的订单明细"""
+    rng = random.Random(seed)
+    rows = []
+    order_id = 1
+    while len(rows) < n:
+        for _ in range(rng.choices([1, 2, 3, 4], weights=[50, 30, 15, 5])[0]):
+            item_id = rng.randint(1, 20)
+            quantity = rng.choices([1, 2, 3, 4, 5], weights=[60, 25, 10, 3, 2])[0]
+            unit_price = rng.randint(200, 5000)
+            discount = rng.randint(0, min(100, unit_price // 20)) if rng.random() < 0.2 else 0
+            rows.append((order_id, item_id, quantity, unit_price, discount, unit_price * quantity - discount))
+        order_id += 1
+    return rows[:n]
+
+
+def build_payloads(rows):
+    """返回 {名称: (请求体列表, 接口路径, Content-Type, 编码耗时)}"""
+    batches = [InsertBatch("sales_order_items", COLUMNS, rows[i:i + SQL_BATCH_ROWS])
+               for i in range(0, len(rows), SQL_BATCH_ROWS)]
+    payloads = {}
+
+    start = time.perf_counter()
+    sql_bodies = [json.dumps({"tableName": batch.table, "data": batch.to_sql()}).encode("utf-8")
+                  for batch in batches]
+    payloads["SQL 字符串"] = (sql_bodies, "/data-import/import", "application/json",
+                            time.perf_counter() - start)
+
+    start = time.perf_counter()
+    envelope = {"tables": [batch.payload() for batch in batches]}
+    json_body = json.dumps(envelope, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    payloads["JSON 信封"] = ([json_body], "/data-import/bulk", "application/json",
+                           time.perf_counter() - start)
+
+    start = time.perf_counter()
+    columnar_body = encode_envelope(batches)
+    payloads["列式 MessagePack"] = ([columnar_body], "/data-import/bulk", "application/msgpack",
+                                  time.perf_counter() - start)
+    return payloads
+
+
+def process_cpu_seconds(pid):
+    """读取进程累计的 用户态+内核态 CPU 时间（秒）"""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def send_payload(client, bodies, path, content_type):
+    for body in bodies:
+        response = client.post(path, data=body, headers={"Content-Type": content_type})
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} 返回 {response.status_code}: {response.text[:200]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="导入载荷体积与服务器 CPU 基准")
+    parser.add_argument("-n", type=int, default=100000, help="sales_order_items 行数")
+    parser.add_argument("--url", help="本地后端地址；不传则只比较编码后的字节数")
+    parser.add_argument("--server-pid", type=int, help="后端进程 PID，用于统计服务器 CPU 时间")
+    args = parser.parse_args()
+
+    rows = generate_rows(args.n)
+    payloads = build_payloads(rows)
+    baseline = sum(len(body) for body in payloads["SQL 字符串"][0])
+
+    client = None
+    if args.url:
+        client = ApiClient(args.url)
+        client.login()
+
+    print(f"{args.n:,} 行 sales_order_items")
+    for name, (bodies, path, content_type, encode_seconds) in payloads.items():
+        size = sum(len(body) for body in bodies)
+        line = (f"{name:<14} {len(bodies):5d} 个请求  {size / 1024:10.1f} KB  "
+                f"({size / baseline:5.1%})  编码 {encode_seconds * 1000:7.1f} ms")
+
+        if client is not None:
+            cpu_before = process_cpu_seconds(args.server_pid) if args.server_pid else None
+            start = time.perf_counter()
+            send_payload(client, bodies, path, content_type)
+            line += f"  发送 {time.perf_counter() - start:6.2f} s"
+            if cpu_before is not None:
+                line += f"  服务器 CPU {process_cpu_seconds(args.server_pid) - cpu_before:6.2f} s"
+        print(line)
+
+    if client is not None:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""离线建库基准：scale-to-million 的按天分片直接写进 SQLite 文件
+
+分别统计生成、写入（每个分片一次事务的 executemany）和最后建索引的耗时，
+确认百万订单的演示库能在一分钟内建好：
+    python3 benchmarks/bench_sqlite_sink.py -n 1000000
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from wms_data.importer import InsertBatch
+from wms_data.shards import run_shards
+from wms_data.sqlite_sink import SqliteSink
+
+NOW = datetime(2025, 9, 17, 12, 0, 0)
+SEED = 1
+
+
+def load_script():
+    spec = importlib.util.spec_from_file_location(
+        "scale_to_million", os.path.join(ROOT, "scale-to-million.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线建库基准")
+    parser.add_argument("-n", type=int, default=1_000_000, help="销售订单数")
+    parser.add_argument("--workers", type=int, default=1, help="并行生成分片的进程数")
+    args = parser.parse_args()
+
+    script = load_script()
+    columns = ", ".join(script.SALES_COLUMNS)
+    shards = script.daily_shards("sales_orders", SEED, NOW, args.n, script.SALES_DAYS)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "wms.db")
+        generate_seconds = write_seconds = 0
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            sink = SqliteSink(path)
+            create_seconds = time.perf_counter() - start
+            results = run_shards(script.sales_order_shard, shards, SEED, args.workers)
+            while True:
+                start = time.perf_counter()
+                rows = next(results, None)
+                generate_seconds += time.perf_counter() - start
+                if rows is None:
+                    break
+                start = time.perf_counter()
+                sink.write_shard([InsertBatch("sales_orders", columns, rows)])
+                write_seconds += time.perf_counter() - start
+            start = time.perf_counter()
+            sink.close()
+            close_seconds = time.perf_counter() - start
+        size = os.path.getsize(path) / 1024 / 1024
+
+    total = create_seconds + generate_seconds + write_seconds + close_seconds
+    print(f"建表       {create_seconds:7.2f} s")
+    print(f"生成       {generate_seconds:7.2f} s  {args.n / generate_seconds:12,.0f} 单/s")
+    print(f"写入       {write_seconds:7.2f} s  {args.n / write_seconds:12,.0f} 行/s  "
+          f"（{len(shards)} 个分片 = {len(shards)} 次事务）")
+    print(f"建索引收尾 {close_seconds:7.2f} s")
+    print(f"合计       {total:7.2f} s  → {args.n:,} 单的 wms.db（{size:.1f} MB）")
+
+
+if __name__ == "__main__":
+    main()
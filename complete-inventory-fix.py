@@ -1,19 +1,7 @@
 #!/usr/bin/env python3
-import requests
-import time
 import random
 
-RAILWAY_URL = "https://web-production-7a257.up.railway.app/api"
-
-def login():
-    response = requests.post(f"{RAILWAY_URL}/auth/login", 
-                           json={"username": "admin", "password": "123456"})
-    return response.json().get("token") if response.status_code == 200 else None
-
-def import_data(token, table_name, sql_data):
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-    data = {"tableName": table_name, "data": sql_data}
-    return requests.post(f"{RAILWAY_URL}/data-import/import", headers=headers, json=data)
+from wms_data.client import RAILWAY_URL, api, compression_report, import_data, login, pacing_report
 
 def get_all_items(token):
     """获取所有商品"""
@@ -22,7 +10,7 @@ def get_all_items(token):
     page = 1
     
     while True:
-        response = requests.get(f"{RAILWAY_URL}/items?page={page}&pageSize=50", headers=headers)
+        response = api.get(f"{RAILWAY_URL}/items?page={page}&pageSize=50", headers=headers)
         if response.status_code == 200:
             data = response.json()
             items = data.get('data', [])
@@ -46,7 +34,6 @@ def create_complete_inventory(token):
     print("🗑️ 清理现有库存数据...")
     clear_response = import_data(token, "inventory", "DELETE FROM inventory;")
     print(f"清理结果: {clear_response.text}")
-    time.sleep(2)
     
     # 2. 获取所有商品
     print("📋 获取所有商品...")
@@ -87,7 +74,6 @@ def create_complete_inventory(token):
             print(f"✅ 批次 {i//batch_size + 1} 成功")
         else:
             print(f"❌ 批次 {i//batch_size + 1} 失败: {response.text}")
-        time.sleep(0.5)
     
     print(f"🎉 库存数据创建完成：{len(inventory_records)} 条记录")
 
@@ -96,7 +82,7 @@ def test_final_inventory(token):
     print("\n🧪 测试最终库存显示...")
     
     headers = {"Authorization": f"Bearer {token}"}
-    inventory_response = requests.get(f"{RAILWAY_URL}/inventory", headers=headers)
+    inventory_response = api.get(f"{RAILWAY_URL}/inventory", headers=headers)
     
     if inventory_response.status_code == 200:
         inventory_data = inventory_response.json()
@@ -145,7 +131,7 @@ def main():
     
     # 最终统计
     headers = {"Authorization": f"Bearer {token}"}
-    stats_response = requests.get(f"{RAILWAY_URL}/data-import/stats", headers=headers)
+    stats_response = api.get(f"{RAILWAY_URL}/data-import/stats", headers=headers)
     if stats_response.status_code == 200:
         stats = stats_response.json()
         print(f"\n📊 最终数据统计:")
@@ -160,5 +146,8 @@ def main():
     print("📊 库存状态和预警功能正常")
     print("\n🚀 请刷新库存管理页面查看完美效果！")
 
+    print(pacing_report())
+    print(compression_report())
+
 if __name__ == "__main__":
     main()
@@ -1,117 +1,40 @@
 #!/usr/bin/env python3
-import re
+import argparse
 import json
-import requests
-import time
 
-# Railway API配置
-RAILWAY_URL = "https://web-production-7a257.up.railway.app/api"
-
-def login():
-    """登录获取token"""
-    response = requests.post(f"{RAILWAY_URL}/auth/login", 
-                           json={"username": "admin", "password": "123456"})
-    if response.status_code == 200:
-        return response.json().get("token")
-    else:
-        print(f"登录失败: {response.text}")
-        return None
+from wms_data.bulk import DEFAULT_ENVELOPE_BYTES
+from wms_data.client import RAILWAY_URL, api, compression_report, import_data, login, pacing_report
+from wms_data.importer import BulkImporter
+from wms_data.migration import DEFAULT_BATCH_ROWS, MigrationProgress, export_files, migration_batches, table_rows
+from wms_data.projection import dump_batches
+from wms_data.sqlite_sink import SqliteSink
 
 def clear_data(token):
     """清空现有数据"""
     headers = {"Authorization": f"Bearer {token}"}
-    response = requests.post(f"{RAILWAY_URL}/data-import/clear-all", headers=headers)
+    response = api.post(f"{RAILWAY_URL}/data-import/clear-all", headers=headers)
     print(f"清空数据: {response.text}")
 
-def convert_sales_order(values):
-    """转换销售订单数据格式"""
-    # 原格式: id, order_no, customer_id, warehouse_id, order_date, delivery_date, 
-    #         total_amount, subtotal, tax_amount, discount, status, notes, created_at, updated_at
-    # 新格式: order_number, customer_id, total_amount, tax_amount, discount_amount, status, order_date, created_by
-    
-    parts = values.split(',')
-    if len(parts) < 14:
-        return None
-        
-    order_id = parts[0].strip()
-    order_no = parts[1].strip().strip("'")
-    customer_id = parts[2].strip()
-    total_amount = parts[6].strip()
-    tax_amount = parts[8].strip()
-    discount = parts[9].strip()
-    status = parts[10].strip().strip("'")
-    order_date = parts[4].strip().strip("'")
-    
-    return f"INSERT INTO sales_orders (order_number, customer_id, total_amount, tax_amount, discount_amount, status, order_date, created_by) VALUES ('{order_no}', {customer_id}, {total_amount}, {tax_amount}, {discount}, '{status}', '{order_date}', 1);"
-
-def convert_purchase_order(values):
-    """转换采购订单数据格式"""
-    parts = values.split(',')
-    if len(parts) < 12:
-        return None
-        
-    order_no = parts[1].strip().strip("'")
-    supplier_id = parts[2].strip()
-    total_amount = parts[5].strip()
-    tax_amount = parts[7].strip() if len(parts) > 7 else "0"
-    status = parts[8].strip().strip("'") if len(parts) > 8 else "'pending'"
-    order_date = parts[4].strip().strip("'")
-    
-    return f"INSERT INTO purchase_orders (order_number, supplier_id, total_amount, tax_amount, status, order_date, created_by) VALUES ('{order_no}', {supplier_id}, {total_amount}, {tax_amount}, {status}, '{order_date}', 1);"
-
-def import_data(token, table_name, sql_data):
-    """导入数据到Railway"""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-    
-    data = {
-        "tableName": table_name,
-        "data": sql_data
-    }
-    
-    response = requests.post(f"{RAILWAY_URL}/data-import/import", 
-                           headers=headers, json=data)
-    return response
-
-def process_file(filename, converter_func, table_name, token):
+def process_file(filename, table_name, token):
     """处理文件并导入数据"""
     print(f"\n📊 处理 {filename}...")
     
     try:
-        with open(f"data-export/{filename}", 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        # 提取INSERT语句
-        insert_pattern = r"INSERT INTO \w+ VALUES\((.*?)\);"
-        matches = re.findall(insert_pattern, content)
+        # 按列名映射到 init.ts 的表结构：列的增减、备注里的逗号都不会让金额错位
+        batches = list(dump_batches(f"data-export/{filename}", table_name, limit=20))  # 限制每个表最多导入20条记录
+        records = [batch.slice(i, i + 1) for batch in batches for i in range(len(batch))]
         
         success_count = 0
-        total_count = min(len(matches), 20)  # 限制每个表最多导入20条记录
+        total_count = len(records)
         
-        for i, match in enumerate(matches[:20]):  # 只处理前20条
+        for i, record in enumerate(records):
             try:
-                if converter_func:
-                    converted_sql = converter_func(match)
-                    if converted_sql:
-                        response = import_data(token, table_name, converted_sql)
-                        if response.status_code == 200:
-                            success_count += 1
-                            print(f"✅ {table_name} 记录 {i+1} 导入成功")
-                        else:
-                            print(f"❌ {table_name} 记录 {i+1} 导入失败: {response.text}")
+                response = import_data(token, table_name, record.to_sql())
+                if response.status_code == 200:
+                    success_count += 1
+                    print(f"✅ {table_name} 记录 {i+1} 导入成功")
                 else:
-                    # 直接使用原始INSERT语句
-                    original_sql = f"INSERT INTO {table_name} VALUES({match});"
-                    response = import_data(token, table_name, original_sql)
-                    if response.status_code == 200:
-                        success_count += 1
-                        print(f"✅ {table_name} 记录 {i+1} 导入成功")
-                    else:
-                        print(f"❌ {table_name} 记录 {i+1} 导入失败: {response.text}")
-                
-                time.sleep(0.2)  # 避免API限制
+                    print(f"❌ {table_name} 记录 {i+1} 导入失败: {response.text}")
                 
             except Exception as e:
                 print(f"⚠️ 处理 {table_name} 记录 {i+1} 时出错: {e}")
@@ -123,10 +46,46 @@ def process_file(filename, converter_func, table_name, token):
     except Exception as e:
         print(f"❌ 处理 {filename} 时出错: {e}")
 
+def migrate_all(args):
+    """整表迁移：每张表的全部行按 batch_rows 行一批，成批在事务中导入"""
+    files = export_files("data-export")
+    progress = MigrationProgress(table_rows(files, args.workers))
+    batches = migration_batches(files, args.batch_rows, workers=args.workers, progress=progress)
+    if args.sqlite:
+        with SqliteSink(args.sqlite) as sink:
+            # 新库里有 init.ts 的默认数据，先按外键逆序清掉，主键随行一起迁移
+            for table, _ in reversed(files):
+                sink.clear(table)
+            sink.import_all(batches)
+            print("\n📊 最终数据统计:")
+            for table, count in sink.get_stats().items():
+                print(f"  {table}: {count:,} 条记录")
+    else:
+        importer = BulkImporter(concurrency=args.concurrency,
+                                envelope_bytes=args.envelope_bytes or None, columnar=args.columnar)
+        importer.import_all(batches)
+    print(f"📈 整表迁移：{progress.summary()}")
+
 def main():
+    parser = argparse.ArgumentParser(description="把 data-export/ 的本地数据迁移到 Railway")
+    parser.add_argument("--full", action="store_true", help="迁移每张表的全部行（默认每张表只取前 20 行逐行导入）")
+    parser.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS, help="整表迁移时每批的行数")
+    parser.add_argument("--concurrency", type=int, default=4, help="同时在途的导入请求数上限（实际并发由自适应限速调整）")
+    parser.add_argument("--envelope-bytes", type=int, default=DEFAULT_ENVELOPE_BYTES,
+                        help="打包成批量导入信封的大小上限（字节），一个信封一次事务；0 表示逐批走 /import")
+    parser.add_argument("--columnar", action="store_true", help="信封用列式 MessagePack 编码，体积更小")
+    parser.add_argument("--workers", type=int, default=1, help="解析转储的进程数")
+    parser.add_argument("--sqlite", metavar="PATH",
+                        help="整表迁移不经过 API，直接写入 wms.db 兼容的 SQLite 文件（不存在时按 init.ts 新建）")
+    args = parser.parse_args()
+
     print("🚀 开始迁移本地数据到Railway")
     print("=" * 40)
     
+    if args.sqlite:
+        migrate_all(args)
+        return
+    
     # 登录
     token = login()
     if not token:
@@ -138,30 +97,31 @@ def main():
     # 清空现有数据
     print("🗑️ 清空现有数据...")
     clear_data(token)
-    time.sleep(2)
     
     # 按顺序导入数据
     tables = [
-        ("warehouses.sql", None, "warehouses"),
-        ("suppliers.sql", None, "suppliers"),
-        ("customers.sql", None, "customers"),
-        ("items.sql", None, "items"),
-        ("inventory.sql", None, "inventory"),
-        ("purchase_orders.sql", convert_purchase_order, "purchase_orders"),
-        ("purchase_order_items.sql", None, "purchase_order_items"),
-        ("sales_orders.sql", convert_sales_order, "sales_orders"),
-        ("sales_order_items.sql", None, "sales_order_items"),
-        ("inventory_transactions.sql", None, "inventory_transactions")
+        ("warehouses.sql", "warehouses"),
+        ("suppliers.sql", "suppliers"),
+        ("customers.sql", "customers"),
+        ("items.sql", "items"),
+        ("inventory.sql", "inventory"),
+        ("purchase_orders.sql", "purchase_orders"),
+        ("purchase_order_items.sql", "purchase_order_items"),
+        ("sales_orders.sql", "sales_orders"),
+        ("sales_order_items.sql", "sales_order_items"),
+        ("inventory_transactions.sql", "inventory_transactions")
     ]
     
-    for filename, converter, table_name in tables:
-        process_file(filename, converter, table_name, token)
-        time.sleep(1)
+    if args.full:
+        migrate_all(args)
+    else:
+        for filename, table_name in tables:
+            process_file(filename, table_name, token)
     
     # 获取最终统计
     print("\n📊 最终数据统计:")
-    response = requests.get(f"{RAILWAY_URL}/data-import/stats", 
-                          headers={"Authorization": f"Bearer {token}"})
+    response = api.get(f"{RAILWAY_URL}/data-import/stats", 
+                     headers={"Authorization": f"Bearer {token}"})
     if response.status_code == 200:
         stats = response.json()
         for table, count in stats.items():
@@ -170,5 +130,8 @@ def main():
     print("\n🎉 数据迁移完成！")
     print("请刷新页面查看您的真实数据！")
 
+    print(pacing_report())
+    print(compression_report())
+
 if __name__ == "__main__":
     main()
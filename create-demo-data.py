@@ -1,37 +1,16 @@
 #!/usr/bin/env python3
-import requests
-import time
+import argparse
 import random
-from datetime import datetime, timedelta
+from datetime import timedelta
 
-# Railway API配置
-RAILWAY_URL = "https://web-production-7a257.up.railway.app/api"
+from wms_data.client import RAILWAY_URL, api, compression_report, import_data, login, pacing_report
+from wms_data.importer import InsertBatch
+from wms_data.journal import SeedJournal
 
-def login():
-    """登录获取token"""
-    response = requests.post(f"{RAILWAY_URL}/auth/login", 
-                           json={"username": "admin", "password": "123456"})
-    if response.status_code == 200:
-        return response.json().get("token")
-    else:
-        print(f"登录失败: {response.text}")
-        return None
-
-def import_data(token, table_name, sql_data):
-    """导入数据到Railway"""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-    
-    data = {
-        "tableName": table_name,
-        "data": sql_data
-    }
-    
-    response = requests.post(f"{RAILWAY_URL}/data-import/import", 
-                           headers=headers, json=data)
-    return response
+SALES_COLUMNS = ("order_no, customer_id, warehouse_id, order_date, delivery_date, total_amount, subtotal, "
+                 "tax_amount, discount_amount, status, notes, created_by, created_at, updated_at")
+PURCHASE_COLUMNS = ("order_no, supplier_id, warehouse_id, order_date, delivery_date, total_amount, subtotal, "
+                    "tax_amount, status, notes, created_by, created_at, updated_at")
 
 def create_customers(token):
     """创建客户数据"""
@@ -77,12 +56,20 @@ def create_suppliers(token):
         else:
             print(f"❌ 供应商 {name} 创建失败: {response.text}")
 
-def create_sales_orders(token):
-    """创建销售订单数据"""
+def report(result, label):
+    if result is None:
+        print(f"⏭️ {label} 已在上次运行中创建，跳过")
+    elif result.ok:
+        print(f"✅ {label} 创建成功")
+    else:
+        print(f"❌ {label} 创建失败，已写入拒绝文件")
+
+def create_sales_orders(journal):
+    """创建销售订单数据（经断点续传日志发送）"""
     print("💰 创建销售订单数据...")
     
     # 基于您本地数据的模式创建销售订单
-    base_date = datetime.now() - timedelta(days=30)
+    base_date = journal.now - timedelta(days=30)
     
     for i in range(1, 51):  # 创建50个销售订单
         order_date = (base_date + timedelta(days=i % 30)).strftime('%Y-%m-%d')
@@ -95,24 +82,16 @@ def create_sales_orders(token):
         discount = random.randint(0, 500) if i % 5 == 0 else 0
         status = random.choice(['completed', 'completed', 'completed', 'pending', 'cancelled'])
         
-        sql = f"""INSERT INTO sales_orders (order_no, customer_id, warehouse_id, order_date, delivery_date, 
-                 total_amount, subtotal, tax_amount, discount_amount, status, notes, created_by, created_at, updated_at) 
-                 VALUES ('{order_no}', {customer_id}, 1, '{order_date}', NULL, {total_amount}, {total_amount - tax_amount}, 
-                 {tax_amount}, {discount}, '{status}', 'Demo订单数据', 1, datetime('now'), datetime('now'));"""
+        row = f"""('{order_no}', {customer_id}, 1, '{order_date}', NULL, {total_amount}, {total_amount - tax_amount}, 
+                 {tax_amount}, {discount}, '{status}', 'Demo订单数据', 1, datetime('now'), datetime('now'))"""
         
-        response = import_data(token, "sales_orders", sql)
-        if response.status_code == 200:
-            print(f"✅ 销售订单 {order_no} 创建成功")
-        else:
-            print(f"❌ 销售订单 {order_no} 创建失败: {response.text}")
-        
-        time.sleep(0.1)
+        report(journal.send(InsertBatch("sales_orders", SALES_COLUMNS, [row])), f"销售订单 {order_no}")
 
-def create_purchase_orders(token):
-    """创建采购订单数据"""
+def create_purchase_orders(journal):
+    """创建采购订单数据（经断点续传日志发送）"""
     print("🛒 创建采购订单数据...")
     
-    base_date = datetime.now() - timedelta(days=60)
+    base_date = journal.now - timedelta(days=60)
     
     for i in range(1, 31):  # 创建30个采购订单
         order_date = (base_date + timedelta(days=i % 60)).strftime('%Y-%m-%d')
@@ -124,20 +103,16 @@ def create_purchase_orders(token):
         tax_amount = round(total_amount * 0.15, 2)
         status = random.choice(['completed', 'completed', 'pending', 'cancelled'])
         
-        sql = f"""INSERT INTO purchase_orders (order_no, supplier_id, warehouse_id, order_date, delivery_date,
-                 total_amount, subtotal, tax_amount, status, notes, created_by, created_at, updated_at)
-                 VALUES ('{order_no}', {supplier_id}, 1, '{order_date}', NULL, {total_amount}, {total_amount - tax_amount},
-                 {tax_amount}, '{status}', 'Demo采购数据', 1, datetime('now'), datetime('now'));"""
+        row = f"""('{order_no}', {supplier_id}, 1, '{order_date}', NULL, {total_amount}, {total_amount - tax_amount},
+                 {tax_amount}, '{status}', 'Demo采购数据', 1, datetime('now'), datetime('now'))"""
         
-        response = import_data(token, "purchase_orders", sql)
-        if response.status_code == 200:
-            print(f"✅ 采购订单 {order_no} 创建成功")
-        else:
-            print(f"❌ 采购订单 {order_no} 创建失败: {response.text}")
-        
-        time.sleep(0.1)
+        report(journal.send(InsertBatch("purchase_orders", PURCHASE_COLUMNS, [row])), f"采购订单 {order_no}")
 
 def main():
+    parser = argparse.ArgumentParser(description="创建完整的Demo数据")
+    parser.add_argument("--resume", action="store_true", help="从上次中断的位置继续，不重复也不遗漏")
+    args = parser.parse_args()
+
     print("🚀 创建完整的Demo数据")
     print("=" * 40)
     
@@ -149,19 +124,18 @@ def main():
     
     print("✅ 登录成功")
     
-    # 创建数据
+    # 创建数据：客户和供应商用 INSERT OR REPLACE，重复执行无害；订单经日志发送，续跑时跳过已创建的
     create_customers(token)
-    time.sleep(2)
     create_suppliers(token)
-    time.sleep(2)
-    create_sales_orders(token)
-    time.sleep(2)
-    create_purchase_orders(token)
+    journal = SeedJournal.open("create-demo-data", resume=args.resume)
+    create_sales_orders(journal)
+    create_purchase_orders(journal)
+    journal.finish()
     
     # 获取最终统计
     print("\n📊 最终数据统计:")
-    response = requests.get(f"{RAILWAY_URL}/data-import/stats", 
-                          headers={"Authorization": f"Bearer {token}"})
+    response = api.get(f"{RAILWAY_URL}/data-import/stats", 
+                     headers={"Authorization": f"Bearer {token}"})
     if response.status_code == 200:
         stats = response.json()
         for table, count in stats.items():
@@ -177,5 +151,8 @@ def main():
     print("- 完整的库存信息")
     print("\n请刷新页面查看您的Demo系统！")
 
+    print(pacing_report())
+    print(compression_report())
+
 if __name__ == "__main__":
     main()
@@ -1,37 +1,16 @@
 #!/usr/bin/env python3
-import requests
-import time
+import argparse
 import random
 from datetime import datetime, timedelta
 
-# Railway API配置
-RAILWAY_URL = "https://web-production-7a257.up.railway.app/api"
-
-def login():
-    """登录获取token"""
-    response = requests.post(f"{RAILWAY_URL}/auth/login", 
-                           json={"username": "admin", "password": "123456"})
-    if response.status_code == 200:
-        return response.json().get("token")
-    else:
-        print(f"登录失败: {response.text}")
-        return None
-
-def import_data(token, table_name, sql_data):
-    """导入数据到Railway"""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-    
-    data = {
-        "tableName": table_name,
-        "data": sql_data
-    }
-    
-    response = requests.post(f"{RAILWAY_URL}/data-import/import", 
-                           headers=headers, json=data)
-    return response
+from wms_data.client import RAILWAY_URL, api, compression_report, import_data, login, pacing_report
+from wms_data.dump_sink import DumpSink
+from wms_data.importer import BulkImporter, InsertBatch
+from wms_data.journal import SeedJournal
+from wms_data.revenue import RevenueSampler
+from wms_data.shards import DEFAULT_WORKERS, run_shards
+from wms_data.sqlite_sink import SqliteSink
+from wms_data.vectorized import np
 
 def create_premium_customers(token):
     """创建高价值客户群体 - 投资方喜欢看到的客户"""
@@ -77,8 +56,6 @@ def create_premium_customers(token):
             print(f"✅ 高价值客户 {name} 创建成功")
         else:
             print(f"❌ 客户 {name} 创建失败: {response.text}")
-        
-        time.sleep(0.2)
 
 def create_premium_suppliers(token):
     """创建顶级供应商 - 展示强大的供应链"""
@@ -122,94 +99,126 @@ def create_premium_suppliers(token):
             print(f"✅ 顶级供应商 {name} 创建成功")
         else:
             print(f"❌ 供应商 {name} 创建失败: {response.text}")
-        
-        time.sleep(0.2)
 
-def create_growth_trajectory_orders(token):
-    """创建显示增长轨迹的订单数据 - 投资方最爱看的"""
+# 模拟6个月的增长轨迹：从月销30万增长到月销150万
+GROWTH_MONTHS = [
+    {"month": 6, "target": 300000, "orders": 600},   # 6个月前：30万
+    {"month": 5, "target": 450000, "orders": 750},   # 5个月前：45万
+    {"month": 4, "target": 650000, "orders": 900},   # 4个月前：65万
+    {"month": 3, "target": 850000, "orders": 1100},  # 3个月前：85万
+    {"month": 2, "target": 1200000, "orders": 1300}, # 2个月前：120万
+    {"month": 1, "target": 1500000, "orders": 1500}, # 上个月：150万
+]
+
+def growth_sampler():
+    """增长期订单的金额抽样：单笔200-25000元，95%完成率，20%订单有折扣"""
+    return RevenueSampler(
+        [{"weight": 1, "min": 1000, "max": 1000}], ['completed', 'pending'], [95, 5],
+        variation=(0.3, 1.8), min_amount=200, max_amount=25000,
+        discount_rate=0.2, discount_max=300, discount_fraction=1 / 15,
+    )
+
+def growth_month_orders(rng, now, month_ago, target_revenue, orders_count, first_index):
+    """生成一个月的订单（一个分片），已完成订单的实收精确等于月目标，返回 (GrowthMonth, 当月已完成收入)
+
+    分片只返回 NumPy 列数组，行元组等到发送时再逐批渲染，不会整月留在内存里。
+    """
+    np_rng = np.random.default_rng(rng.getrandbits(64))
+    base_date = now - timedelta(days=month_ago * 30)
+    
+    # 订单日期在该月内随机分布
+    random_day = np_rng.integers(0, 30, size=orders_count)
+    customer_id = np_rng.integers(1, 16, size=orders_count)  # 使用新的客户ID范围
+    warehouse_id = np_rng.integers(1, 3, size=orders_count)
+    
+    # 金额、折扣和状态一次抽完：已完成订单的实收之和恰好等于月目标
+    orders = growth_sampler().sample(np_rng, np.zeros(orders_count, dtype=np.int64), [target_revenue])
+    total_cost = np.round(orders["total_amount"] * 0.58).astype(np.int64)  # 成本58%，利润率42%
+    
+    month = GrowthMonth(base_date, month_ago, first_index, random_day, customer_id, warehouse_id,
+                        orders["total_amount"], orders["discount_amount"], orders["final_amount"], total_cost,
+                        orders["status"])
+    month_revenue = int(orders["final_amount"][orders["status"] == 0].sum())
+    return month, month_revenue
+
+class GrowthMonth:
+    """一个月增长期订单的列数组，rows() 按需渲染成 sales_orders 的行元组"""
+    
+    STATUSES = ['completed', 'pending']
+    
+    def __init__(self, base_date, month_ago, first_index, day, customer_id, warehouse_id,
+                 total_amount, discount_amount, final_amount, total_cost, status):
+        self.base_date = base_date
+        self.month_ago = month_ago
+        self.first_index = first_index
+        self.day = day
+        self.customer_id = customer_id
+        self.warehouse_id = warehouse_id
+        self.total_amount = total_amount
+        self.discount_amount = discount_amount
+        self.final_amount = final_amount
+        self.total_cost = total_cost
+        self.status = status
+        self.dates = [(base_date + timedelta(days=d)).strftime('%Y-%m-%d') for d in range(30)]
+    
+    def __len__(self):
+        return len(self.day)
+    
+    def rows(self, start, end):
+        """第 [start, end) 个订单的行元组"""
+        part = slice(start, end)
+        rows = []
+        for i, (day, customer, warehouse, total_amount, discount_amount, final_amount, cost, status) in enumerate(zip(
+                self.day[part].tolist(), self.customer_id[part].tolist(), self.warehouse_id[part].tolist(),
+                self.total_amount[part].tolist(), self.discount_amount[part].tolist(),
+                self.final_amount[part].tolist(), self.total_cost[part].tolist(), self.status[part].tolist()), start):
+            order_date = self.dates[day]
+            order_no = f"SO-{order_date.replace('-', '')}-{50000 + self.first_index + i}"
+            gross_profit = final_amount - cost
+            profit_margin = round((gross_profit / final_amount) * 100) if final_amount > 0 else 0
+            
+            rows.append((order_no, customer, warehouse, order_date, total_amount, discount_amount, final_amount,
+                         final_amount, cost, gross_profit, profit_margin, 'paid', self.STATUSES[status],
+                         f'增长期数据-{self.month_ago}月前'))
+        return rows
+
+def create_growth_trajectory_orders(now, seed, workers):
+    """创建显示增长轨迹的订单数据 - 投资方最爱看的（每月一个分片并行生成，逐批产出，返回订单数）"""
     print("📈 创建展示强劲增长的订单数据...")
     
-    # 模拟6个月的增长轨迹：从月销30万增长到月销150万
-    months_data = [
-        {"month": 6, "target": 300000, "orders": 600},   # 6个月前：30万
-        {"month": 5, "target": 450000, "orders": 750},   # 5个月前：45万
-        {"month": 4, "target": 650000, "orders": 900},   # 4个月前：65万
-        {"month": 3, "target": 850000, "orders": 1100},  # 3个月前：85万
-        {"month": 2, "target": 1200000, "orders": 1300}, # 2个月前：120万
-        {"month": 1, "target": 1500000, "orders": 1500}, # 上个月：150万
-    ]
+    shards = []
+    first_index = 0
+    for month_data in GROWTH_MONTHS:
+        shards.append((("sales_orders", month_data["month"]),
+                       (now, month_data["month"], month_data["target"], month_data["orders"], first_index)))
+        first_index += month_data["orders"]
     
     total_orders_created = 0
     total_revenue = 0
     
-    for month_data in months_data:
+    months = run_shards(growth_month_orders, shards, seed, workers)
+    for month_data, (month, month_revenue) in zip(GROWTH_MONTHS, months):
         month_ago = month_data["month"]
-        target_revenue = month_data["target"]
         orders_count = month_data["orders"]
         
-        print(f"📅 生成 {month_ago} 个月前数据：目标¥{target_revenue:,}，{orders_count}个订单")
-        
-        month_revenue = 0
-        batch_values = []
-        
-        # 在该月内分布订单
-        for i in range(orders_count):
-            # 订单日期在该月内随机分布
-            base_date = datetime.now() - timedelta(days=month_ago * 30)
-            random_day = random.randint(0, 29)
-            order_date = (base_date + timedelta(days=random_day)).strftime('%Y-%m-%d')
-            
-            order_no = f"SO-{order_date.replace('-', '')}-{50000 + total_orders_created + i}"
-            customer_id = random.randint(1, 15)  # 使用新的客户ID范围
-            warehouse_id = random.randint(1, 2)
-            
-            # 订单金额：确保达到月目标
-            remaining_orders = orders_count - i
-            remaining_target = target_revenue - month_revenue
-            
-            if remaining_orders > 0:
-                avg_needed = remaining_target / remaining_orders
-                # 在平均值基础上增加随机性
-                base_amount = max(200, int(avg_needed * random.uniform(0.3, 1.8)))
-            else:
-                base_amount = random.randint(500, 3000)
-            
-            # 确保金额合理
-            total_amount = min(max(base_amount, 200), 25000)
-            
-            discount_amount = random.randint(0, min(300, total_amount // 15)) if random.random() < 0.2 else 0
-            final_amount = total_amount - discount_amount
-            total_cost = round(total_amount * 0.58)  # 成本58%，利润率42%
-            gross_profit = final_amount - total_cost
-            profit_margin = round((gross_profit / final_amount) * 100) if final_amount > 0 else 0
-            
-            status = random.choices(['completed', 'pending'], weights=[95, 5])[0]  # 95%完成率
-            
-            if status == 'completed':
-                month_revenue += final_amount
-            
-            batch_values.append(f"('{order_no}', {customer_id}, {warehouse_id}, '{order_date}', {total_amount}, {discount_amount}, {final_amount}, {final_amount}, {total_cost}, {gross_profit}, {profit_margin}, 'paid', '{status}', '增长期数据-{month_ago}月前')")
+        print(f"📅 生成 {month_ago} 个月前数据：目标¥{month_data['target']:,}，{orders_count}个订单")
         
-        # 批量插入该月数据
+        # 批量插入该月数据，每批发送时才渲染
         batch_size = 100
-        for j in range(0, len(batch_values), batch_size):
-            batch = batch_values[j:j+batch_size]
-            sql = f"""INSERT INTO sales_orders (order_no, customer_id, warehouse_id, order_date, 
-                     total_amount, discount_amount, final_amount, paid_amount, total_cost, gross_profit, 
-                     profit_margin, payment_status, status, remarks) 
-                     VALUES {', '.join(batch)};"""
-            
-            response = import_data(token, "sales_orders", sql)
-            if response.status_code == 200:
-                print(f"  ✅ {month_ago}月前 批次 {j//batch_size + 1} 成功")
-            
-            time.sleep(0.5)
+        for j in range(0, len(month), batch_size):
+            yield InsertBatch(
+                "sales_orders",
+                "order_no, customer_id, warehouse_id, order_date, total_amount, discount_amount, "
+                "final_amount, paid_amount, total_cost, gross_profit, profit_margin, "
+                "payment_status, status, remarks",
+                month.rows(j, j + batch_size),
+                label=f"  {month_ago}月前 批次 {j//batch_size + 1}",
+            )
         
         total_orders_created += orders_count
         total_revenue += month_revenue
         
-        print(f"  📊 {month_ago}月前完成：{orders_count}单，¥{month_revenue:,.0f}")
-        time.sleep(1)
+        print(f"  📊 {month_ago}月前生成：{orders_count}单，¥{month_revenue:,.0f}")
     
     print(f"\n🎯 增长数据创建完成：")
     print(f"  总订单：{total_orders_created:,}个")
@@ -273,10 +282,29 @@ def create_premium_items(token):
             print(f"✅ 高价值商品 {name} 创建成功")
         else:
             print(f"❌ 商品 {name} 创建失败: {response.text}")
-        
-        time.sleep(0.1)
 
 def main():
+    parser = argparse.ArgumentParser(description="创建投资级别的Demo数据")
+    parser.add_argument("--concurrency", type=int, default=4, help="同时在途的导入请求数上限（实际并发由自适应限速调整）")
+    parser.add_argument("--resume", action="store_true", help="从上次中断的位置继续，不重复也不遗漏")
+    parser.add_argument("--seed", type=int, help="随机种子：同一种子（和 --as-of）生成逐字节相同的数据，与 --workers 无关")
+    parser.add_argument("--as-of", type=datetime.fromisoformat, help="基准日期（默认今天），订单日期相对它往前推")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="并行生成分片的进程数")
+    parser.add_argument("--sqlite", metavar="PATH",
+                        help="不经过 API，把增长轨迹订单直接写入 wms.db 兼容的 SQLite 文件（客户、供应商、商品仍需在线创建）")
+    parser.add_argument("--dump", metavar="DIR",
+                        help="不经过 API，把增长轨迹订单按表写成 gzip 压缩的 SQL 转储（与 data-export/ 格式相同）")
+    args = parser.parse_args()
+    
+    if args.sqlite or args.dump:
+        random.seed(args.seed)
+        now = args.as_of or datetime.now()
+        # 给了种子时，created_at 等时间列的默认值也固定成基准时间，同一种子两次生成的结果相同
+        pinned = now if args.seed is not None else None
+        with (SqliteSink(args.sqlite, now=pinned) if args.sqlite else DumpSink(args.dump, now=pinned)) as sink:
+            sink.import_all(create_growth_trajectory_orders(now, random.getrandbits(64), args.workers))
+        return
+
     print("🏦 创建投资级别的完美Demo数据")
     print("=" * 70)
     print("🎯 投资方视角：寻找高增长、高价值、有潜力的企业")
@@ -293,23 +321,25 @@ def main():
     # 创建高价值数据
     print("\n🚀 第一步：建立强大的商业网络...")
     create_premium_customers(token)
-    time.sleep(2)
     
     print("\n🚀 第二步：构建顶级供应链...")
     create_premium_suppliers(token)
-    time.sleep(2)
     
     print("\n🚀 第三步：扩展高价值产品线...")
     create_premium_items(token)
-    time.sleep(2)
     
     print("\n🚀 第四步：创建增长轨迹数据...")
-    orders_created = create_growth_trajectory_orders(token)
+    journal = SeedJournal.open("create-investor-grade-data", resume=args.resume, seed=args.seed, now=args.as_of)
+    # 分片主种子由 random 派生，续跑恢复随机数状态后各分片生成的数据不变
+    seed = random.getrandbits(64)
+    importer = BulkImporter(concurrency=args.concurrency, journal=journal)
+    importer.import_all(create_growth_trajectory_orders(journal.now, seed, args.workers))
+    journal.finish()
     
     # 获取最终统计
     print("\n📊 投资级Demo数据统计:")
-    response = requests.get(f"{RAILWAY_URL}/data-import/stats", 
-                          headers={"Authorization": f"Bearer {token}"})
+    response = api.get(f"{RAILWAY_URL}/data-import/stats", 
+                     headers={"Authorization": f"Bearer {token}"})
     if response.status_code == 200:
         stats = response.json()
         for table, count in stats.items():
@@ -328,5 +358,8 @@ def main():
     print("📊 数据驱动：完整的业务分析和报表系统")
     print("\n🚀 这是一个值得投资的高增长企业！")
 
+    print(pacing_report())
+    print(compression_report())
+
 if __name__ == "__main__":
     main()
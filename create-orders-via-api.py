@@ -1,22 +1,14 @@
 #!/usr/bin/env python3
-import requests
-import time
+import argparse
 import random
 
-# Railway API配置
-RAILWAY_URL = "https://web-production-7a257.up.railway.app/api"
+from wms_data.client import RAILWAY_URL, api, compression_report, login, pacing_report
+from wms_data.journal import SeedJournal
 
-def login():
-    """登录获取token"""
-    response = requests.post(f"{RAILWAY_URL}/auth/login", 
-                           json={"username": "admin", "password": "123456"})
-    if response.status_code == 200:
-        return response.json().get("token")
-    else:
-        print(f"登录失败: {response.text}")
-        return None
+def created(response):
+    return response.status_code == 200 or response.status_code == 201
 
-def create_sales_orders(token):
+def create_sales_orders(token, journal):
     """通过销售API创建订单"""
     print("💰 通过API创建销售订单...")
     
@@ -84,24 +76,27 @@ def create_sales_orders(token):
     success_count = 0
     for i, order_data in enumerate(orders):
         try:
-            response = requests.post(f"{RAILWAY_URL}/sales", 
-                                   headers=headers, json=order_data)
+            # 业务接口每次调用都会新建一张订单，续跑时跳过已创建成功的
+            response = journal.once(f"sales-{i}", lambda: api.post(f"{RAILWAY_URL}/sales", 
+                                                                    headers=headers, json=order_data),
+                                    ok=created)
             
-            if response.status_code == 200 or response.status_code == 201:
+            if response is None:
+                success_count += 1
+                print(f"⏭️ 销售订单 {i+1} 已在上次运行中创建，跳过")
+            elif created(response):
                 success_count += 1
                 result = response.json()
                 print(f"✅ 销售订单 {i+1} 创建成功: {result.get('order_no', 'N/A')}")
             else:
                 print(f"❌ 销售订单 {i+1} 创建失败: {response.text}")
             
-            time.sleep(1)
-            
         except Exception as e:
             print(f"⚠️ 创建销售订单 {i+1} 时出错: {e}")
     
     print(f"📈 销售订单: {success_count}/{len(orders)} 创建成功")
 
-def create_purchase_orders(token):
+def create_purchase_orders(token, journal):
     """通过采购API创建订单"""
     print("🛒 通过API创建采购订单...")
     
@@ -154,24 +149,31 @@ def create_purchase_orders(token):
     success_count = 0
     for i, order_data in enumerate(orders):
         try:
-            response = requests.post(f"{RAILWAY_URL}/purchases", 
-                                   headers=headers, json=order_data)
+            # 业务接口每次调用都会新建一张订单，续跑时跳过已创建成功的
+            response = journal.once(f"purchases-{i}", lambda: api.post(f"{RAILWAY_URL}/purchases", 
+                                                                    headers=headers, json=order_data),
+                                    ok=created)
             
-            if response.status_code == 200 or response.status_code == 201:
+            if response is None:
+                success_count += 1
+                print(f"⏭️ 采购订单 {i+1} 已在上次运行中创建，跳过")
+            elif created(response):
                 success_count += 1
                 result = response.json()
                 print(f"✅ 采购订单 {i+1} 创建成功: {result.get('order_no', 'N/A')}")
             else:
                 print(f"❌ 采购订单 {i+1} 创建失败: {response.text}")
             
-            time.sleep(1)
-            
         except Exception as e:
             print(f"⚠️ 创建采购订单 {i+1} 时出错: {e}")
     
     print(f"📈 采购订单: {success_count}/{len(orders)} 创建成功")
 
 def main():
+    parser = argparse.ArgumentParser(description="通过业务接口创建订单数据")
+    parser.add_argument("--resume", action="store_true", help="从上次中断的位置继续，已创建的订单不再重复创建")
+    args = parser.parse_args()
+
     print("🚀 通过API创建订单数据")
     print("=" * 30)
     
@@ -184,14 +186,15 @@ def main():
     print("✅ 登录成功")
     
     # 创建订单
-    create_sales_orders(token)
-    time.sleep(2)
-    create_purchase_orders(token)
+    journal = SeedJournal.open("create-orders-via-api", resume=args.resume)
+    create_sales_orders(token, journal)
+    create_purchase_orders(token, journal)
+    journal.finish()
     
     # 获取最终统计
     print("\n📊 最终数据统计:")
-    response = requests.get(f"{RAILWAY_URL}/data-import/stats", 
-                          headers={"Authorization": f"Bearer {token}"})
+    response = api.get(f"{RAILWAY_URL}/data-import/stats", 
+                     headers={"Authorization": f"Bearer {token}"})
     if response.status_code == 200:
         stats = response.json()
         for table, count in stats.items():
@@ -207,5 +210,8 @@ def main():
     print("- 完整的库存信息")
     print("\n请刷新页面查看您的Demo系统！")
 
+    print(pacing_report())
+    print(compression_report())
+
 if __name__ == "__main__":
     main()
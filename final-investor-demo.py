@@ -1,23 +1,18 @@
 #!/usr/bin/env python3
-import requests
-import time
+import argparse
 import random
-from datetime import datetime, timedelta
+from datetime import timedelta
 
-RAILWAY_URL = "https://web-production-7a257.up.railway.app/api"
+from wms_data.client import RAILWAY_URL, api, compression_report, import_data, login, pacing_report
+from wms_data.importer import InsertBatch
+from wms_data.journal import SeedJournal
 
-def login():
-    response = requests.post(f"{RAILWAY_URL}/auth/login", 
-                           json={"username": "admin", "password": "123456"})
-    return response.json().get("token") if response.status_code == 200 else None
+def create_complete_investor_demo(token, journal):
+    """创建完整的投资级Demo数据
 
-def import_data(token, table_name, sql_data):
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-    data = {"tableName": table_name, "data": sql_data}
-    return requests.post(f"{RAILWAY_URL}/data-import/import", headers=headers, json=data)
-
-def create_complete_investor_demo(token):
-    """创建完整的投资级Demo数据"""
+    客户、供应商和商品用 INSERT OR REPLACE，重复执行无害；订单和明细经断点续传日志发送，
+    续跑时恢复随机数状态和基准时间，跳过已提交的批次。
+    """
     print("🏦 创建投资级别的完美Demo系统")
     print("=" * 70)
     
@@ -45,7 +40,6 @@ def create_complete_investor_demo(token):
         sql = f"""INSERT OR REPLACE INTO customers (code, name, contact_person, phone, email, address, customer_type, credit_limit, payment_terms, registration_date, status, created_at, updated_at) 
                  VALUES ('{code}', '{name}', '{contact}', '{phone}', '{email}', '{address}', '{ctype}', {credit}, 'monthly', '2023-01-01', 'active', datetime('now'), datetime('now'));"""
         import_data(token, "customers", sql)
-        time.sleep(0.1)
     
     print("✅ 15个高价值客户创建完成")
     
@@ -73,7 +67,6 @@ def create_complete_investor_demo(token):
         sql = f"""INSERT OR REPLACE INTO suppliers (code, name, contact_person, phone, email, address, tax_number, status, created_at, updated_at) 
                  VALUES ('{code}', '{name}', '{contact}', '{phone}', '{email}', '{address}', '{tax_no}', 'active', datetime('now'), datetime('now'));"""
         import_data(token, "suppliers", sql)
-        time.sleep(0.1)
     
     print("✅ 15个顶级供应商创建完成")
     
@@ -106,7 +99,6 @@ def create_complete_investor_demo(token):
         sql = f"""INSERT OR REPLACE INTO items (code, name, en_name, category, unit, purchase_price, sale_price, min_stock, max_stock, status, created_at, updated_at) 
                  VALUES ('{code}', '{name}', '{en_name}', '{category}', '{unit}', {purchase_price}, {sale_price}, {min_stock}, {max_stock}, 'active', datetime('now'), datetime('now'));"""
         import_data(token, "items", sql)
-        time.sleep(0.05)
     
     print("✅ 20个高价值商品创建完成")
     
@@ -116,13 +108,14 @@ def create_complete_investor_demo(token):
     total_revenue = 0
     total_orders = 0
     
+    now = journal.now
     for days_ago in range(29, -1, -1):
-        order_date = (datetime.now() - timedelta(days=days_ago)).strftime('%Y-%m-%d')
-        created_at = (datetime.now() - timedelta(days=days_ago)).strftime('%Y-%m-%d %H:%M:%S')
+        order_date = (now - timedelta(days=days_ago)).strftime('%Y-%m-%d')
+        created_at = (now - timedelta(days=days_ago)).strftime('%Y-%m-%d %H:%M:%S')
         
         # 显示明显增长趋势：从每天20单增长到80单
         base_orders = 20 + (29 - days_ago) * 2
-        weekday = (datetime.now() - timedelta(days=days_ago)).weekday()
+        weekday = (now - timedelta(days=days_ago)).weekday()
         daily_orders = int(base_orders * (1.3 if weekday >= 5 else 1.0)) + random.randint(-3, 8)
         
         daily_revenue = 0
@@ -154,11 +147,12 @@ def create_complete_investor_demo(token):
         if batch_values:
             batch_size = 50
             for j in range(0, len(batch_values), batch_size):
-                batch = batch_values[j:j+batch_size]
-                sql = f"""INSERT INTO sales_orders (order_no, customer_id, warehouse_id, order_date, total_amount, discount_amount, final_amount, paid_amount, total_cost, gross_profit, profit_margin, payment_status, status, remarks, created_at, updated_at) 
-                         VALUES {', '.join(batch)};"""
-                import_data(token, "sales_orders", sql)
-                time.sleep(0.2)
+                journal.send(InsertBatch(
+                    "sales_orders",
+                    "order_no, customer_id, warehouse_id, order_date, total_amount, discount_amount, final_amount, "
+                    "paid_amount, total_cost, gross_profit, profit_margin, payment_status, status, remarks, "
+                    "created_at, updated_at",
+                    batch_values[j:j+batch_size]))
         
         total_orders += daily_orders
         total_revenue += daily_revenue
@@ -174,17 +168,17 @@ def create_complete_investor_demo(token):
         order_no = f"PO-20250917-{40000 + i}"
         supplier_id = random.randint(1, 15)
         warehouse_id = random.randint(1, 2)
-        order_date = (datetime.now() - timedelta(days=random.randint(0, 60))).strftime('%Y-%m-%d')
+        order_date = (now - timedelta(days=random.randint(0, 60))).strftime('%Y-%m-%d')
         total_amount = random.randint(15000, 100000)
         status = random.choices(['completed', 'pending'], weights=[85, 15])[0]
         
-        sql = f"""INSERT INTO purchase_orders (order_no, supplier_id, warehouse_id, order_date, total_amount, status, remarks, created_at, updated_at) 
-                 VALUES ('{order_no}', {supplier_id}, {warehouse_id}, '{order_date}', {total_amount}, '{status}', 'Demo采购', datetime('now'), datetime('now'));"""
-        import_data(token, "purchase_orders", sql)
+        journal.send(InsertBatch(
+            "purchase_orders",
+            "order_no, supplier_id, warehouse_id, order_date, total_amount, status, remarks, created_at, updated_at",
+            [f"('{order_no}', {supplier_id}, {warehouse_id}, '{order_date}', {total_amount}, '{status}', 'Demo采购', datetime('now'), datetime('now'))"]))
         
         if i % 20 == 19:
             print(f"✅ 已创建 {i+1} 个采购订单")
-        time.sleep(0.1)
     
     # 6. 创建订单明细（确保报表有数据）
     print("📋 创建订单明细...")
@@ -202,19 +196,22 @@ def create_complete_investor_demo(token):
             total_price = unit_price * quantity
             total_cost = unit_cost * quantity
             
-            sql = f"""INSERT INTO sales_order_items (order_id, item_id, quantity, unit_price, unit_cost, total_price, total_cost, delivered_quantity, created_at) 
-                     VALUES ({order_id}, {item_id}, {quantity}, {unit_price}, {unit_cost}, {total_price}, {total_cost}, {quantity}, datetime('now'));"""
-            
-            import_data(token, "sales_order_items", sql)
+            journal.send(InsertBatch(
+                "sales_order_items",
+                "order_id, item_id, quantity, unit_price, unit_cost, total_price, total_cost, delivered_quantity, created_at",
+                [f"({order_id}, {item_id}, {quantity}, {unit_price}, {unit_cost}, {total_price}, {total_cost}, {quantity}, datetime('now'))"]))
             detail_count += 1
             
             if detail_count % 200 == 0:
                 print(f"✅ 已创建 {detail_count} 条销售明细")
-                time.sleep(0.5)
     
     print(f"✅ {detail_count} 条订单明细创建完成")
 
 def main():
+    parser = argparse.ArgumentParser(description="最终创建投资级别Demo系统")
+    parser.add_argument("--resume", action="store_true", help="从上次中断的位置继续，不重复也不遗漏")
+    args = parser.parse_args()
+
     print("🏦 最终创建投资级别Demo系统")
     print("=" * 70)
     
@@ -225,14 +222,16 @@ def main():
     
     print("✅ 登录成功，开始创建投资级Demo...")
     
-    create_complete_investor_demo(token)
+    journal = SeedJournal.open("final-investor-demo", resume=args.resume)
+    create_complete_investor_demo(token, journal)
+    journal.finish()
     
     # 测试报表
     print("\n🧪 测试报表功能...")
     headers = {"Authorization": f"Bearer {token}"}
     
     # 测试销售趋势
-    trend_response = requests.get(f"{RAILWAY_URL}/reports/sales-trend?start_date=2025-08-20&end_date=2025-09-17", headers=headers)
+    trend_response = api.get(f"{RAILWAY_URL}/reports/sales-trend?start_date=2025-08-20&end_date=2025-09-17", headers=headers)
     if trend_response.status_code == 200:
         trend_data = trend_response.json()
         print(f"📈 销售趋势：{len(trend_data)} 个数据点")
@@ -240,7 +239,7 @@ def main():
             print(f"  增长趋势：从¥{trend_data[0]['sales_amount']:,} 到 ¥{trend_data[-1]['sales_amount']:,}")
     
     # 测试商品排行
-    items_response = requests.get(f"{RAILWAY_URL}/reports/top-selling-items?limit=5", headers=headers)
+    items_response = api.get(f"{RAILWAY_URL}/reports/top-selling-items?limit=5", headers=headers)
     if items_response.status_code == 200:
         items_data = items_response.json()
         print(f"🏆 热销商品：{len(items_data)} 个")
@@ -248,7 +247,7 @@ def main():
             print(f"  {item['name']}: ¥{item['total_sales']:,}")
     
     # 最终统计
-    stats_response = requests.get(f"{RAILWAY_URL}/data-import/stats", headers=headers)
+    stats_response = api.get(f"{RAILWAY_URL}/data-import/stats", headers=headers)
     if stats_response.status_code == 200:
         stats = stats_response.json()
         print(f"\n📊 投资级Demo系统数据统计:")
@@ -267,5 +266,8 @@ def main():
     print("🎯 市场地位：大型家电连锁领导者")
     print("\n🚀 完美的投资级Demo准备就绪！")
 
+    print(pacing_report())
+    print(compression_report())
+
 if __name__ == "__main__":
     main()
@@ -1,19 +1,7 @@
 #!/usr/bin/env python3
-import requests
-import time
 import random
 
-RAILWAY_URL = "https://web-production-7a257.up.railway.app/api"
-
-def login():
-    response = requests.post(f"{RAILWAY_URL}/auth/login", 
-                           json={"username": "admin", "password": "123456"})
-    return response.json().get("token") if response.status_code == 200 else None
-
-def import_data(token, table_name, sql_data):
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-    data = {"tableName": table_name, "data": sql_data}
-    return requests.post(f"{RAILWAY_URL}/data-import/import", headers=headers, json=data)
+from wms_data.client import RAILWAY_URL, api, compression_report, import_data, login, pacing_report
 
 def fix_inventory_simple(token):
     """使用简化的库存字段修复库存数据"""
@@ -42,7 +30,6 @@ def fix_inventory_simple(token):
             print(f"✅ 库存批次 {i//batch_size + 1} 创建成功")
         else:
             print(f"❌ 库存批次 {i//batch_size + 1} 失败: {response.text}")
-        time.sleep(0.5)
     
     print(f"✅ 库存数据修复完成：{len(inventory_records)} 条记录")
 
@@ -56,11 +43,14 @@ def main():
     
     # 测试结果
     headers = {"Authorization": f"Bearer {token}"}
-    stats_response = requests.get(f"{RAILWAY_URL}/data-import/stats", headers=headers)
+    stats_response = api.get(f"{RAILWAY_URL}/data-import/stats", headers=headers)
     if stats_response.status_code == 200:
         stats = stats_response.json()
         print(f"📊 库存修复后统计:")
         print(f"  inventory: {stats.get('inventory', 0)} 条记录")
 
+    print(pacing_report())
+    print(compression_report())
+
 if __name__ == "__main__":
     main()
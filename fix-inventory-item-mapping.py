@@ -1,19 +1,7 @@
 #!/usr/bin/env python3
-import requests
-import time
 import random
 
-RAILWAY_URL = "https://web-production-7a257.up.railway.app/api"
-
-def login():
-    response = requests.post(f"{RAILWAY_URL}/auth/login", 
-                           json={"username": "admin", "password": "123456"})
-    return response.json().get("token") if response.status_code == 200 else None
-
-def import_data(token, table_name, sql_data):
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-    data = {"tableName": table_name, "data": sql_data}
-    return requests.post(f"{RAILWAY_URL}/data-import/import", headers=headers, json=data)
+from wms_data.client import RAILWAY_URL, api, compression_report, import_data, login, pacing_report
 
 def fix_inventory_item_mapping(token):
     """修复库存商品ID映射问题"""
@@ -24,7 +12,6 @@ def fix_inventory_item_mapping(token):
     print("🗑️ 清理现有库存数据...")
     clear_response = import_data(token, "inventory", "DELETE FROM inventory;")
     print(f"清理结果: {clear_response.text}")
-    time.sleep(2)
     
     # 2. 重新创建正确的库存数据
     # 商品ID应该从5开始（1-4是原有商品，5-32是新创建的商品）
@@ -32,7 +19,7 @@ def fix_inventory_item_mapping(token):
     
     # 获取商品列表来确保正确的ID映射
     headers = {"Authorization": f"Bearer {token}"}
-    items_response = requests.get(f"{RAILWAY_URL}/items", headers=headers)
+    items_response = api.get(f"{RAILWAY_URL}/items", headers=headers)
     
     if items_response.status_code == 200:
         items_json = items_response.json()
@@ -67,7 +54,6 @@ def fix_inventory_item_mapping(token):
                     print(f"✅ 库存批次 {i//batch_size + 1} 创建成功")
                 else:
                     print(f"❌ 库存批次 {i//batch_size + 1} 失败: {response.text}")
-                time.sleep(0.5)
             
             print(f"✅ 库存数据修复完成：{len(inventory_records)} 条记录")
         else:
@@ -80,7 +66,7 @@ def test_inventory_display(token):
     print("\n🧪 测试库存显示...")
     
     headers = {"Authorization": f"Bearer {token}"}
-    inventory_response = requests.get(f"{RAILWAY_URL}/inventory", headers=headers)
+    inventory_response = api.get(f"{RAILWAY_URL}/inventory", headers=headers)
     
     if inventory_response.status_code == 200:
         inventory_data = inventory_response.json()
@@ -121,7 +107,7 @@ def main():
     
     # 最终统计
     headers = {"Authorization": f"Bearer {token}"}
-    stats_response = requests.get(f"{RAILWAY_URL}/data-import/stats", headers=headers)
+    stats_response = api.get(f"{RAILWAY_URL}/data-import/stats", headers=headers)
     if stats_response.status_code == 200:
         stats = stats_response.json()
         print(f"\n📊 最终数据统计:")
@@ -132,5 +118,8 @@ def main():
     print("📦 现在库存管理页面应该能正确显示所有商品名称")
     print("🚀 请刷新页面查看效果！")
 
+    print(pacing_report())
+    print(compression_report())
+
 if __name__ == "__main__":
     main()
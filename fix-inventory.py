@@ -1,19 +1,7 @@
 #!/usr/bin/env python3
-import requests
-import time
 import random
 
-RAILWAY_URL = "https://web-production-7a257.up.railway.app/api"
-
-def login():
-    response = requests.post(f"{RAILWAY_URL}/auth/login", 
-                           json={"username": "admin", "password": "123456"})
-    return response.json().get("token") if response.status_code == 200 else None
-
-def import_data(token, table_name, sql_data):
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-    data = {"tableName": table_name, "data": sql_data}
-    return requests.post(f"{RAILWAY_URL}/data-import/import", headers=headers, json=data)
+from wms_data.client import RAILWAY_URL, api, compression_report, import_data, login, pacing_report
 
 def fix_inventory_data(token):
     """修复库存数据"""
@@ -22,7 +10,6 @@ def fix_inventory_data(token):
     # 清理现有库存
     clear_response = import_data(token, "inventory", "DELETE FROM inventory;")
     print(f"清理库存: {clear_response.text}")
-    time.sleep(2)
     
     # 为商品ID 5-32 创建库存（对应新创建的商品）
     inventory_records = []
@@ -47,7 +34,6 @@ def fix_inventory_data(token):
             print(f"✅ 库存批次 {i//batch_size + 1} 创建成功")
         else:
             print(f"❌ 库存批次 {i//batch_size + 1} 失败: {response.text}")
-        time.sleep(0.5)
     
     print(f"✅ 库存数据修复完成：{len(inventory_records)} 条记录")
 
@@ -66,7 +52,7 @@ def main():
     print("\n🧪 测试修复结果...")
     headers = {"Authorization": f"Bearer {token}"}
     
-    stats_response = requests.get(f"{RAILWAY_URL}/data-import/stats", headers=headers)
+    stats_response = api.get(f"{RAILWAY_URL}/data-import/stats", headers=headers)
     if stats_response.status_code == 200:
         stats = stats_response.json()
         print(f"📊 最终数据统计:")
@@ -75,5 +61,8 @@ def main():
     
     print("\n✅ 库存修复完成！")
 
+    print(pacing_report())
+    print(compression_report())
+
 if __name__ == "__main__":
     main()
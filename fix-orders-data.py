@@ -1,138 +1,72 @@
 #!/usr/bin/env python3
-import re
+import argparse
 import json
-import requests
-import time
 
-# Railway API配置
-RAILWAY_URL = "https://web-production-7a257.up.railway.app/api"
+from wms_data.bulk import DEFAULT_ENVELOPE_BYTES
+from wms_data.client import RAILWAY_URL, api, compression_report, import_data, login, pacing_report
+from wms_data.importer import BulkImporter
+from wms_data.migration import DEFAULT_BATCH_ROWS, MigrationProgress, export_files, migration_batches, table_rows
+from wms_data.projection import dump_batches
 
-def login():
-    """登录获取token"""
-    response = requests.post(f"{RAILWAY_URL}/auth/login", 
-                           json={"username": "admin", "password": "123456"})
-    if response.status_code == 200:
-        return response.json().get("token")
-    else:
-        print(f"登录失败: {response.text}")
-        return None
-
-def import_data(token, table_name, sql_data):
-    """导入数据到Railway"""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-    
-    data = {
-        "tableName": table_name,
-        "data": sql_data
-    }
-    
-    response = requests.post(f"{RAILWAY_URL}/data-import/import", 
-                           headers=headers, json=data)
-    return response
-
-def process_sales_orders(token):
-    """处理销售订单数据"""
-    print("📊 处理销售订单数据...")
-    
-    # 从本地数据提取销售订单
-    with open("data-export/sales_orders.sql", 'r') as f:
-        content = f.read()
-    
-    # 提取INSERT语句
-    insert_pattern = r"INSERT INTO sales_orders VALUES\((.*?)\);"
-    matches = re.findall(insert_pattern, content)
+def import_orders(token, table_name, label, limit):
+    """按列名把转储里的订单映射到 init.ts 的表结构，逐单导入前 limit 个"""
+    # sales_orders 的 final_amount 按后端的算法由 total_amount - discount_amount + round_amount 推出，
+    # 转储里没有的列（payment_status 等）取表的默认值
+    batches = list(dump_batches(f"data-export/{table_name}.sql", table_name, limit=limit))
     
     success_count = 0
-    
-    for i, match in enumerate(matches[:50]):  # 处理前50个订单
-        try:
-            # 解析数据 - 根据您的本地数据格式
-            parts = [p.strip().strip("'") for p in match.split(',')]
-            
-            if len(parts) >= 14:
-                order_id = parts[0]
-                order_no = parts[1]
-                customer_id = parts[2] 
-                warehouse_id = parts[3]
-                order_date = parts[4]
-                total_amount = parts[6]
-                subtotal = parts[7]
-                tax_amount = parts[8]
-                discount = parts[9]
-                status = parts[10]
-                
-                # 转换为新格式的SQL
-                sql = f"""INSERT INTO sales_orders (id, order_no, customer_id, warehouse_id, order_date, 
-                         total_amount, subtotal, tax_amount, discount_amount, status, created_by, created_at, updated_at) 
-                         VALUES ({order_id}, '{order_no}', {customer_id}, {warehouse_id}, '{order_date}', 
-                         {total_amount}, {subtotal}, {tax_amount}, {discount}, '{status}', 1, 
-                         datetime('now'), datetime('now'));"""
-                
-                response = import_data(token, "sales_orders", sql)
+    total_count = sum(len(batch) for batch in batches)
+    
+    for batch in batches:
+        order_no_index = batch.column_names.index("order_no")
+        for i in range(len(batch)):
+            record = batch.slice(i, i + 1)
+            order_no = record.values[0][order_no_index]
+            try:
+                response = import_data(token, table_name, record.to_sql())
                 if response.status_code == 200:
                     success_count += 1
-                    print(f"✅ 销售订单 {order_no} 导入成功")
+                    print(f"✅ {label} {order_no} 导入成功")
                 else:
-                    print(f"❌ 销售订单 {order_no} 导入失败: {response.text}")
+                    print(f"❌ {label} {order_no} 导入失败: {response.text}")
                 
-                time.sleep(0.1)
-                
-        except Exception as e:
-            print(f"⚠️ 处理销售订单 {i+1} 时出错: {e}")
+            except Exception as e:
+                print(f"⚠️ 处理{label} {order_no} 时出错: {e}")
     
-    print(f"📈 销售订单: {success_count}/{min(len(matches), 50)} 记录导入成功")
+    print(f"📈 {label}: {success_count}/{total_count} 记录导入成功")
+
+def process_sales_orders(token):
+    """处理销售订单数据"""
+    print("📊 处理销售订单数据...")
+    import_orders(token, "sales_orders", "销售订单", 50)  # 处理前50个订单
 
 def process_purchase_orders(token):
     """处理采购订单数据"""
     print("📊 处理采购订单数据...")
-    
-    with open("data-export/purchase_orders.sql", 'r') as f:
-        content = f.read()
-    
-    insert_pattern = r"INSERT INTO purchase_orders VALUES\((.*?)\);"
-    matches = re.findall(insert_pattern, content)
-    
-    success_count = 0
-    
-    for i, match in enumerate(matches[:30]):  # 处理前30个订单
-        try:
-            parts = [p.strip().strip("'") for p in match.split(',')]
-            
-            if len(parts) >= 12:
-                order_id = parts[0]
-                order_no = parts[1]
-                supplier_id = parts[2]
-                warehouse_id = parts[3]
-                order_date = parts[4]
-                total_amount = parts[6]
-                subtotal = parts[7] if len(parts) > 7 else total_amount
-                tax_amount = parts[8] if len(parts) > 8 else "0"
-                status = parts[9] if len(parts) > 9 else "pending"
-                
-                sql = f"""INSERT INTO purchase_orders (id, order_no, supplier_id, warehouse_id, order_date,
-                         total_amount, subtotal, tax_amount, status, created_by, created_at, updated_at)
-                         VALUES ({order_id}, '{order_no}', {supplier_id}, {warehouse_id}, '{order_date}',
-                         {total_amount}, {subtotal}, {tax_amount}, '{status}', 1,
-                         datetime('now'), datetime('now'));"""
-                
-                response = import_data(token, "purchase_orders", sql)
-                if response.status_code == 200:
-                    success_count += 1
-                    print(f"✅ 采购订单 {order_no} 导入成功")
-                else:
-                    print(f"❌ 采购订单 {order_no} 导入失败: {response.text}")
-                
-                time.sleep(0.1)
-                
-        except Exception as e:
-            print(f"⚠️ 处理采购订单 {i+1} 时出错: {e}")
-    
-    print(f"📈 采购订单: {success_count}/{min(len(matches), 30)} 记录导入成功")
+    import_orders(token, "purchase_orders", "采购订单", 30)  # 处理前30个订单
+
+def migrate_orders(args):
+    """整表迁移销售订单和采购订单：全部订单按 batch_rows 行一批，打包成信封在事务中导入"""
+    print("📊 整表迁移销售订单和采购订单...")
+    files = export_files("data-export", ["sales_orders", "purchase_orders"])
+    progress = MigrationProgress(table_rows(files, args.workers))
+    importer = BulkImporter(concurrency=args.concurrency,
+                            envelope_bytes=args.envelope_bytes or None, columnar=args.columnar)
+    importer.import_all(migration_batches(files, args.batch_rows, workers=args.workers, progress=progress))
+    print(f"📈 整表迁移：{progress.summary()}")
 
 def main():
+    parser = argparse.ArgumentParser(description="修复订单数据导入")
+    parser.add_argument("--full", action="store_true",
+                        help="迁移全部订单（默认只逐单导入前 50 个销售订单和前 30 个采购订单）")
+    parser.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS, help="整表迁移时每批的行数")
+    parser.add_argument("--concurrency", type=int, default=4, help="同时在途的导入请求数上限（实际并发由自适应限速调整）")
+    parser.add_argument("--envelope-bytes", type=int, default=DEFAULT_ENVELOPE_BYTES,
+                        help="打包成批量导入信封的大小上限（字节），一个信封一次事务；0 表示逐批走 /import")
+    parser.add_argument("--columnar", action="store_true", help="信封用列式 MessagePack 编码，体积更小")
+    parser.add_argument("--workers", type=int, default=1, help="解析转储的进程数")
+    args = parser.parse_args()
+
     print("🔧 修复订单数据导入")
     print("=" * 30)
     
@@ -145,14 +79,16 @@ def main():
     print("✅ 登录成功")
     
     # 处理订单数据
-    process_sales_orders(token)
-    time.sleep(2)
-    process_purchase_orders(token)
+    if args.full:
+        migrate_orders(args)
+    else:
+        process_sales_orders(token)
+        process_purchase_orders(token)
     
     # 获取最终统计
     print("\n📊 最终数据统计:")
-    response = requests.get(f"{RAILWAY_URL}/data-import/stats", 
-                          headers={"Authorization": f"Bearer {token}"})
+    response = api.get(f"{RAILWAY_URL}/data-import/stats", 
+                     headers={"Authorization": f"Bearer {token}"})
     if response.status_code == 200:
         stats = response.json()
         for table, count in stats.items():
@@ -161,5 +97,8 @@ def main():
     print("\n🎉 订单数据修复完成！")
     print("现在请刷新页面查看您的销售订单和采购订单数据！")
 
+    print(pacing_report())
+    print(compression_report())
+
 if __name__ == "__main__":
     main()
@@ -1,19 +1,7 @@
 #!/usr/bin/env python3
-import requests
-import time
 import random
 
-RAILWAY_URL = "https://web-production-7a257.up.railway.app/api"
-
-def login():
-    response = requests.post(f"{RAILWAY_URL}/auth/login", 
-                           json={"username": "admin", "password": "123456"})
-    return response.json().get("token") if response.status_code == 200 else None
-
-def import_data(token, table_name, sql_data):
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-    data = {"tableName": table_name, "data": sql_data}
-    return requests.post(f"{RAILWAY_URL}/data-import/import", headers=headers, json=data)
+from wms_data.client import RAILWAY_URL, api, compression_report, import_data, login, pacing_report
 
 def fix_product_data(token):
     """修复商品数据和关联问题"""
@@ -25,8 +13,6 @@ def fix_product_data(token):
     clear_items = import_data(token, "items", "DELETE FROM items WHERE id > 4;")
     print(f"清理结果: {clear_items.text if clear_items else 'OK'}")
     
-    time.sleep(2)
-    
     # 2. 创建完整的高质量商品数据
     print("📱 创建完整的高质量商品数据...")
     
@@ -85,7 +71,6 @@ def fix_product_data(token):
             print(f"✅ {name}")
         else:
             print(f"❌ {name} - {response.text}")
-        time.sleep(0.05)
     
     print(f"✅ {len(premium_items)} 个高质量商品创建完成")
     
@@ -94,7 +79,6 @@ def fix_product_data(token):
     
     # 清理现有库存
     clear_inventory = import_data(token, "inventory", "DELETE FROM inventory;")
-    time.sleep(1)
     
     # 为新商品创建库存记录
     inventory_data = []
@@ -117,14 +101,12 @@ def fix_product_data(token):
             response = import_data(token, "inventory", sql)
             if response.status_code == 200:
                 print(f"✅ 库存批次 {j//batch_size + 1} 创建成功")
-            time.sleep(0.3)
     
     # 4. 修复销售订单明细中的商品关联
     print("\n🔗 修复销售订单明细中的商品关联...")
     
     # 清理并重新创建销售订单明细
     clear_items_sql = import_data(token, "sales_order_items", "DELETE FROM sales_order_items;")
-    time.sleep(2)
     
     # 为前200个销售订单重新创建明细
     detail_count = 0
@@ -163,7 +145,6 @@ def fix_product_data(token):
                     print(f"✅ 已修复 {detail_count} 条销售明细")
                 
                 batch_values = []
-                time.sleep(0.5)
     
     # 插入剩余明细
     if batch_values:
@@ -177,7 +158,6 @@ def fix_product_data(token):
     
     # 清理并重新创建采购订单明细
     clear_purchase_items = import_data(token, "purchase_order_items", "DELETE FROM purchase_order_items;")
-    time.sleep(1)
     
     # 为前50个采购订单创建明细
     purchase_detail_count = 0
@@ -214,7 +194,6 @@ def fix_product_data(token):
                     print(f"✅ 已修复 {purchase_detail_count} 条采购明细")
                 
                 purchase_batch_values = []
-                time.sleep(0.5)
     
     # 插入剩余采购明细
     if purchase_batch_values:
@@ -230,7 +209,7 @@ def test_data_integrity(token):
     headers = {"Authorization": f"Bearer {token}"}
     
     # 测试商品排行
-    items_response = requests.get(f"{RAILWAY_URL}/reports/top-selling-items?limit=10", headers=headers)
+    items_response = api.get(f"{RAILWAY_URL}/reports/top-selling-items?limit=10", headers=headers)
     if items_response.status_code == 200:
         items_data = items_response.json()
         print(f"🏆 热销商品排行：{len(items_data)} 个商品")
@@ -240,7 +219,7 @@ def test_data_integrity(token):
         print(f"❌ 商品排行查询失败: {items_response.text}")
     
     # 获取最终统计
-    stats_response = requests.get(f"{RAILWAY_URL}/data-import/stats", headers=headers)
+    stats_response = api.get(f"{RAILWAY_URL}/data-import/stats", headers=headers)
     if stats_response.status_code == 200:
         stats = stats_response.json()
         print(f"\n📊 修复后数据统计:")
@@ -272,5 +251,8 @@ def main():
     print("\n🚀 现在所有商品都应该正确显示中文名称！")
     print("请刷新页面查看修复效果。")
 
+    print(pacing_report())
+    print(compression_report())
+
 if __name__ == "__main__":
     main()
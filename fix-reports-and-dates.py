@@ -1,37 +1,8 @@
 #!/usr/bin/env python3
-import requests
-import time
 import random
 from datetime import datetime, timedelta
 
-# Railway API配置
-RAILWAY_URL = "https://web-production-7a257.up.railway.app/api"
-
-def login():
-    """登录获取token"""
-    response = requests.post(f"{RAILWAY_URL}/auth/login", 
-                           json={"username": "admin", "password": "123456"})
-    if response.status_code == 200:
-        return response.json().get("token")
-    else:
-        print(f"登录失败: {response.text}")
-        return None
-
-def import_data(token, table_name, sql_data):
-    """导入数据到Railway"""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-    
-    data = {
-        "tableName": table_name,
-        "data": sql_data
-    }
-    
-    response = requests.post(f"{RAILWAY_URL}/data-import/import", 
-                           headers=headers, json=data)
-    return response
+from wms_data.client import RAILWAY_URL, api, compression_report, import_data, login, pacing_report
 
 def fix_order_dates_for_charts(token):
     """修复订单日期，确保报表图表有数据显示"""
@@ -42,8 +13,6 @@ def fix_order_dates_for_charts(token):
     clear_response = import_data(token, "sales_orders", "DELETE FROM sales_orders;")
     print(f"清空结果: {clear_response.text if clear_response else 'OK'}")
     
-    time.sleep(2)
-    
     # 创建过去30天的每日销售数据
     print("📅 创建过去30天的每日销售数据...")
     
@@ -106,8 +75,6 @@ def fix_order_dates_for_charts(token):
                 if response.status_code == 200:
                     print(f"  ✅ {order_date} 批次 {j//batch_size + 1} 成功")
                 
-                time.sleep(0.3)
-        
         total_orders += daily_orders
         total_revenue += daily_revenue
         
@@ -124,8 +91,8 @@ def create_order_items_for_reports(token):
     print("📋 创建订单明细以支持报表分析...")
     
     # 获取当前订单数量
-    stats_response = requests.get(f"{RAILWAY_URL}/data-import/stats", 
-                                headers={"Authorization": f"Bearer {token}"})
+    stats_response = api.get(f"{RAILWAY_URL}/data-import/stats", 
+                           headers={"Authorization": f"Bearer {token}"})
     
     if stats_response.status_code == 200:
         stats = stats_response.json()
@@ -172,7 +139,6 @@ def create_order_items_for_reports(token):
                         print(f"✅ 已创建 {detail_count} 条订单明细")
                     
                     batch_values = []
-                    time.sleep(0.5)
         
         # 插入剩余明细
         if batch_values:
@@ -197,7 +163,6 @@ def main():
     
     # 修复日期和报表数据
     fix_order_dates_for_charts(token)
-    time.sleep(3)
     create_order_items_for_reports(token)
     
     # 测试报表API
@@ -206,7 +171,7 @@ def main():
     headers = {"Authorization": f"Bearer {token}"}
     
     # 测试销售趋势
-    trend_response = requests.get(f"{RAILWAY_URL}/reports/sales-trend?start_date=2025-08-18&end_date=2025-09-17", headers=headers)
+    trend_response = api.get(f"{RAILWAY_URL}/reports/sales-trend?start_date=2025-08-18&end_date=2025-09-17", headers=headers)
     if trend_response.status_code == 200:
         trend_data = trend_response.json()
         print(f"📈 销售趋势数据：{len(trend_data)} 个数据点")
@@ -215,15 +180,15 @@ def main():
             print(f"  最新：{trend_data[-1]['date']} - ¥{trend_data[-1]['sales_amount']:,}")
     
     # 测试商品排行
-    items_response = requests.get(f"{RAILWAY_URL}/reports/top-selling-items?limit=5", headers=headers)
+    items_response = api.get(f"{RAILWAY_URL}/reports/top-selling-items?limit=5", headers=headers)
     if items_response.status_code == 200:
         items_data = items_response.json()
         print(f"🏆 热销商品：{len(items_data)} 个商品")
     
     # 获取最终统计
     print("\n📊 最终数据统计:")
-    response = requests.get(f"{RAILWAY_URL}/data-import/stats", 
-                          headers={"Authorization": f"Bearer {token}"})
+    response = api.get(f"{RAILWAY_URL}/data-import/stats", 
+                     headers={"Authorization": f"Bearer {token}"})
     if response.status_code == 200:
         stats = response.json()
         for table, count in stats.items():
@@ -235,5 +200,8 @@ def main():
     print("👥 客户分析应该显示完整信息")
     print("\n🚀 请刷新页面查看美丽的报表图表！")
 
+    print(pacing_report())
+    print(compression_report())
+
 if __name__ == "__main__":
     main()
@@ -1,35 +1,6 @@
 #!/usr/bin/env python3
-import requests
-import time
 
-# Railway API配置
-RAILWAY_URL = "https://web-production-7a257.up.railway.app/api"
-
-def login():
-    """登录获取token"""
-    response = requests.post(f"{RAILWAY_URL}/auth/login", 
-                           json={"username": "admin", "password": "123456"})
-    if response.status_code == 200:
-        return response.json().get("token")
-    else:
-        print(f"登录失败: {response.text}")
-        return None
-
-def import_data(token, table_name, sql_data):
-    """导入数据到Railway"""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-    
-    data = {
-        "tableName": table_name,
-        "data": sql_data
-    }
-    
-    response = requests.post(f"{RAILWAY_URL}/data-import/import", 
-                           headers=headers, json=data)
-    return response
+from wms_data.client import RAILWAY_URL, api, compression_report, import_data, login, pacing_report
 
 def fix_suppliers(token):
     """修复供应商数据 - 使用正确字段"""
@@ -62,7 +33,6 @@ def fix_suppliers(token):
         response = import_data(token, "suppliers", sql)
         if response.status_code == 200:
             print(f"✅ 顶级供应商 {name} 创建成功")
-        time.sleep(0.1)
 
 def fix_items(token):
     """修复商品数据 - 使用正确字段"""
@@ -92,7 +62,6 @@ def fix_items(token):
         response = import_data(token, "items", sql)
         if response.status_code == 200:
             print(f"✅ 高价值商品 {name} 创建成功")
-        time.sleep(0.1)
 
 def main():
     print("🔧 修复供应商、商品数据")
@@ -108,13 +77,12 @@ def main():
     
     # 修复数据
     fix_suppliers(token)
-    time.sleep(2)
     fix_items(token)
     
     # 获取最终统计
     print("\n📊 修复后数据统计:")
-    response = requests.get(f"{RAILWAY_URL}/data-import/stats", 
-                          headers={"Authorization": f"Bearer {token}"})
+    response = api.get(f"{RAILWAY_URL}/data-import/stats", 
+                     headers={"Authorization": f"Bearer {token}"})
     if response.status_code == 200:
         stats = response.json()
         for table, count in stats.items():
@@ -123,5 +91,8 @@ def main():
     print("\n✅ 数据修复完成！")
     print("现在检查报表分析功能...")
 
+    print(pacing_report())
+    print(compression_report())
+
 if __name__ == "__main__":
     main()
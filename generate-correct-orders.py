@@ -1,39 +1,25 @@
 #!/usr/bin/env python3
-import requests
-import time
+import argparse
 import random
-from datetime import datetime, timedelta
+from datetime import timedelta
 
-# Railway API配置
-RAILWAY_URL = "https://web-production-7a257.up.railway.app/api"
+from wms_data.client import RAILWAY_URL, api, compression_report, login, pacing_report
+from wms_data.importer import InsertBatch
+from wms_data.journal import SeedJournal
 
-def login():
-    """登录获取token"""
-    response = requests.post(f"{RAILWAY_URL}/auth/login", 
-                           json={"username": "admin", "password": "123456"})
-    if response.status_code == 200:
-        return response.json().get("token")
+def send(journal, batch, label):
+    """经断点续传日志发送一批，返回提交的行数（续跑跳过的批次按整批计）"""
+    result = journal.send(batch)
+    if result is None:
+        print(f"⏭️ {label} 已在上次运行中提交，跳过")
+        return len(batch)
+    if result.ok:
+        print(f"✅ {label} 成功")
     else:
-        print(f"登录失败: {response.text}")
-        return None
-
-def import_data(token, table_name, sql_data):
-    """导入数据到Railway"""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-    
-    data = {
-        "tableName": table_name,
-        "data": sql_data
-    }
-    
-    response = requests.post(f"{RAILWAY_URL}/data-import/import", 
-                           headers=headers, json=data)
-    return response
+        print(f"⚠️ {label} 成功 {result.committed}/{len(batch)} 行，{result.rejected} 行写入拒绝文件")
+    return result.committed
 
-def generate_sales_orders(token, count=100):
+def generate_sales_orders(journal, count=100):
     """生成销售订单数据 - 使用正确的字段"""
     print(f"💰 生成 {count} 个销售订单...")
     
@@ -42,7 +28,7 @@ def generate_sales_orders(token, count=100):
     statuses = ['completed', 'completed', 'completed', 'pending', 'cancelled']
     payment_statuses = ['paid', 'paid', 'unpaid', 'partial']
     
-    base_date = datetime.now() - timedelta(days=180)
+    base_date = journal.now - timedelta(days=180)
     success_count = 0
     
     # 批量生成
@@ -53,7 +39,7 @@ def generate_sales_orders(token, count=100):
         values_list = []
         for i in range(batch_start, batch_end):
             order_date = (base_date + timedelta(days=random.randint(0, 180))).strftime('%Y-%m-%d %H:%M:%S')
-            order_no = f"SO-{datetime.now().strftime('%Y%m%d')}-{10000 + i}"
+            order_no = f"SO-{journal.now.strftime('%Y%m%d')}-{10000 + i}"
             customer_id = random.choice(customer_ids)
             warehouse_id = random.choice(warehouse_ids)
             
@@ -78,26 +64,19 @@ def generate_sales_orders(token, count=100):
                                '{payment_status}', 'full', '{status}', 'Demo订单数据', 
                                datetime('now'), datetime('now'))""")
         
-        # 批量插入SQL
-        sql = f"""INSERT INTO sales_orders (order_no, customer_id, warehouse_id, order_date, 
-                 subtotal, tax_rate, tax_amount, discount_amount, final_amount, paid_amount, 
-                 total_cost, gross_profit, profit_margin, payment_status, payment_type, 
-                 status, remarks, created_at, updated_at) 
-                 VALUES {', '.join(values_list)};"""
+        # 批量插入（临时错误自动重试，坏行二分定位后写入拒绝文件）
+        success_count += send(journal, InsertBatch(
+            "sales_orders",
+            "order_no, customer_id, warehouse_id, order_date, subtotal, tax_rate, tax_amount, "
+            "discount_amount, final_amount, paid_amount, total_cost, gross_profit, profit_margin, "
+            "payment_status, payment_type, status, remarks, created_at, updated_at",
+            values_list,
+        ), f"销售订单批次 {batch_start+1}-{batch_end}")
         
-        response = import_data(token, "sales_orders", sql)
-        if response.status_code == 200:
-            success_count += len(values_list)
-            print(f"✅ 销售订单批次 {batch_start+1}-{batch_end} 成功")
-        else:
-            print(f"❌ 销售订单批次 {batch_start+1}-{batch_end} 失败: {response.text}")
-        
-        time.sleep(0.5)
-    
     print(f"📈 销售订单: {success_count}/{count} 创建成功")
     return success_count
 
-def generate_purchase_orders(token, count=100):
+def generate_purchase_orders(journal, count=100):
     """生成采购订单数据 - 使用正确的字段"""
     print(f"🛒 生成 {count} 个采购订单...")
     
@@ -105,7 +84,7 @@ def generate_purchase_orders(token, count=100):
     warehouse_ids = [1, 2]
     statuses = ['completed', 'completed', 'pending', 'cancelled']
     
-    base_date = datetime.now() - timedelta(days=200)
+    base_date = journal.now - timedelta(days=200)
     success_count = 0
     
     # 批量生成
@@ -116,7 +95,7 @@ def generate_purchase_orders(token, count=100):
         values_list = []
         for i in range(batch_start, batch_end):
             order_date = (base_date + timedelta(days=random.randint(0, 200))).strftime('%Y-%m-%d %H:%M:%S')
-            order_no = f"PO-{datetime.now().strftime('%Y%m%d')}-{20000 + i}"
+            order_no = f"PO-{journal.now.strftime('%Y%m%d')}-{20000 + i}"
             supplier_id = random.choice(supplier_ids)
             warehouse_id = random.choice(warehouse_ids)
             
@@ -136,25 +115,19 @@ def generate_purchase_orders(token, count=100):
                                {paid_amount}, '{payment_status}', 'full', '{status}', 'Demo采购数据', 
                                datetime('now'), datetime('now'))""")
         
-        # 批量插入SQL - 根据实际的采购订单表结构
-        sql = f"""INSERT INTO purchase_orders (order_no, supplier_id, warehouse_id, order_date, 
-                 subtotal, tax_rate, tax_amount, discount_amount, final_amount, paid_amount, 
-                 payment_status, payment_type, status, remarks, created_at, updated_at) 
-                 VALUES {', '.join(values_list)};"""
+        # 批量插入 - 根据实际的采购订单表结构
+        success_count += send(journal, InsertBatch(
+            "purchase_orders",
+            "order_no, supplier_id, warehouse_id, order_date, subtotal, tax_rate, tax_amount, "
+            "discount_amount, final_amount, paid_amount, payment_status, payment_type, status, remarks, "
+            "created_at, updated_at",
+            values_list,
+        ), f"采购订单批次 {batch_start+1}-{batch_end}")
         
-        response = import_data(token, "purchase_orders", sql)
-        if response.status_code == 200:
-            success_count += len(values_list)
-            print(f"✅ 采购订单批次 {batch_start+1}-{batch_end} 成功")
-        else:
-            print(f"❌ 采购订单批次 {batch_start+1}-{batch_end} 失败: {response.text}")
-        
-        time.sleep(0.5)
-    
     print(f"📈 采购订单: {success_count}/{count} 创建成功")
     return success_count
 
-def generate_sales_order_items(token, sales_count):
+def generate_sales_order_items(journal, sales_count):
     """生成销售订单明细"""
     print("📋 生成销售订单明细...")
     
@@ -182,19 +155,16 @@ def generate_sales_order_items(token, sales_count):
                 values_list.append(f"({order_id}, {item_id}, {quantity}, {unit_price}, {unit_cost}, {total_price}, {total_cost}, {delivered_quantity}, datetime('now'))")
         
         if values_list:
-            sql = f"""INSERT INTO sales_order_items (order_id, item_id, quantity, unit_price, unit_cost, total_price, total_cost, delivered_quantity, created_at) 
-                      VALUES {', '.join(values_list)};"""
+            success_count += send(journal, InsertBatch(
+                "sales_order_items",
+                "order_id, item_id, quantity, unit_price, unit_cost, total_price, total_cost, "
+                "delivered_quantity, created_at",
+                values_list,
+            ), f"销售明细批次 {batch_start}-{batch_end-1}")
             
-            response = import_data(token, "sales_order_items", sql)
-            if response.status_code == 200:
-                success_count += len(values_list)
-                print(f"✅ 销售明细批次 {batch_start}-{batch_end-1} 成功")
-            
-            time.sleep(0.3)
-    
     print(f"📈 销售订单明细: {success_count} 条创建成功")
 
-def generate_purchase_order_items(token, purchase_count):
+def generate_purchase_order_items(journal, purchase_count):
     """生成采购订单明细"""
     print("📋 生成采购订单明细...")
     
@@ -221,19 +191,19 @@ def generate_purchase_order_items(token, purchase_count):
         
         if values_list:
             # 根据实际的采购订单明细表结构
-            sql = f"""INSERT INTO purchase_order_items (order_id, item_id, quantity, unit_price, total_price, received_quantity, created_at) 
-                      VALUES {', '.join(values_list)};"""
+            success_count += send(journal, InsertBatch(
+                "purchase_order_items",
+                "order_id, item_id, quantity, unit_price, total_price, received_quantity, created_at",
+                values_list,
+            ), f"采购明细批次 {batch_start}-{batch_end-1}")
             
-            response = import_data(token, "purchase_order_items", sql)
-            if response.status_code == 200:
-                success_count += len(values_list)
-                print(f"✅ 采购明细批次 {batch_start}-{batch_end-1} 成功")
-            
-            time.sleep(0.3)
-    
     print(f"📈 采购订单明细: {success_count} 条创建成功")
 
 def main():
+    parser = argparse.ArgumentParser(description="生成大量正确格式的演示数据")
+    parser.add_argument("--resume", action="store_true", help="从上次中断的位置继续，不重复也不遗漏")
+    args = parser.parse_args()
+
     print("🚀 生成大量正确格式的演示数据")
     print("=" * 60)
     
@@ -248,26 +218,27 @@ def main():
     # 生成订单数据
     print("\n🔥 开始生成大量订单数据...")
     
+    # 批次经断点续传日志发送：续跑时恢复随机数状态和基准时间，跳过已提交的批次
+    journal = SeedJournal.open("generate-correct-orders", resume=args.resume)
+    
     # 生成100个销售订单
-    sales_count = generate_sales_orders(token, 100)
-    time.sleep(2)
+    sales_count = generate_sales_orders(journal, 100)
     
     # 生成100个采购订单
-    purchase_count = generate_purchase_orders(token, 100)
-    time.sleep(2)
+    purchase_count = generate_purchase_orders(journal, 100)
     
-    # 生成订单明细
+    # 生成订单明细：按生成的订单数而不是本次提交的行数，续跑时重新生成的明细批次才与日志一致
     if sales_count > 0:
-        generate_sales_order_items(token, sales_count)
-        time.sleep(2)
+        generate_sales_order_items(journal, 100)
     
     if purchase_count > 0:
-        generate_purchase_order_items(token, purchase_count)
+        generate_purchase_order_items(journal, 100)
+    journal.finish()
     
     # 获取最终统计
     print("\n📊 最终数据统计:")
-    response = requests.get(f"{RAILWAY_URL}/data-import/stats", 
-                          headers={"Authorization": f"Bearer {token}"})
+    response = api.get(f"{RAILWAY_URL}/data-import/stats", 
+                     headers={"Authorization": f"Bearer {token}"})
     if response.status_code == 200:
         stats = response.json()
         for table, count in stats.items():
@@ -287,5 +258,8 @@ def main():
     print("\n🚀 完美的Demo系统准备就绪！")
     print("现在请刷新页面，查看您丰富的演示数据！")
 
+    print(pacing_report())
+    print(compression_report())
+
 if __name__ == "__main__":
     main()
@@ -1,212 +1,218 @@
 #!/usr/bin/env python3
-import requests
-import time
+import argparse
 import random
 from datetime import datetime, timedelta
 
-# Railway API配置
-RAILWAY_URL = "https://web-production-7a257.up.railway.app/api"
+from wms_data.client import RAILWAY_URL, api, compression_report, get_client, login, pacing_report
+from wms_data.orders import (ORDER_TABLES, IdRange, fetch_catalog, order_batches, pick_lines, purchase_order,
+                             sales_order)
+from wms_data.dump_sink import DumpSink
+from wms_data.inventory import InventoryLedger, fetch_inventory
+from wms_data.journal import SeedJournal
+from wms_data.shards import DEFAULT_WORKERS, run_shards, shard_random, split_count, split_shard
+from wms_data.sqlite_sink import SqliteSink
 
-def login():
-    """登录获取token"""
-    response = requests.post(f"{RAILWAY_URL}/auth/login", 
-                           json={"username": "admin", "password": "123456"})
-    if response.status_code == 200:
-        return response.json().get("token")
-    else:
-        print(f"登录失败: {response.text}")
-        return None
-
-def import_data(token, table_name, sql_data):
-    """导入数据到Railway"""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-    
-    data = {
-        "tableName": table_name,
-        "data": sql_data
-    }
-    
-    response = requests.post(f"{RAILWAY_URL}/data-import/import", 
-                           headers=headers, json=data)
-    return response
-
-def generate_sales_orders(token, count=100):
-    """生成大量销售订单数据"""
-    print(f"💰 生成 {count} 个销售订单...")
-    
-    # 基础数据
+MONTH_DAYS = 30
+
+def month_shards(table, seed, now, count, days):
+    """把 count 个订单随机分到 now 之前 days 天内（含两端），每 30 天一个分片（订单多时再按 MAX_SHARD_ORDERS 切开）
+
+    返回 (key, (base_date, 起始天, 结束天, 订单数, 第一个订单的序号)) 列表，供 run_shards 使用。
+    """
+    base_date = now - timedelta(days=days)
+    spans = [(start, min(start + MONTH_DAYS, days + 1) - 1) for start in range(0, days + 1, MONTH_DAYS)]
+    counts = split_count(shard_random(seed, table), count, [last - first + 1 for first, last in spans])
+    shards = []
+    first_index = 0
+    for (first_day, last_day), shard_count in zip(spans, counts):
+        for key, part_count, offset in split_shard((table, first_day), shard_count):
+            shards.append((key, (base_date, first_day, last_day, part_count, first_index + offset)))
+        first_index += shard_count
+    return shards
+
+def sales_order_shard(rng, base_date, first_day, last_day, count, first_index, first_id, catalog):
+    """生成下单日期在 base_date 之后第 first_day-last_day 天的 count 个销售订单及明细（一个分片）
+
+    订单 id 从 first_id 起连续编号，返回 [(表头行, 明细行列表)]。
+    """
     customer_ids = [1, 2, 3, 4, 5, 6]
     warehouse_ids = [1, 2]
-    item_ids = list(range(1, 21))  # 1-20
     statuses = ['completed', 'completed', 'completed', 'pending', 'cancelled']
     
-    base_date = datetime.now() - timedelta(days=180)  # 从6个月前开始
-    success_count = 0
-    
-    # 批量生成订单
-    batch_size = 10
-    for batch_start in range(0, count, batch_size):
-        batch_end = min(batch_start + batch_size, count)
-        
-        # 构建批量插入SQL
-        values_list = []
-        for i in range(batch_start, batch_end):
-            order_date = (base_date + timedelta(days=random.randint(0, 180))).strftime('%Y-%m-%d')
-            order_no = f"SO-{order_date.replace('-', '')}-{10000 + i}"
-            customer_id = random.choice(customer_ids)
-            warehouse_id = random.choice(warehouse_ids)
-            
-            # 随机生成订单金额
-            total_amount = random.randint(1000, 50000)
-            tax_amount = round(total_amount * 0.15, 2)
-            discount_amount = random.randint(0, 1000) if i % 7 == 0 else 0
-            status = random.choice(statuses)
-            
-            # 添加到values列表
-            values_list.append(f"('{order_no}', {customer_id}, {warehouse_id}, '{order_date}', {total_amount}, {tax_amount}, {discount_amount}, '{status}', 1, datetime('now'), datetime('now'))")
+    orders = []
+    for i in range(first_index, first_index + count):
+        order_date = (base_date + timedelta(days=rng.randint(first_day, last_day))).strftime('%Y-%m-%d')
+        order_no = f"SO-{order_date.replace('-', '')}-{10000 + i}"
+        customer_id = rng.choice(customer_ids)
+        warehouse_id = rng.choice(warehouse_ids)
         
-        # 构建批量插入SQL
-        sql = f"""INSERT INTO sales_orders (order_no, customer_id, warehouse_id, order_date, total_amount, tax_amount, discount_amount, status, created_by, created_at, updated_at) 
-                  VALUES {', '.join(values_list)};"""
+        # 随机生成订单金额预算，每个订单随机1-3个商品，金额由明细汇总
+        budget = rng.randint(1000, 50000)
+        discount_amount = rng.randint(0, 1000) if i % 7 == 0 else 0
+        status = rng.choice(statuses)
+        lines = pick_lines(rng, catalog, budget, rng.randint(1, 3))
         
-        # 执行批量插入
-        response = import_data(token, "sales_orders", sql)
-        if response.status_code == 200:
-            success_count += len(values_list)
-            print(f"✅ 批量插入销售订单 {batch_start+1}-{batch_end} 成功")
-        else:
-            print(f"❌ 批量插入销售订单 {batch_start+1}-{batch_end} 失败: {response.text}")
-        
-        time.sleep(0.5)  # 避免API限制
-    
-    print(f"📈 销售订单: {success_count}/{count} 创建成功")
-    return success_count
+        orders.append(sales_order(first_id + i - first_index, lines, order_no, customer_id, warehouse_id,
+                                  order_date, status, discount_amount,
+                                  'paid' if status == 'completed' else 'unpaid'))
+    return orders
 
-def generate_purchase_orders(token, count=100):
-    """生成大量采购订单数据"""
-    print(f"🛒 生成 {count} 个采购订单...")
-    
-    # 基础数据
+def purchase_order_shard(rng, base_date, first_day, last_day, count, first_index, first_id, catalog):
+    """生成下单日期在 base_date 之后第 first_day-last_day 天的 count 个采购订单及明细（一个分片）"""
     supplier_ids = [1, 2, 3, 4]
     warehouse_ids = [1, 2]
     statuses = ['completed', 'completed', 'pending', 'cancelled']
     
-    base_date = datetime.now() - timedelta(days=200)  # 从200天前开始
+    orders = []
+    for i in range(first_index, first_index + count):
+        order_date = (base_date + timedelta(days=rng.randint(first_day, last_day))).strftime('%Y-%m-%d')
+        order_no = f"PO-{order_date.replace('-', '')}-{20000 + i}"
+        supplier_id = rng.choice(supplier_ids)
+        warehouse_id = rng.choice(warehouse_ids)
+        
+        # 随机生成采购金额预算，每个采购订单随机1-2个商品
+        budget = rng.randint(10000, 200000)
+        status = rng.choice(statuses)
+        lines = pick_lines(rng, catalog, budget, rng.randint(1, 2), price="purchase_price")
+        
+        orders.append(purchase_order(first_id + i - first_index, lines, order_no, supplier_id, warehouse_id,
+                                     order_date, status))
+    return orders
+
+def generate_orders(table, shard_func, days, now, seed, workers, catalog, count=100, sink=None, ledger=None,
+                    journal=None):
+    """生成 count 个订单及明细（按月分片并行生成），订单 id 向服务器（或离线目标 sink）一次预留
+
+    经 API 发送时批次和预留的 id 都记在断点续传日志 journal 中，续跑时跳过已提交的批次、复用原来的 id。
+    传入 InventoryLedger 时，发送的批次同时记入 ledger，最后由它推导库存。
+    """
+    if sink is not None:
+        first_id, _ = sink.allocate_ids(table, count)
+    else:
+        first_id, _ = journal.allocate_ids(table, count, get_client().allocate_ids)
+    shards = [(key, args + (first_id + args[4], catalog))
+              for key, args in month_shards(table, seed, now, count, days)]
+    orders = (order for shard in run_shards(shard_func, shards, seed, workers) for order in shard)
+    track = ledger.track if ledger is not None else iter
+    
+    if sink is not None:
+        # 离线目标：订单和明细一次写入
+        sink.write_shard(track(order_batches(table, orders, 500)))
+        return count, sink.rows.get(ORDER_TABLES[table][1], 0)
+    
     success_count = 0
+    item_count = 0
     
-    # 批量生成订单
+    # 批量插入：每10个订单一批，订单批次成功后再插入它的明细
     batch_size = 10
-    for batch_start in range(0, count, batch_size):
-        batch_end = min(batch_start + batch_size, count)
-        
-        # 构建批量插入SQL
-        values_list = []
-        for i in range(batch_start, batch_end):
-            order_date = (base_date + timedelta(days=random.randint(0, 200))).strftime('%Y-%m-%d')
-            order_no = f"PO-{order_date.replace('-', '')}-{20000 + i}"
-            supplier_id = random.choice(supplier_ids)
-            warehouse_id = random.choice(warehouse_ids)
-            
-            # 随机生成采购金额
-            total_amount = random.randint(10000, 200000)
-            tax_amount = round(total_amount * 0.15, 2)
-            status = random.choice(statuses)
-            
-            # 添加到values列表
-            values_list.append(f"('{order_no}', {supplier_id}, {warehouse_id}, '{order_date}', {total_amount}, {tax_amount}, '{status}', 1, datetime('now'), datetime('now'))")
+    batches = track(order_batches(table, orders, batch_size))
+    for number, header_batch in enumerate(batches):
+        item_batch = next(batches)
+        first = number * batch_size + 1
+        last = number * batch_size + len(header_batch)
         
-        # 构建批量插入SQL
-        sql = f"""INSERT INTO purchase_orders (order_no, supplier_id, warehouse_id, order_date, total_amount, tax_amount, status, created_by, created_at, updated_at) 
-                  VALUES {', '.join(values_list)};"""
+        # 执行批量插入（临时错误自动重试，坏行二分定位后写入拒绝文件）
+        result = journal.send(header_batch)
+        item_result = journal.send(item_batch)
+        if result is None and item_result is None:
+            success_count += len(header_batch)
+            item_count += len(item_batch)
+            print(f"⏭️ 订单 {first}-{last} 已在上次运行中提交，跳过")
+            continue
         
-        # 执行批量插入
-        response = import_data(token, "purchase_orders", sql)
-        if response.status_code == 200:
-            success_count += len(values_list)
-            print(f"✅ 批量插入采购订单 {batch_start+1}-{batch_end} 成功")
+        if result is None:
+            success_count += len(header_batch)
         else:
-            print(f"❌ 批量插入采购订单 {batch_start+1}-{batch_end} 失败: {response.text}")
+            success_count += result.committed
+            if not result.ok:
+                print(f"⚠️ 批量插入订单 {first}-{last} 成功 {result.committed}/{len(header_batch)} 行，"
+                      f"{result.rejected} 行写入拒绝文件")
         
-        time.sleep(0.5)  # 避免API限制
+        if item_result is None:
+            item_count += len(item_batch)
+        else:
+            item_count += item_result.committed
+        if (result is None or result.ok) and (item_result is None or item_result.ok):
+            print(f"✅ 批量插入订单 {first}-{last}（{len(item_batch)} 条明细）成功")
+        elif item_result is not None and not item_result.ok:
+            print(f"⚠️ 订单 {first}-{last} 的明细成功 {item_result.committed}/{len(item_batch)} 行，"
+                  f"{item_result.rejected} 行写入拒绝文件")
     
-    print(f"📈 采购订单: {success_count}/{count} 创建成功")
-    return success_count
+    return success_count, item_count
 
-def generate_order_items(token, sales_count, purchase_count):
-    """生成订单明细数据"""
-    print("📋 生成订单明细数据...")
+def generate_sales_orders(now, seed, workers, catalog, count=100, sink=None, ledger=None, journal=None):
+    """生成大量销售订单及明细数据"""
+    print(f"💰 生成 {count} 个销售订单...")
     
-    item_ids = list(range(1, 21))  # 1-20
-    sales_success = 0
-    purchase_success = 0
+    # 从6个月前开始
+    success_count, item_count = generate_orders("sales_orders", sales_order_shard, 180,
+                                                now, seed, workers, catalog, count, sink, ledger, journal)
+    print(f"📈 销售订单: {success_count}/{count} 创建成功，明细 {item_count} 条")
+    return success_count
+
+def generate_purchase_orders(now, seed, workers, catalog, count=100, sink=None, ledger=None, journal=None):
+    """生成大量采购订单及明细数据"""
+    print(f"🛒 生成 {count} 个采购订单...")
     
-    # 生成销售订单明细
-    print("生成销售订单明细...")
-    batch_size = 20
-    for batch_start in range(1, sales_count + 1, batch_size):
-        batch_end = min(batch_start + batch_size, sales_count + 1)
-        
-        values_list = []
-        for order_id in range(batch_start, batch_end):
-            # 每个订单随机1-3个商品
-            items_count = random.randint(1, 3)
-            for _ in range(items_count):
-                item_id = random.choice(item_ids)
-                quantity = random.randint(1, 10)
-                unit_price = random.randint(1000, 5000)
-                discount = random.randint(0, 200) if random.random() < 0.3 else 0
-                amount = (unit_price * quantity) - discount
-                
-                values_list.append(f"({order_id}, {item_id}, {quantity}, {unit_price}, {discount}, {amount})")
-        
-        if values_list:
-            sql = f"""INSERT INTO sales_order_items (order_id, item_id, quantity, unit_price, discount, amount) 
-                      VALUES {', '.join(values_list)};"""
-            
-            response = import_data(token, "sales_order_items", sql)
-            if response.status_code == 200:
-                sales_success += len(values_list)
-                print(f"✅ 销售订单明细批次 {batch_start}-{batch_end-1} 成功")
-            
-            time.sleep(0.3)
-    
-    # 生成采购订单明细
-    print("生成采购订单明细...")
-    for batch_start in range(1, purchase_count + 1, batch_size):
-        batch_end = min(batch_start + batch_size, purchase_count + 1)
-        
-        values_list = []
-        for order_id in range(batch_start, batch_end):
-            # 每个采购订单随机1-2个商品
-            items_count = random.randint(1, 2)
-            for _ in range(items_count):
-                item_id = random.choice(item_ids)
-                quantity = random.randint(10, 100)
-                unit_price = random.randint(800, 3000)
-                amount = unit_price * quantity
-                
-                values_list.append(f"({order_id}, {item_id}, {quantity}, {unit_price}, {amount})")
-        
-        if values_list:
-            sql = f"""INSERT INTO purchase_order_items (order_id, item_id, quantity, unit_price, amount) 
-                      VALUES {', '.join(values_list)};"""
-            
-            response = import_data(token, "purchase_order_items", sql)
-            if response.status_code == 200:
-                purchase_success += len(values_list)
-                print(f"✅ 采购订单明细批次 {batch_start}-{batch_end-1} 成功")
-            
-            time.sleep(0.3)
-    
-    print(f"📈 订单明细: 销售 {sales_success} 条, 采购 {purchase_success} 条")
+    # 从200天前开始
+    success_count, item_count = generate_orders("purchase_orders", purchase_order_shard, 200,
+                                                now, seed, workers, catalog, count, sink, ledger, journal)
+    print(f"📈 采购订单: {success_count}/{count} 创建成功，明细 {item_count} 条")
+    return success_count
+
+def derive_inventory(ledger, now, sink=None, journal=None):
+    """由已生成订单的出入库推导补货采购、库存流水和期末库存，写入离线目标或经 API（断点续传日志）发送"""
+    print("📦 由订单推导库存...")
+    if sink is not None:
+        sink.write_shard(ledger.batches(IdRange("purchase_orders", client=sink), now))
+    else:
+        for batch in ledger.batches(IdRange("purchase_orders", journal=journal), now):
+            result = journal.send(batch)
+            if result is not None and not result.ok:
+                print(f"⚠️ {batch.label} 成功 {result.committed}/{len(batch)} 行，{result.rejected} 行写入拒绝文件")
+    print(f"✅ 库存推导完成：补货采购 {ledger.replenishments} 单")
 
 def main():
+    parser = argparse.ArgumentParser(description="生成大量演示数据")
+    parser.add_argument("--resume", action="store_true", help="从上次中断的位置继续，不重复也不遗漏")
+    parser.add_argument("--seed", type=int, help="随机种子：同一种子（和 --as-of）生成逐字节相同的数据，与 --workers 无关")
+    parser.add_argument("--as-of", type=datetime.fromisoformat, help="基准日期（默认今天），订单日期相对它往前推")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="并行生成分片的进程数")
+    parser.add_argument("--sqlite", metavar="PATH",
+                        help="不经过 API，直接写入 wms.db 兼容的 SQLite 文件（不存在时按 init.ts 新建）")
+    parser.add_argument("--dump", metavar="DIR",
+                        help="不经过 API，按表写成 gzip 压缩的 SQL 转储（与 data-export/ 格式相同），"
+                             "之后用 gunzip -c DIR/*.sql.gz | sqlite3 wms.db 装载")
+    parser.add_argument("--inventory", action="store_true",
+                        help="由订单的入库和出库推导库存流水和期末库存（缺货处自动补货），替换原有库存（需要 numpy）")
+    args = parser.parse_args()
+
     print("🚀 生成大量演示数据")
     print("=" * 50)
     
+    if args.sqlite or args.dump:
+        if args.seed is not None:
+            random.seed(args.seed)
+        seed = random.getrandbits(64)
+        now = args.as_of or datetime.now()
+        # 给了种子时，created_at 等时间列的默认值也固定成基准时间，同一种子两次生成的结果相同
+        pinned = now if args.seed is not None else None
+        # 商品目录和订单 id 由离线目标提供
+        with (SqliteSink(args.sqlite, now=pinned) if args.sqlite else DumpSink(args.dump, now=pinned)) as sink:
+            catalog = sink.catalog()
+            ledger = None
+            if args.inventory:
+                # 现有库存作为期初，推导出的期末库存在写入时替换它
+                ledger = InventoryLedger(sink.inventory())
+            generate_sales_orders(now, seed, args.workers, catalog, 100, sink, ledger)
+            generate_purchase_orders(now, seed, args.workers, catalog, 100, sink, ledger)
+            if ledger is not None:
+                derive_inventory(ledger, now, sink)
+            print("\n📊 最终数据统计:")
+            for table, count in sink.get_stats().items():
+                print(f"  {table}: {count} 条记录")
+        return
+    
     # 登录
     token = login()
     if not token:
@@ -215,25 +221,37 @@ def main():
     
     print("✅ 登录成功")
     
+    # 分片主种子由 random 派生，同一个 --seed 得到同样的数据；续跑时日志恢复随机数状态和基准时间
+    journal = SeedJournal.open("generate-massive-demo-data", resume=args.resume, seed=args.seed, now=args.as_of)
+    seed = random.getrandbits(64)
+    now = journal.now
+    
     # 生成大量订单数据
     print("\n开始生成大量订单数据...")
     
+    # 明细按商品目录的售价和进价生成，订单连同明细一次生成
+    catalog = fetch_catalog()
+    
+    ledger = None
+    if args.inventory:
+        # 期初库存记在日志里：续跑时服务器上的库存可能已被期末库存替换，不能重新读取。
+        # 原有库存不在这里删除，由期末库存批次在同一个事务里先删后插
+        ledger = InventoryLedger(journal.remember("inventory_opening", fetch_inventory))
+    
     # 生成100个销售订单
-    sales_count = generate_sales_orders(token, 100)
-    time.sleep(2)
+    sales_count = generate_sales_orders(now, seed, args.workers, catalog, 100, ledger=ledger, journal=journal)
     
     # 生成100个采购订单
-    purchase_count = generate_purchase_orders(token, 100)
-    time.sleep(2)
+    purchase_count = generate_purchase_orders(now, seed, args.workers, catalog, 100, ledger=ledger, journal=journal)
     
-    # 生成订单明细
-    if sales_count > 0 or purchase_count > 0:
-        generate_order_items(token, sales_count, purchase_count)
+    if ledger is not None:
+        derive_inventory(ledger, now, journal=journal)
+    journal.finish()
     
     # 获取最终统计
     print("\n📊 最终数据统计:")
-    response = requests.get(f"{RAILWAY_URL}/data-import/stats", 
-                          headers={"Authorization": f"Bearer {token}"})
+    response = api.get(f"{RAILWAY_URL}/data-import/stats", 
+                     headers={"Authorization": f"Bearer {token}"})
     if response.status_code == 200:
         stats = response.json()
         for table, count in stats.items():
@@ -250,5 +268,8 @@ def main():
     print("\n🎯 完美的Demo系统准备就绪！")
     print("请刷新页面查看您的大量演示数据！")
 
+    print(pacing_report())
+    print(compression_report())
+
 if __name__ == "__main__":
     main()
@@ -1,41 +1,23 @@
 #!/usr/bin/env python3
-import requests
-import time
+import argparse
 import random
 from datetime import datetime, timedelta
 import math
 
-# Railway API配置
-RAILWAY_URL = "https://web-production-7a257.up.railway.app/api"
+from wms_data.client import RAILWAY_URL, api, compression_report, login, pacing_report
+from wms_data.bulk import DEFAULT_ENVELOPE_BYTES
+from wms_data.importer import BulkImporter
+from wms_data.inventory import InventoryLedger, fetch_inventory
+from wms_data.journal import SeedJournal
+from wms_data.orders import IdRange, fetch_catalog, order_batches, pick_lines, purchase_order, sales_order
+from wms_data.dump_sink import DumpSink
+from wms_data.sampling import (ORDER_SIZE, PURCHASE_ITEM_COUNT, PURCHASE_STATUS, PURCHASE_TYPE, SALES_ITEM_COUNT,
+                               SALES_STATUS)
+from wms_data.sqlite_sink import SqliteSink
+from wms_data.vectorized import np, sales_order_arrays
 
-def login():
-    """登录获取token"""
-    response = requests.post(f"{RAILWAY_URL}/auth/login", 
-                           json={"username": "admin", "password": "123456"})
-    if response.status_code == 200:
-        return response.json().get("token")
-    else:
-        print(f"登录失败: {response.text}")
-        return None
-
-def import_data(token, table_name, sql_data):
-    """导入数据到Railway"""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-    
-    data = {
-        "tableName": table_name,
-        "data": sql_data
-    }
-    
-    response = requests.post(f"{RAILWAY_URL}/data-import/import", 
-                           headers=headers, json=data)
-    return response
-
-def generate_realistic_sales_data(token):
-    """生成月销100万的真实销售数据"""
+def generate_realistic_sales_data(now, catalog, ids):
+    """生成月销100万的真实销售数据，订单连同明细逐批产出（返回订单数）"""
     print("🏪 生成月销100万的大型店铺流水数据...")
     
     # 目标：月销售额100万 = 日均约3.33万
@@ -45,7 +27,7 @@ def generate_realistic_sales_data(token):
     days_in_month = 30
     daily_target = target_monthly_revenue / days_in_month  # 约33,333元/天
     
-    base_date = datetime.now() - timedelta(days=30)
+    base_date = now - timedelta(days=30)
     total_revenue = 0
     order_count = 0
     
@@ -67,80 +49,17 @@ def generate_realistic_sales_data(token):
         if is_weekend:
             daily_orders = int(daily_orders * 1.2)  # 周末更多
         
-        daily_revenue = 0
-        batch_values = []
-        
-        # 生成当天的所有订单
-        for order_idx in range(daily_orders):
-            order_count += 1
-            
-            # 订单时间分布（营业时间9:00-21:00）
-            hour = random.randint(9, 20)
-            minute = random.randint(0, 59)
-            order_datetime = current_date.replace(hour=hour, minute=minute)
-            
-            order_no = f"SO-{order_datetime.strftime('%Y%m%d')}-{10000 + order_count}"
-            customer_id = random.randint(1, 6)
-            warehouse_id = random.randint(1, 2)
-            
-            # 订单金额分布（符合实际情况）
-            order_type = random.choices(
-                ['small', 'medium', 'large', 'bulk'], 
-                weights=[40, 35, 20, 5]  # 小单多，大单少
-            )[0]
-            
-            if order_type == 'small':
-                base_amount = random.randint(200, 800)
-            elif order_type == 'medium':
-                base_amount = random.randint(800, 2000)
-            elif order_type == 'large':
-                base_amount = random.randint(2000, 5000)
-            else:  # bulk
-                base_amount = random.randint(5000, 15000)
-            
-            # 应用日常波动
-            amount_variation = random.uniform(0.8, 1.2)
-            total_amount = int(base_amount * amount_variation * daily_multiplier)
-            
-            # 税费和折扣
-            tax_amount = round(total_amount * 0.15, 2)
-            discount_amount = 0
-            if random.random() < 0.25:  # 25%概率有折扣
-                discount_amount = random.randint(10, min(200, total_amount // 10))
-            
-            final_amount = total_amount + tax_amount - discount_amount
-            daily_revenue += final_amount
-            
-            # 订单状态（大部分完成）
-            status = random.choices(
-                ['completed', 'pending', 'cancelled'],
-                weights=[92, 6, 2]  # 92%完成，6%待处理，2%取消
-            )[0]
-            
-            # 只计算已完成订单的收入
-            if status == 'completed':
-                total_revenue += final_amount
-            
-            batch_values.append(f"('{order_no}', {customer_id}, {warehouse_id}, '{order_datetime.strftime('%Y-%m-%d %H:%M:%S')}', {total_amount}, {tax_amount}, {discount_amount}, '{status}', 1, datetime('now'), datetime('now'))")
+        # 当天订单逐单生成、逐批产出，不先攒成列表；金额在订单流过时累计
+        daily = {"revenue": 0, "completed": 0}
+        orders = tally_orders(realistic_day_orders(current_date, daily_orders, daily_multiplier, order_count,
+                                                   catalog, ids), daily)
         
-        # 批量插入当天订单
-        if batch_values:
-            # 分批插入，每批20个
-            for i in range(0, len(batch_values), 20):
-                batch = batch_values[i:i+20]
-                sql = f"""INSERT INTO sales_orders (order_no, customer_id, warehouse_id, order_date, 
-                         total_amount, tax_amount, discount_amount, status, created_by, created_at, updated_at) 
-                         VALUES {', '.join(batch)};"""
-                
-                response = import_data(token, "sales_orders", sql)
-                if response.status_code == 200:
-                    print(f"✅ {current_date.strftime('%m-%d')} 订单批次 {i//20 + 1} 成功")
-                else:
-                    print(f"❌ {current_date.strftime('%m-%d')} 订单批次 {i//20 + 1} 失败")
-                
-                time.sleep(0.3)
+        # 批量插入当天订单和明细，每批20个订单
+        yield from order_batches("sales_orders", orders, 20, label=f"{current_date.strftime('%m-%d')} 订单")
+        order_count += daily_orders
+        total_revenue += daily["completed"]
         
-        print(f"📅 {current_date.strftime('%Y-%m-%d')}: {daily_orders}单, ¥{daily_revenue:,.0f}")
+        print(f"📅 {current_date.strftime('%Y-%m-%d')}: {daily_orders}单, ¥{daily['revenue']:,.0f}")
     
     print(f"\n📊 生成数据统计：")
     print(f"   总订单数：{order_count}")
@@ -149,18 +68,114 @@ def generate_realistic_sales_data(token):
     
     return order_count
 
-def generate_purchase_orders_for_inventory(token):
-    """生成支撑销售的采购订单"""
+def realistic_day_orders(current_date, daily_orders, daily_multiplier, first_count, catalog, ids):
+    """逐单产出某一天的销售订单 (表头, 明细)，first_count 是当天之前已生成的订单数"""
+    for order_idx in range(daily_orders):
+        # 订单时间分布（营业时间9:00-21:00）
+        hour = random.randint(9, 20)
+        minute = random.randint(0, 59)
+        order_datetime = current_date.replace(hour=hour, minute=minute)
+        
+        order_no = f"SO-{order_datetime.strftime('%Y%m%d')}-{10001 + first_count + order_idx}"
+        customer_id = random.randint(1, 6)
+        warehouse_id = random.randint(1, 2)
+        
+        # 订单金额分布（符合实际情况）
+        order_type = ORDER_SIZE.draw(random)  # 小单多，大单少
+        
+        if order_type == 'small':
+            base_amount = random.randint(200, 800)
+        elif order_type == 'medium':
+            base_amount = random.randint(800, 2000)
+        elif order_type == 'large':
+            base_amount = random.randint(2000, 5000)
+        else:  # bulk
+            base_amount = random.randint(5000, 15000)
+        
+        # 应用日常波动，得到挑选明细的金额预算
+        amount_variation = random.uniform(0.8, 1.2)
+        budget = int(base_amount * amount_variation * daily_multiplier)
+        
+        # 折扣
+        discount_amount = 0
+        if random.random() < 0.25:  # 25%概率有折扣
+            discount_amount = random.randint(10, min(200, budget // 10))
+        
+        # 订单状态（大部分完成）
+        status = SALES_STATUS.draw(random)  # 92%完成，6%待处理，2%取消
+        
+        yield priced_sales_order(
+            ids, catalog, budget, order_no, customer_id, warehouse_id,
+            order_datetime.strftime('%Y-%m-%d %H:%M:%S'), status, discount_amount)
+
+def tally_orders(orders, totals):
+    """原样转发 (表头, 明细)，同时把实收累计到 totals["revenue"]、已完成订单的实收累计到 totals["completed"]"""
+    for header, items in orders:
+        totals["revenue"] += header[7]
+        if header[13] == 'completed':
+            totals["completed"] += header[7]
+        yield header, items
+
+def generate_realistic_sales_data_vectorized(now, catalog, ids):
+    """generate_realistic_sales_data 的 NumPy 版本：整月订单表头一次生成，分布相同，再逐单挑选明细（返回订单数）"""
+    print("🏪 生成月销100万的大型店铺流水数据（向量化）...")
+    
+    target_monthly_revenue = 1000000  # 100万
+    print(f"📊 目标数据：")
+    print(f"   月销售额：¥{target_monthly_revenue:,}")
+    print(f"   日均销售：¥{target_monthly_revenue / 30:,.0f}")
+    print(f"   预计订单：约1,800个")
+    
+    # 由 random 派生 NumPy 的种子，断点续跑恢复 random 状态后生成结果不变
+    rng = np.random.default_rng(random.getrandbits(64))
+    drafts = sales_order_arrays(rng, now - timedelta(days=30), 30)
+    starts, ends = drafts.day_bounds()
+    total_revenue = 0
+    
+    for day, current_date in enumerate(drafts.day_dates):
+        # 向量化生成的订单金额作为挑选明细的预算，税额不入库（sales_orders 没有税额列）
+        daily = {"revenue": 0, "completed": 0}
+        orders = tally_orders((
+            priced_sales_order(ids, catalog, budget, order_no, customer_id, warehouse_id,
+                               order_date, status, discount_amount)
+            for order_no, customer_id, warehouse_id, order_date, budget, _, discount_amount, status, _
+            in drafts.rows(starts[day], ends[day])
+        ), daily)
+        
+        # 批量插入当天订单和明细，每批20个订单
+        yield from order_batches("sales_orders", orders, 20, label=f"{current_date.strftime('%m-%d')} 订单")
+        total_revenue += daily["completed"]
+        
+        print(f"📅 {current_date.strftime('%Y-%m-%d')}: {ends[day] - starts[day]}单, ¥{daily['revenue']:,.0f}")
+    
+    print(f"\n📊 生成数据统计：")
+    print(f"   总订单数：{len(drafts)}")
+    print(f"   总收入：¥{total_revenue:,.0f}")
+    print(f"   目标达成：{total_revenue/target_monthly_revenue*100:.1f}%")
+    
+    return len(drafts)
+
+def priced_sales_order(ids, catalog, budget, order_no, customer_id, warehouse_id, order_date, status,
+                       discount_amount):
+    """按金额预算挑选 1-4 种商品，表头金额、成本和毛利由明细汇总"""
+    items_count = SALES_ITEM_COUNT.draw(random)
+    lines = pick_lines(random, catalog, budget, items_count)
+    payment_status = 'paid' if status == 'completed' else 'unpaid'
+    return sales_order(next(ids), lines, order_no, customer_id, warehouse_id, order_date, status,
+                       discount_amount, payment_status)
+
+def generate_purchase_orders_for_inventory(now, catalog, ids):
+    """生成支撑销售的采购订单，订单连同明细逐批产出（返回订单数）"""
     print("🏭 生成支撑销售的采购订单...")
     
     # 大型店铺需要大量采购来支撑销售
     # 假设采购成本是销售额的60%，即60万的采购
     purchase_target = 600000
     
-    base_date = datetime.now() - timedelta(days=45)  # 采购提前于销售
+    base_date = now - timedelta(days=45)  # 采购提前于销售
     
     # 生成50个大额采购订单
-    batch_values = []
+    orders = []
     total_purchase = 0
     
     for i in range(50):
@@ -170,10 +185,7 @@ def generate_purchase_orders_for_inventory(token):
         warehouse_id = random.randint(1, 2)
         
         # 采购订单金额分布
-        purchase_type = random.choices(
-            ['regular', 'large', 'bulk'],
-            weights=[60, 30, 10]
-        )[0]
+        purchase_type = PURCHASE_TYPE.draw(random)
         
         if purchase_type == 'regular':
             amount = random.randint(8000, 15000)
@@ -182,115 +194,80 @@ def generate_purchase_orders_for_inventory(token):
         else:  # bulk
             amount = random.randint(30000, 60000)
         
-        tax_amount = round(amount * 0.15, 2)
-        status = random.choices(['completed', 'pending'], weights=[85, 15])[0]
+        status = PURCHASE_STATUS.draw(random)
+        
+        # 按预算挑选1-3种商品，采购量大，金额由明细汇总
+        items_count = PURCHASE_ITEM_COUNT.draw(random)
+        lines = pick_lines(random, catalog, amount, items_count, price="purchase_price")
+        header, items = purchase_order(next(ids), lines, order_no, supplier_id, warehouse_id,
+                                       order_date.strftime('%Y-%m-%d'), status)
         
         if status == 'completed':
-            total_purchase += amount + tax_amount
+            total_purchase += header[5]
         
-        batch_values.append(f"('{order_no}', {supplier_id}, {warehouse_id}, '{order_date.strftime('%Y-%m-%d')}', {amount}, {tax_amount}, '{status}', 1, datetime('now'), datetime('now'))")
+        orders.append((header, items))
     
-    # 批量插入采购订单
-    for i in range(0, len(batch_values), 15):
-        batch = batch_values[i:i+15]
-        sql = f"""INSERT INTO purchase_orders (order_no, supplier_id, warehouse_id, order_date, 
-                 total_amount, tax_amount, status, created_by, created_at, updated_at) 
-                 VALUES {', '.join(batch)};"""
-        
-        response = import_data(token, "purchase_orders", sql)
-        if response.status_code == 200:
-            print(f"✅ 采购订单批次 {i//15 + 1} 成功")
-        else:
-            print(f"❌ 采购订单批次 {i//15 + 1} 失败")
-        
-        time.sleep(0.5)
+    # 批量插入采购订单和明细
+    yield from order_batches("purchase_orders", orders, 15, label="采购订单")
     
     print(f"📊 采购数据：50个订单，总额 ¥{total_purchase:,.0f}")
     return 50
 
-def generate_order_items(token, sales_count, purchase_count):
-    """生成订单明细 - 更真实的商品组合"""
-    print("📋 生成真实的订单明细数据...")
-    
-    # 商品价格区间（基于实际商品）
-    item_prices = {
-        1: 2899,   # 格力空调
-        2: 3599,   # 海信电视
-        3: 2399,   # 小天鹅洗衣机
-        4: 3199,   # 美的冰箱
-        # 其他商品价格区间
-        5: random.randint(500, 1000),
-        6: random.randint(800, 1500),
-        7: random.randint(300, 800),
-        8: random.randint(1200, 2000),
-    }
-    
-    # 生成销售订单明细
-    print("生成销售订单明细...")
-    for batch_start in range(1, sales_count + 1, 30):
-        batch_end = min(batch_start + 30, sales_count + 1)
-        
-        values_list = []
-        for order_id in range(batch_start, batch_end):
-            # 根据订单金额决定商品数量
-            items_count = random.choices([1, 2, 3, 4], weights=[50, 30, 15, 5])[0]
-            
-            for _ in range(items_count):
-                item_id = random.randint(1, 20)
-                quantity = random.choices([1, 2, 3, 4, 5], weights=[60, 25, 10, 3, 2])[0]
-                
-                # 使用真实价格或随机价格
-                if item_id in item_prices:
-                    unit_price = item_prices[item_id]
-                else:
-                    unit_price = random.randint(200, 5000)
-                
-                discount = random.randint(0, min(100, unit_price // 20)) if random.random() < 0.2 else 0
-                amount = (unit_price * quantity) - discount
-                
-                values_list.append(f"({order_id}, {item_id}, {quantity}, {unit_price}, {discount}, {amount})")
-        
-        if values_list:
-            sql = f"""INSERT INTO sales_order_items (order_id, item_id, quantity, unit_price, discount, amount) 
-                      VALUES {', '.join(values_list)};"""
-            
-            response = import_data(token, "sales_order_items", sql)
-            if response.status_code == 200:
-                print(f"✅ 销售明细批次 {batch_start}-{batch_end-1} 成功")
-            
-            time.sleep(0.3)
+def seed_batches(now, catalog, sales_ids, purchase_ids, vectorized=False, ledger=None):
+    """按外键顺序串联各生成阶段：每批订单后紧跟它的明细，先销售后采购
+
+    传入 InventoryLedger 时，最后由订单的出入库推导补货采购、库存流水和期末库存。
+    """
+    def orders():
+        if vectorized:
+            yield from generate_realistic_sales_data_vectorized(now, catalog, sales_ids)
+        else:
+            yield from generate_realistic_sales_data(now, catalog, sales_ids)
+        yield from generate_purchase_orders_for_inventory(now, catalog, purchase_ids)
     
-    # 生成采购订单明细
-    print("生成采购订单明细...")
-    for batch_start in range(1, purchase_count + 1, 20):
-        batch_end = min(batch_start + 20, purchase_count + 1)
-        
-        values_list = []
-        for order_id in range(batch_start, batch_end):
-            items_count = random.choices([1, 2, 3], weights=[40, 40, 20])[0]
-            
-            for _ in range(items_count):
-                item_id = random.randint(1, 20)
-                quantity = random.randint(20, 200)  # 采购量大
-                unit_price = random.randint(500, 2500)  # 采购价格
-                amount = unit_price * quantity
-                
-                values_list.append(f"({order_id}, {item_id}, {quantity}, {unit_price}, {amount})")
-        
-        if values_list:
-            sql = f"""INSERT INTO purchase_order_items (order_id, item_id, quantity, unit_price, amount) 
-                      VALUES {', '.join(values_list)};"""
-            
-            response = import_data(token, "purchase_order_items", sql)
-            if response.status_code == 200:
-                print(f"✅ 采购明细批次 {batch_start}-{batch_end-1} 成功")
-            
-            time.sleep(0.3)
+    if ledger is None:
+        yield from orders()
+        return
+    yield from ledger.track(orders())
+    yield from ledger.batches(purchase_ids, now)
+    print(f"📦 库存由订单推导：补货采购 {ledger.replenishments} 单")
 
 def main():
+    parser = argparse.ArgumentParser(description="生成月销100万大型店铺的流水数据")
+    parser.add_argument("--concurrency", type=int, default=4, help="同时在途的导入请求数上限（实际并发由自适应限速调整）")
+    parser.add_argument("--resume", action="store_true", help="从上次中断的位置继续，不重复也不遗漏")
+    parser.add_argument("--envelope-bytes", type=int, default=DEFAULT_ENVELOPE_BYTES,
+                        help="打包成批量导入信封的大小上限（字节），一个信封一次事务；0 表示逐批走 /import")
+    parser.add_argument("--columnar", action="store_true", help="信封用列式 MessagePack 编码，体积更小")
+    parser.add_argument("--vectorized", action="store_true", help="用 NumPy 整月向量化生成销售订单（需要 numpy）")
+    parser.add_argument("--sqlite", metavar="PATH",
+                        help="不经过 API，直接写入 wms.db 兼容的 SQLite 文件（不存在时按 init.ts 新建）")
+    parser.add_argument("--dump", metavar="DIR",
+                        help="不经过 API，按表写成 gzip 压缩的 SQL 转储（与 data-export/ 格式相同），"
+                             "之后用 gunzip -c DIR/*.sql.gz | sqlite3 wms.db 装载")
+    parser.add_argument("--inventory", action="store_true",
+                        help="由订单的入库和出库推导库存流水和期末库存（缺货处自动补货），替换原有库存（需要 numpy）")
+    args = parser.parse_args()
+
     print("🏪 生成月销100万大型店铺的真实流水数据")
     print("=" * 60)
     
+    if args.sqlite or args.dump:
+        # 商品目录和订单 id 由离线目标提供（SQLite 文件本身，或转储对应的新库）
+        with (SqliteSink(args.sqlite) if args.sqlite else DumpSink(args.dump)) as sink:
+            ledger = None
+            if args.inventory:
+                # 现有库存作为期初，推导出的期末库存在写入时替换它
+                ledger = InventoryLedger(sink.inventory())
+            sink.import_all(seed_batches(datetime.now(), sink.catalog(),
+                                         IdRange("sales_orders", client=sink),
+                                         IdRange("purchase_orders", client=sink),
+                                         vectorized=args.vectorized, ledger=ledger))
+            print("\n📊 最终数据统计:")
+            for table, count in sink.get_stats().items():
+                print(f"  {table}: {count:,} 条记录")
+        return
+    
     # 登录
     token = login()
     if not token:
@@ -302,21 +279,30 @@ def main():
     # 生成数据
     print("\n🚀 开始生成大型店铺流水数据...")
     
-    # 生成销售数据（月销100万）
-    sales_count = generate_realistic_sales_data(token)
-    time.sleep(3)
-    
-    # 生成采购数据（支撑销售）
-    purchase_count = generate_purchase_orders_for_inventory(token)
-    time.sleep(3)
+    # 明细按商品目录的售价和进价生成，订单 id 向服务器按块预留，明细直接引用
+    catalog = fetch_catalog()
+    print(f"📋 商品目录：{len(catalog)} 个有价格的商品")
     
-    # 生成订单明细
-    generate_order_items(token, sales_count, purchase_count)
+    # 销售数据（月销100万）、支撑销售的采购数据和订单明细经同一个并发导入器发送，
+    # 明细批次会等待对应的订单批次提交后再发送；批次打包成信封，每个信封在服务器上只提交一次事务
+    journal = SeedJournal.open("generate-million-revenue-data", resume=args.resume)
+    ledger = None
+    if args.inventory:
+        # 期初库存记在日志里：续跑时服务器上的库存可能已被期末库存替换，不能重新读取。
+        # 原有库存不在这里删除，由期末库存批次在同一个事务里先删后插
+        ledger = InventoryLedger(journal.remember("inventory_opening", fetch_inventory))
+    importer = BulkImporter(concurrency=args.concurrency, journal=journal,
+                            envelope_bytes=args.envelope_bytes or None, columnar=args.columnar)
+    importer.import_all(seed_batches(journal.now, catalog,
+                                     IdRange("sales_orders", journal=journal),
+                                     IdRange("purchase_orders", journal=journal),
+                                     vectorized=args.vectorized, ledger=ledger))
+    journal.finish()
     
     # 获取最终统计
     print("\n📊 最终数据统计:")
-    response = requests.get(f"{RAILWAY_URL}/data-import/stats", 
-                          headers={"Authorization": f"Bearer {token}"})
+    response = api.get(f"{RAILWAY_URL}/data-import/stats", 
+                     headers={"Authorization": f"Bearer {token}"})
     if response.status_code == 200:
         stats = response.json()
         for table, count in stats.items():
@@ -341,5 +327,8 @@ def main():
     print("• 符合行业特征的流水")
     print("\n🚀 完美的大型店铺Demo准备就绪！")
 
+    print(pacing_report())
+    print(compression_report())
+
 if __name__ == "__main__":
     main()
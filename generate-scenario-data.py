@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+import argparse
+import random
+import time
+from datetime import datetime
+
+from wms_data.client import RAILWAY_URL, api, compression_report, login, pacing_report
+from wms_data.bulk import DEFAULT_ENVELOPE_BYTES
+from wms_data.importer import BulkImporter, InsertBatch
+from wms_data.journal import SeedJournal
+from wms_data.scenario import SCENARIO_COLUMNS, load_scenario
+from wms_data.dump_sink import DumpSink
+from wms_data.sqlite_sink import SqliteSink
+
+def scenario_batches(scenario, seed, now, batch_size, summary):
+    """按周期单位向量化生成场景订单，逐批产出（summary 收集每个单位的统计）"""
+    print(f"🎬 场景 {scenario.name}：{scenario.description}")
+    print(f"   {scenario.units} 个周期单位 × {scenario.unit_days} 天，"
+          f"从 {scenario.start_date(now).strftime('%Y-%m-%d')} 开始")
+
+    for orders in scenario.units_orders(seed, now):
+        unit = orders.unit
+        for i in range(0, len(orders), batch_size):
+            yield InsertBatch(
+                "sales_orders",
+                ", ".join(SCENARIO_COLUMNS),
+                orders.rows(i, i + batch_size),
+                label=f"{scenario.name} 第{unit + 1}段 批次 {i // batch_size + 1}",
+            )
+
+        revenue = orders.daily_revenue(completed_only=True).sum()
+        summary.append((unit, len(orders), revenue))
+        target = scenario.revenue_targets[unit] if scenario.revenue_targets is not None else None
+        line = (f"📅 第{unit + 1}段 {orders.day_dates[0].strftime('%Y-%m-%d')} 起："
+                f"{len(orders):,}单，¥{revenue:,.0f}")
+        if target:
+            line += f"（目标 ¥{target:,.0f}，达成 {revenue / target:.1%}）"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="按场景文件生成销售订单（见 scenarios/ 目录）")
+    parser.add_argument("scenario", help="场景文件路径，如 scenarios/investor-growth.json")
+    parser.add_argument("--seed", type=int, help="随机种子：同一种子（和 --as-of）生成逐字节相同的数据")
+    parser.add_argument("--as-of", type=datetime.fromisoformat, help="基准日期（默认今天），周期相对它往前推")
+    parser.add_argument("--batch-size", type=int, default=500, help="每个导入批次的订单数")
+    parser.add_argument("--concurrency", type=int, default=4, help="同时在途的导入请求数上限（实际并发由自适应限速调整）")
+    parser.add_argument("--resume", action="store_true", help="从上次中断的位置继续，不重复也不遗漏")
+    parser.add_argument("--envelope-bytes", type=int, default=DEFAULT_ENVELOPE_BYTES,
+                        help="打包成批量导入信封的大小上限（字节），一个信封一次事务；0 表示逐批走 /import")
+    parser.add_argument("--columnar", action="store_true", help="信封用列式 MessagePack 编码，体积更小")
+    parser.add_argument("--dry-run", action="store_true", help="只生成并打印每个周期单位的统计，不导入")
+    parser.add_argument("--sqlite", metavar="PATH",
+                        help="不经过 API，直接写入 wms.db 兼容的 SQLite 文件（不存在时按 init.ts 新建）")
+    parser.add_argument("--dump", metavar="DIR",
+                        help="不经过 API，按表写成 gzip 压缩的 SQL 转储（与 data-export/ 格式相同），"
+                             "之后用 gunzip -c DIR/*.sql.gz | sqlite3 wms.db 装载")
+    args = parser.parse_args()
+
+    scenario = load_scenario(args.scenario)
+    summary = []
+
+    if args.sqlite or args.dump:
+        random.seed(args.seed)
+        now = args.as_of or datetime.now()
+        # 给了种子时，created_at 等时间列的默认值也固定成基准时间，同一种子两次生成的结果相同
+        pinned = now if args.seed is not None else None
+        with (SqliteSink(args.sqlite, now=pinned) if args.sqlite else DumpSink(args.dump, now=pinned)) as sink:
+            sink.import_all(scenario_batches(scenario, random.getrandbits(64), now, args.batch_size, summary))
+            print("\n📊 最终数据统计:")
+            for table, count in sink.get_stats().items():
+                print(f"  {table}: {count:,} 条记录")
+        print(f"\n🎉 场景 {scenario.name} 已写入 {args.sqlite or args.dump}："
+              f"{sum(count for _, count, _ in summary):,} 单，¥{sum(r for _, _, r in summary):,.0f}")
+        return
+
+    if args.dry_run:
+        random.seed(args.seed)
+        start = time.perf_counter()
+        for batch in scenario_batches(scenario, random.getrandbits(64), args.as_of or datetime.now(),
+                                      args.batch_size, summary):
+            pass
+        orders = sum(count for _, count, _ in summary)
+        print(f"\n🧪 试运行：{orders:,} 单，¥{sum(r for _, _, r in summary):,.0f}，"
+              f"生成耗时 {time.perf_counter() - start:.2f} s")
+        return
+
+    print(f"🎬 按场景 {scenario.name} 生成数据")
+    print("=" * 60)
+
+    # 登录
+    token = login()
+    if not token:
+        print("❌ 登录失败，退出")
+        return
+
+    print("✅ 登录成功")
+
+    journal = SeedJournal.open(f"scenario-{scenario.name}", resume=args.resume, seed=args.seed, now=args.as_of)
+    # 场景主种子由 random 派生，续跑恢复随机数状态后各周期单位生成的数据不变
+    seed = random.getrandbits(64)
+    importer = BulkImporter(concurrency=args.concurrency, journal=journal,
+                            envelope_bytes=args.envelope_bytes or None, columnar=args.columnar)
+    importer.import_all(scenario_batches(scenario, seed, journal.now, args.batch_size, summary))
+    journal.finish()
+
+    # 获取最终统计
+    print("\n📊 最终数据统计:")
+    response = api.get(f"{RAILWAY_URL}/data-import/stats",
+                     headers={"Authorization": f"Bearer {token}"})
+    if response.status_code == 200:
+        stats = response.json()
+        for table, count in stats.items():
+            print(f"  {table}: {count:,} 条记录")
+
+    print(f"\n🎉 场景 {scenario.name} 生成完成："
+          f"{sum(count for _, count, _ in summary):,} 单，¥{sum(r for _, _, r in summary):,.0f}")
+
+    print(pacing_report())
+    print(compression_report())
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,8 @@
 #!/usr/bin/env python3
-import requests
-import time
 import random
 from datetime import datetime, timedelta
 
-# Railway API配置
-RAILWAY_URL = "https://web-production-7a257.up.railway.app/api"
-
-def login():
-    """登录获取token"""
-    response = requests.post(f"{RAILWAY_URL}/auth/login", 
-                           json={"username": "admin", "password": "123456"})
-    if response.status_code == 200:
-        return response.json().get("token")
-    else:
-        print(f"登录失败: {response.text}")
-        return None
-
-def import_data(token, table_name, sql_data):
-    """导入数据到Railway"""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-    
-    data = {
-        "tableName": table_name,
-        "data": sql_data
-    }
-    
-    response = requests.post(f"{RAILWAY_URL}/data-import/import", 
-                           headers=headers, json=data)
-    return response
+from wms_data.client import RAILWAY_URL, api, compression_report, import_data, login, pacing_report
 
 def create_orders_immediately(token):
     """立即创建订单数据 - 使用正确的字段"""
@@ -75,8 +46,6 @@ def create_orders_immediately(token):
             if i <= 3:
                 print(f"SQL: {sql[:100]}...")
         
-        time.sleep(0.1)
-    
     # 创建采购订单
     print("🏭 创建采购订单（使用正确字段）...")
     
@@ -106,8 +75,6 @@ def create_orders_immediately(token):
             if i <= 3:
                 print(f"SQL: {sql[:100]}...")
         
-        time.sleep(0.1)
-    
     print(f"\n📊 创建结果：")
     print(f"  销售订单：{sales_success}/100")
     print(f"  采购订单：{purchase_success}/50")
@@ -140,8 +107,6 @@ def create_order_items(token, sales_count, purchase_count):
                 if response.status_code != 200 and order_id <= 3:
                     print(f"❌ 销售明细失败: {response.text}")
                 
-                time.sleep(0.05)
-    
     # 采购订单明细
     if purchase_count > 0:
         print(f"创建 {purchase_count} 个采购订单的明细...")
@@ -161,8 +126,6 @@ def create_order_items(token, sales_count, purchase_count):
                 response = import_data(token, "purchase_order_items", sql)
                 if response.status_code != 200 and order_id <= 3:
                     print(f"❌ 采购明细失败: {response.text}")
-                
-                time.sleep(0.05)
 
 def main():
     print("🔧 立即修复并创建月销100万店铺数据")
@@ -185,8 +148,8 @@ def main():
     
     # 获取最终统计
     print("\n📊 最终数据统计:")
-    response = requests.get(f"{RAILWAY_URL}/data-import/stats", 
-                          headers={"Authorization": f"Bearer {token}"})
+    response = api.get(f"{RAILWAY_URL}/data-import/stats", 
+                     headers={"Authorization": f"Bearer {token}"})
     if response.status_code == 200:
         stats = response.json()
         for table, count in stats.items():
@@ -199,5 +162,8 @@ def main():
     else:
         print("❌ 订单创建仍然失败，需要进一步调试")
 
+    print(pacing_report())
+    print(compression_report())
+
 if __name__ == "__main__":
     main()
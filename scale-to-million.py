@@ -1,141 +1,224 @@
 #!/usr/bin/env python3
-import requests
-import time
+import argparse
 import random
 from datetime import datetime, timedelta
+from itertools import islice
 
-# Railway API配置
-RAILWAY_URL = "https://web-production-7a257.up.railway.app/api"
+from wms_data.client import RAILWAY_URL, api, compression_report, login, pacing_report
+from wms_data.importer import InsertBatch
+from wms_data.journal import SeedJournal
+from wms_data.sampling import DEMO_SALES_STATUS, PURCHASE_STATUS
+from wms_data.shards import DEFAULT_WORKERS, run_shards, shard_random, split_count, split_shard
+from wms_data.dump_sink import DumpSink
+from wms_data.sqlite_sink import SqliteSink
+from wms_data.stream import RowStream
 
-def login():
-    """登录获取token"""
-    response = requests.post(f"{RAILWAY_URL}/auth/login", 
-                           json={"username": "admin", "password": "123456"})
-    if response.status_code == 200:
-        return response.json().get("token")
-    else:
-        print(f"登录失败: {response.text}")
-        return None
+SALES_COLUMNS = [
+    "order_no", "customer_id", "warehouse_id", "order_date", "total_amount", "discount_amount",
+    "final_amount", "paid_amount", "total_cost", "gross_profit", "profit_margin",
+    "payment_status", "status", "remarks",
+]
+PURCHASE_COLUMNS = [
+    "order_no", "supplier_id", "warehouse_id", "order_date", "total_amount", "status", "remarks",
+]
+SALES_BATCH_SIZE = 50
+PURCHASE_BATCH_SIZE = 20
+
+SALES_DAYS = 31     # 销售订单分布在过去 0-30 天，每天一个分片
+PURCHASE_DAYS = 61  # 采购订单分布在过去 0-60 天
+
+def sales_order_shard(rng, now, days_ago, count, first_index):
+    """生成 days_ago 天前的 count 个销售订单，first_index 是第一个订单在全部订单中的序号"""
+    order_date = (now - timedelta(days=days_ago)).strftime('%Y-%m-%d')
+    rows = []
+    for i in range(first_index, first_index + count):
+        order_index = 101 + i
+        order_no = f"SO-20250917-{10000 + order_index}"
+        customer_id = rng.randint(1, 6)
+        warehouse_id = rng.randint(1, 2)
+        
+        # 更真实的订单金额分布（目标日均3.3万）
+        order_type = rng.random()
+        if order_type < 0.5:  # 50% 小订单
+            total_amount = rng.randint(300, 1200)
+        elif order_type < 0.8:  # 30% 中订单
+            total_amount = rng.randint(1200, 3000)
+        elif order_type < 0.95:  # 15% 大订单
+            total_amount = rng.randint(3000, 8000)
+        else:  # 5% 特大订单
+            total_amount = rng.randint(8000, 20000)
+        
+        discount_amount = rng.randint(0, min(500, total_amount // 20)) if rng.random() < 0.25 else 0
+        final_amount = total_amount - discount_amount
+        total_cost = round(total_amount * 0.6)
+        gross_profit = final_amount - total_cost
+        profit_margin = round((gross_profit / final_amount) * 100) if final_amount > 0 else 0
+        
+        status = DEMO_SALES_STATUS.draw(rng)
+        
+        rows.append((order_no, customer_id, warehouse_id, order_date, total_amount, discount_amount,
+                     final_amount, final_amount, total_cost, gross_profit, profit_margin,
+                     'paid', status, f'Demo数据-批次{i // SALES_BATCH_SIZE + 1}'))
+    return rows
+
+def purchase_order_shard(rng, now, days_ago, count, first_index):
+    """生成 days_ago 天前的 count 个采购订单"""
+    order_date = (now - timedelta(days=days_ago)).strftime('%Y-%m-%d')
+    rows = []
+    for i in range(first_index, first_index + count):
+        order_index = 51 + i
+        order_no = f"PO-20250917-{30000 + order_index}"
+        supplier_id = rng.randint(1, 4)
+        warehouse_id = rng.randint(1, 2)
+        
+        # 采购金额（支撑销售）
+        total_amount = rng.randint(15000, 100000)
+        status = PURCHASE_STATUS.draw(rng)
+        
+        rows.append((order_no, supplier_id, warehouse_id, order_date, total_amount, status,
+                     f'Demo采购-批次{i // PURCHASE_BATCH_SIZE + 1}'))
+    return rows
+
+def daily_shards(table, seed, now, count, days):
+    """把 count 个订单随机分到过去 days 天，从最早的一天起每天一个分片（订单多时再按 MAX_SHARD_ORDERS 切开）"""
+    counts = split_count(shard_random(seed, table), count, [1] * days)
+    shards = []
+    first_index = 0
+    for days_ago in reversed(range(days)):
+        for key, part_count, offset in split_shard((table, days_ago), counts[days_ago]):
+            shards.append((key, (now, days_ago, part_count, first_index + offset)))
+        first_index += counts[days_ago]
+    return shards
 
-def import_data(token, table_name, sql_data):
-    """导入数据到Railway"""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-    
-    data = {
-        "tableName": table_name,
-        "data": sql_data
-    }
-    
-    response = requests.post(f"{RAILWAY_URL}/data-import/import", 
-                           headers=headers, json=data)
-    return response
+def sales_order_rows(now, count, totals, seed, workers):
+    """按天分片并行生成、逐行产出销售订单，已完成订单的收入累加到 totals["revenue"]"""
+    shards = daily_shards("sales_orders", seed, now, count, SALES_DAYS)
+    for rows in run_shards(sales_order_shard, shards, seed, workers):
+        for row in rows:
+            if row[12] == 'completed':
+                totals["revenue"] += row[6]
+            yield row
 
-def scale_up_orders(token):
-    """扩展到月销100万规模"""
+def purchase_order_rows(now, count, seed, workers):
+    """按天分片并行生成、逐行产出采购订单"""
+    shards = daily_shards("purchase_orders", seed, now, count, PURCHASE_DAYS)
+    for rows in run_shards(purchase_order_shard, shards, seed, workers):
+        yield from rows
+
+def scale_up_orders(journal, orders, purchases, seed, workers):
+    """扩展到月销100万规模（批次经断点续传日志发送）"""
     print("🏪 扩展到月销100万规模...")
     
     # 目标：总共需要约1500个订单来达到100万销售额
-    # 已有100个，还需要1400个
+    # 已有100个，默认再加1000个（20批，每批50个）
     
-    total_revenue = 0
-    batch_size = 50
+    totals = {"revenue": 0}
+    rows = sales_order_rows(journal.now, orders, totals, seed, workers)
+    batches = -(-orders // SALES_BATCH_SIZE)
     
-    for batch in range(20):  # 20批，每批50个 = 1000个额外订单
-        print(f"📊 创建订单批次 {batch + 1}/20...")
-        
-        values_list = []
-        batch_revenue = 0
+    for batch in range(batches):
+        print(f"📊 创建订单批次 {batch + 1}/{batches}...")
+        revenue_before = totals["revenue"]
+        values_list = list(islice(rows, SALES_BATCH_SIZE))
+        batch_revenue = totals["revenue"] - revenue_before
         
-        for i in range(batch_size):
-            order_index = 101 + batch * batch_size + i
-            order_no = f"SO-20250917-{10000 + order_index}"
-            customer_id = random.randint(1, 6)
-            warehouse_id = random.randint(1, 2)
-            
-            # 订单日期分布在过去30天
-            days_ago = random.randint(0, 30)
-            order_date = (datetime.now() - timedelta(days=days_ago)).strftime('%Y-%m-%d')
-            
-            # 更真实的订单金额分布（目标日均3.3万）
-            order_type = random.random()
-            if order_type < 0.5:  # 50% 小订单
-                total_amount = random.randint(300, 1200)
-            elif order_type < 0.8:  # 30% 中订单
-                total_amount = random.randint(1200, 3000)
-            elif order_type < 0.95:  # 15% 大订单
-                total_amount = random.randint(3000, 8000)
-            else:  # 5% 特大订单
-                total_amount = random.randint(8000, 20000)
-            
-            discount_amount = random.randint(0, min(500, total_amount // 20)) if random.random() < 0.25 else 0
-            final_amount = total_amount - discount_amount
-            total_cost = round(total_amount * 0.6)
-            gross_profit = final_amount - total_cost
-            profit_margin = round((gross_profit / final_amount) * 100) if final_amount > 0 else 0
-            
-            status = random.choices(['completed', 'pending', 'cancelled'], weights=[90, 8, 2])[0]
-            
-            if status == 'completed':
-                batch_revenue += final_amount
-                total_revenue += final_amount
-            
-            values_list.append(f"('{order_no}', {customer_id}, {warehouse_id}, '{order_date}', {total_amount}, {discount_amount}, {final_amount}, {final_amount}, {total_cost}, {gross_profit}, {profit_margin}, 'paid', '{status}', 'Demo数据-批次{batch+1}')")
-        
-        # 批量插入
-        sql = f"""INSERT INTO sales_orders (order_no, customer_id, warehouse_id, order_date, 
-                 total_amount, discount_amount, final_amount, paid_amount, total_cost, gross_profit, 
-                 profit_margin, payment_status, status, remarks) 
-                 VALUES {', '.join(values_list)};"""
-        
-        response = import_data(token, "sales_orders", sql)
-        if response.status_code == 200:
+        # 批量插入（临时错误自动重试，坏行二分定位后写入拒绝文件）
+        result = journal.send(InsertBatch("sales_orders", ", ".join(SALES_COLUMNS), values_list))
+        if result is None:
+            print(f"⏭️ 批次 {batch + 1} 已在上次运行中提交，跳过")
+        elif result.ok:
             print(f"✅ 批次 {batch + 1} 成功，本批收入：¥{batch_revenue:,.0f}")
         else:
-            print(f"❌ 批次 {batch + 1} 失败: {response.text}")
+            print(f"⚠️ 批次 {batch + 1} 成功 {result.committed}/{len(values_list)} 行，"
+                  f"{result.rejected} 行写入拒绝文件")
         
-        time.sleep(1)  # 避免API限制
-    
-    print(f"\n💰 总收入统计：¥{total_revenue:,.0f}")
+    print(f"\n💰 总收入统计：¥{totals['revenue']:,.0f}")
     
     # 扩展采购订单
     print("🏭 扩展采购订单...")
     
-    for batch in range(10):  # 10批，每批20个 = 200个额外采购订单
-        print(f"📦 创建采购批次 {batch + 1}/10...")
-        
-        values_list = []
-        
-        for i in range(20):
-            order_index = 51 + batch * 20 + i
-            order_no = f"PO-20250917-{30000 + order_index}"
-            supplier_id = random.randint(1, 4)
-            warehouse_id = random.randint(1, 2)
-            
-            days_ago = random.randint(0, 60)
-            order_date = (datetime.now() - timedelta(days=days_ago)).strftime('%Y-%m-%d')
-            
-            # 采购金额（支撑销售）
-            total_amount = random.randint(15000, 100000)
-            status = random.choices(['completed', 'pending'], weights=[85, 15])[0]
-            
-            values_list.append(f"('{order_no}', {supplier_id}, {warehouse_id}, '{order_date}', {total_amount}, '{status}', 'Demo采购-批次{batch+1}')")
-        
-        sql = f"""INSERT INTO purchase_orders (order_no, supplier_id, warehouse_id, order_date, 
-                 total_amount, status, remarks) 
-                 VALUES {', '.join(values_list)};"""
+    rows = purchase_order_rows(journal.now, purchases, seed, workers)
+    batches = -(-purchases // PURCHASE_BATCH_SIZE)
+    
+    for batch in range(batches):  # 默认10批，每批20个 = 200个额外采购订单
+        print(f"📦 创建采购批次 {batch + 1}/{batches}...")
+        values_list = list(islice(rows, PURCHASE_BATCH_SIZE))
         
-        response = import_data(token, "purchase_orders", sql)
-        if response.status_code == 200:
+        result = journal.send(InsertBatch("purchase_orders", ", ".join(PURCHASE_COLUMNS), values_list))
+        if result is None:
+            print(f"⏭️ 采购批次 {batch + 1} 已在上次运行中提交，跳过")
+        elif result.ok:
             print(f"✅ 采购批次 {batch + 1} 成功")
         else:
-            print(f"❌ 采购批次 {batch + 1} 失败")
-        
-        time.sleep(0.8)
+            print(f"⚠️ 采购批次 {batch + 1} 成功 {result.committed}/{len(values_list)} 行，"
+                  f"{result.rejected} 行写入拒绝文件")
+
+def stream_up_orders(journal, orders, purchases, seed, workers):
+    """以一个 NDJSON 流上传全部订单，客户端和服务器内存都与行数无关"""
+    print(f"🌊 流式上传 {orders:,} 个销售订单和 {purchases:,} 个采购订单...")
+    
+    totals = {"revenue": 0}
+    stream = RowStream([
+        ("sales_orders", SALES_COLUMNS, sales_order_rows(journal.now, orders, totals, seed, workers)),
+        ("purchase_orders", PURCHASE_COLUMNS, purchase_order_rows(journal.now, purchases, seed, workers)),
+    ], progress_every=100000)
+    response = api.stream_import(stream)
+    
+    if response.status_code == 200:
+        print(f"✅ 流式导入成功：{stream.rows:,} 行，{stream.bytes / 1024 / 1024:.1f} MB")
+        print(f"\n💰 总收入统计：¥{totals['revenue']:,.0f}")
+    else:
+        # 整个流在一个事务里，失败时全部回滚；保留运行记录，--resume 会重新生成同样的数据
+        journal.incomplete += 1
+        print(f"❌ 流式导入失败（已全部回滚）：{response.text}")
+
+def offline_up_orders(sink, now, orders, purchases, seed, workers):
+    """不经过 API，直接写入 SQLite 文件或 SQL 转储：每个分片一次事务"""
+    print(f"🗄️ 写入 {orders:,} 个销售订单和 {purchases:,} 个采购订单到 {sink.path}...")
+    
+    revenue = 0
+    for rows in run_shards(sales_order_shard, daily_shards("sales_orders", seed, now, orders, SALES_DAYS),
+                           seed, workers):
+        revenue += sum(row[6] for row in rows if row[12] == 'completed')
+        sink.write_shard([InsertBatch("sales_orders", ", ".join(SALES_COLUMNS), rows)])
+    
+    for rows in run_shards(purchase_order_shard, daily_shards("purchase_orders", seed, now, purchases, PURCHASE_DAYS),
+                           seed, workers):
+        sink.write_shard([InsertBatch("purchase_orders", ", ".join(PURCHASE_COLUMNS), rows)])
+    
+    print(f"✅ {sink.summary()}")
+    print(f"\n💰 总收入统计：¥{revenue:,.0f}")
 
 def main():
+    parser = argparse.ArgumentParser(description="扩展到月销100万大型店铺规模")
+    parser.add_argument("--resume", action="store_true", help="从上次中断的位置继续，不重复也不遗漏")
+    parser.add_argument("--orders", type=int, default=1000, help="新增销售订单数")
+    parser.add_argument("--purchases", type=int, default=200, help="新增采购订单数")
+    parser.add_argument("--stream", action="store_true",
+                        help="以 NDJSON 流一次性上传（一个事务，内存与行数无关，适合百万行）")
+    parser.add_argument("--seed", type=int, help="随机种子：同一种子（和 --as-of）生成逐字节相同的数据，与 --workers 无关")
+    parser.add_argument("--as-of", type=datetime.fromisoformat, help="基准日期（默认今天），订单日期相对它往前推")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="并行生成分片的进程数")
+    parser.add_argument("--sqlite", metavar="PATH",
+                        help="不经过 API，直接写入 wms.db 兼容的 SQLite 文件（不存在时按 init.ts 新建）")
+    parser.add_argument("--dump", metavar="DIR",
+                        help="不经过 API，按表写成 gzip 压缩的 SQL 转储（与 data-export/ 格式相同），"
+                             "之后用 gunzip -c DIR/*.sql.gz | sqlite3 wms.db 装载")
+    args = parser.parse_args()
+    
+    if args.sqlite or args.dump:
+        random.seed(args.seed)
+        now = args.as_of or datetime.now()
+        # 给了种子时，created_at 等时间列的默认值也固定成基准时间，同一种子两次生成的结果相同
+        pinned = now if args.seed is not None else None
+        with (SqliteSink(args.sqlite, now=pinned) if args.sqlite else DumpSink(args.dump, now=pinned)) as sink:
+            offline_up_orders(sink, now, args.orders, args.purchases,
+                             random.getrandbits(64), args.workers)
+            print("\n📊 最终数据统计:")
+            for table, count in sink.get_stats().items():
+                print(f"  {table}: {count:,} 条记录")
+        return
+
     print("🏪 扩展到月销100万大型店铺规模")
     print("=" * 60)
     
@@ -148,12 +231,19 @@ def main():
     print("✅ 登录成功")
     
     # 扩展订单数据
-    scale_up_orders(token)
+    journal = SeedJournal.open("scale-to-million", resume=args.resume, seed=args.seed, now=args.as_of)
+    # 分片主种子由 random 派生，续跑恢复随机数状态后各分片生成的数据不变
+    seed = random.getrandbits(64)
+    if args.stream:
+        stream_up_orders(journal, args.orders, args.purchases, seed, args.workers)
+    else:
+        scale_up_orders(journal, args.orders, args.purchases, seed, args.workers)
+    journal.finish()
     
     # 获取最终统计
     print("\n📊 最终数据统计:")
-    response = requests.get(f"{RAILWAY_URL}/data-import/stats", 
-                          headers={"Authorization": f"Bearer {token}"})
+    response = api.get(f"{RAILWAY_URL}/data-import/stats", 
+                     headers={"Authorization": f"Bearer {token}"})
     if response.status_code == 200:
         stats = response.json()
         total_sales = stats.get('sales_orders', 0)
@@ -176,5 +266,8 @@ def main():
     else:
         print("❌ 获取统计失败")
 
+    print(pacing_report())
+    print(compression_report())
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,14 @@
+"""WMS 演示数据工具包：导数脚本共用的 API 客户端等组件"""
+from .client import RAILWAY_URL, ApiClient, get_client, import_data, login
+from .importer import BulkImporter, ImportStats, InsertBatch
+
+__all__ = [
+    "RAILWAY_URL",
+    "ApiClient",
+    "BulkImporter",
+    "ImportStats",
+    "InsertBatch",
+    "get_client",
+    "import_data",
+    "login",
+]
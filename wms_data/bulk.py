@@ -0,0 +1,53 @@
+"""把批次打包成 /api/data-import/bulk 信封
+
+/import 每个请求是一条 db.exec 的自动提交事务，造一个月的数据要提交上百次（每次一个 fsync）。
+信封把相邻的批次（可以跨表）装进一个请求，服务器用预编译语句在一个 BEGIN/COMMIT 里插入，
+信封按生成顺序排列，父表批次总在子表批次之前，外键顺序在事务内自然成立。
+"""
+import json
+
+# 单个信封的 JSON 大小上限，需小于后端 express.json 的 limit
+DEFAULT_ENVELOPE_BYTES = 2 * 1024 * 1024
+# 单个信封的行数上限，避免一个事务持有写锁太久
+DEFAULT_ENVELOPE_ROWS = 50000
+
+
+def payload_size(batch):
+    """批次在信封 JSON 中大约占用的字节数"""
+    return len(json.dumps(batch.payload(), ensure_ascii=False).encode("utf-8"))
+
+
+class BulkEnvelope:
+    """一次 bulk 请求携带的 (序号, 批次) 列表"""
+
+    def __init__(self):
+        self.items = []
+        self.size = 0
+        self.rows = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, seq, batch, size):
+        self.items.append((seq, batch))
+        self.size += size
+        self.rows += len(batch)
+
+    def fits(self, batch, size, max_bytes, max_rows):
+        """再放入这个批次是否仍在上限内（空信封总能放下一个批次）"""
+        if not self.items:
+            return True
+        return self.size + size <= max_bytes and self.rows + len(batch) <= max_rows
+
+
+def pack_envelopes(items, max_bytes=DEFAULT_ENVELOPE_BYTES, max_rows=DEFAULT_ENVELOPE_ROWS):
+    """把 (序号, 批次) 流按顺序装成信封，逐个产出 BulkEnvelope"""
+    envelope = BulkEnvelope()
+    for seq, batch in items:
+        size = payload_size(batch)
+        if not envelope.fits(batch, size, max_bytes, max_rows):
+            yield envelope
+            envelope = BulkEnvelope()
+        envelope.add(seq, batch, size)
+    if envelope.items:
+        yield envelope
@@ -0,0 +1,282 @@
+"""共享的 Railway API 客户端
+
+所有导数/修复脚本共用一个 requests.Session：
+- 连接池保持 keep-alive，批量导入不再每批重新握手 TCP+TLS
+- 公共请求头（Authorization / Content-Type）只设置一次
+- token 登录一次后缓存在客户端上，并写入磁盘缓存供之后运行的脚本复用；
+  服务器返回 401/403 时自动重新登录并重发请求
+- 请求节奏由 AIMD 自适应限速器控制，脚本里不再写死 time.sleep
+- 数据导入接口超过阈值的请求体按 gzip（或 br）压缩，并按表统计压缩率
+"""
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .columnar import MSGPACK_CONTENT_TYPE
+from .compression import CompressionStats, check_encoding, compress, compressor
+from .ratelimit import AimdController
+from .stream import NDJSON_CONTENT_TYPE
+from .token_cache import TokenCache
+
+# Railway API配置（可通过环境变量指向本地后端）
+RAILWAY_URL = os.environ.get("WMS_API_URL", "https://web-production-7a257.up.railway.app/api")
+DEFAULT_USERNAME = os.environ.get("WMS_USERNAME", "admin")
+DEFAULT_PASSWORD = os.environ.get("WMS_PASSWORD", "123456")
+# 请求体压缩编码：gzip（默认）/ br / none
+DEFAULT_COMPRESSION = os.environ.get("WMS_COMPRESSION", "gzip")
+# 小于这个字节数的请求体不压缩
+COMPRESS_MIN_BYTES = 1024
+# 后端只在数据导入接口（登录之后）解压请求体，其他接口的请求体原样发送
+COMPRESSED_PREFIX = "/data-import/"
+
+
+class ApiClient:
+    """带连接池和 token 缓存的 API 客户端"""
+
+    def __init__(self, base_url=RAILWAY_URL, username=DEFAULT_USERNAME,
+                 password=DEFAULT_PASSWORD, pool_size=10, timeout=60, controller=None,
+                 compression=DEFAULT_COMPRESSION, compress_min_bytes=COMPRESS_MIN_BYTES,
+                 token_cache=None):
+        self.base_url = base_url.rstrip("/")
+        self.controller = controller
+        self.compression = None if compression in (None, "", "none") else check_encoding(compression)
+        self.compress_min_bytes = compress_min_bytes
+        self.compression_stats = CompressionStats()
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.token = None
+        self.token_cache = TokenCache() if token_cache is None else token_cache
+        self._login_lock = threading.RLock()
+        self.pool_size = 0
+
+        self.session = requests.Session()
+        self.resize_pool(pool_size)
+        self.session.headers.update({"Content-Type": "application/json"})
+
+    def resize_pool(self, pool_size):
+        """保证连接池至少能容纳 pool_size 个并发连接"""
+        if pool_size <= self.pool_size:
+            return
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.pool_size = pool_size
+
+    def url(self, path):
+        """拼接完整的接口地址"""
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(self, method, path, pace=True, stats_key=None, reauth=True, **kwargs):
+        """通过共享会话发送请求（配置了限速器时先等待发送许可）
+
+        stats_key 是压缩统计的归类（一般是表名），不传时按接口路径归类。
+        token 失效（401/403）时重新登录并重发一次；分块上传的请求体无法重放，不重发。
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        if self.compression is not None and COMPRESSED_PREFIX in self.url(path):
+            self._compress_body(kwargs, stats_key or path)
+
+        sent_token = self.token
+        response = self._send(method, path, pace, kwargs)
+        if reauth and sent_token and response.status_code in (401, 403) \
+                and isinstance(kwargs.get("data"), (bytes, bytearray, str, dict, type(None))):
+            token = self._relogin(sent_token)
+            if token:
+                headers = kwargs.get("headers")
+                if headers and "Authorization" in headers:
+                    kwargs["headers"] = {**headers, "Authorization": f"Bearer {token}"}
+                response = self._send(method, path, pace, kwargs)
+        return response
+
+    def _send(self, method, path, pace, kwargs):
+        if self.controller is None or not pace:
+            return self.session.request(method, self.url(path), **kwargs)
+
+        self.controller.acquire()
+        start = time.perf_counter()
+        response = None
+        try:
+            response = self.session.request(method, self.url(path), **kwargs)
+            return response
+        finally:
+            self.controller.release(time.perf_counter() - start, response)
+
+    def _compress_body(self, kwargs, stats_key):
+        """把超过阈值的请求体（json / bytes / 分块生成器）替换成压缩后的数据"""
+        if kwargs.get("json") is not None:
+            kwargs["data"] = json.dumps(kwargs.pop("json"), ensure_ascii=False).encode("utf-8")
+
+        data = kwargs.get("data")
+        if isinstance(data, (bytes, bytearray)):
+            if len(data) < self.compress_min_bytes:
+                return
+            kwargs["data"] = compress(data, self.compression)
+            self.compression_stats.record(stats_key, len(data), len(kwargs["data"]))
+        elif data is not None and not isinstance(data, (str, dict)):
+            kwargs["data"] = self._compress_chunks(data, stats_key)
+        else:
+            return
+
+        kwargs["headers"] = {**(kwargs.get("headers") or {}), "Content-Encoding": self.compression}
+
+    def _compress_chunks(self, chunks, stats_key):
+        """边压缩边产出分块请求体"""
+        stream = compressor(self.compression)
+        raw = sent = 0
+        for chunk in chunks:
+            raw += len(chunk)
+            data = stream.compress(chunk)
+            if data:
+                sent += len(data)
+                yield data
+        data = stream.flush()
+        sent += len(data)
+        self.compression_stats.record(stats_key, raw, sent)
+        yield data
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def login(self, force=False):
+        """登录获取token（优先复用内存和磁盘缓存中未过期的token）"""
+        with self._login_lock:
+            if self.token and not force:
+                return self.token
+
+            cache_key = f"{self.base_url}|{self.username}"
+            if not force and self.token_cache:
+                cached = self.token_cache.get(cache_key)
+                if cached:
+                    self._set_token(cached)
+                    return cached
+
+            response = self.post("/auth/login", pace=False, reauth=False,
+                                 json={"username": self.username, "password": self.password})
+            if response.status_code != 200:
+                print(f"登录失败: {response.text}")
+                return None
+
+            self._set_token(response.json().get("token"))
+            if self.token_cache:
+                self.token_cache.put(cache_key, self.token)
+            return self.token
+
+    def _set_token(self, token):
+        self.token = token
+        self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def _relogin(self, stale_token):
+        """token 被服务器拒绝后重新登录；其他线程已经换过 token 时直接用新的"""
+        with self._login_lock:
+            if self.token and self.token != stale_token:
+                return self.token
+            if self.token_cache:
+                self.token_cache.discard(f"{self.base_url}|{self.username}")
+            return self.login(force=True)
+
+    def import_data(self, table_name, sql_data):
+        """导入数据到Railway"""
+        data = {
+            "tableName": table_name,
+            "data": sql_data
+        }
+        return self.post("/data-import/import", json=data, stats_key=table_name)
+
+    def bulk_import(self, envelope):
+        """一次请求导入多张表的行，服务器在同一个事务中提交
+
+        envelope 形如 {"tables": [{"tableName": ..., "columns": [...], "rows": [[...], ...]}]}
+        """
+        tables = dict.fromkeys(table["tableName"] for table in envelope["tables"])
+        return self.post("/data-import/bulk", json=envelope, stats_key=" + ".join(tables))
+
+    def bulk_import_columnar(self, body, tables=()):
+        """以列式 MessagePack 请求体（见 columnar.encode_envelope）调用批量导入"""
+        return self.post("/data-import/bulk", data=body,
+                         headers={"Content-Type": MSGPACK_CONTENT_TYPE},
+                         stats_key=" + ".join(dict.fromkeys(tables)) or None)
+
+    def stream_import(self, stream, timeout=None):
+        """以分块传输上传一个 RowStream（NDJSON），服务器边收边插入，整体一次事务
+
+        请求体是一次性的生成器，失败时不能重放，所以这里不做重试；
+        服务器要收完整个请求体才回复，默认不设读取超时。
+        """
+        return self.post("/data-import/stream", data=iter(stream),
+                         headers={"Content-Type": NDJSON_CONTENT_TYPE},
+                         timeout=timeout or (self.timeout, None), stats_key="NDJSON 流")
+
+    def allocate_ids(self, table_name, count):
+        """向服务器预留 count 个连续主键，返回 (start, end)（含两端）"""
+        response = self.post("/data-import/allocate-ids", json={"tableName": table_name, "count": count})
+        if response.status_code != 200:
+            raise RuntimeError(f"预留 {table_name} 主键失败: {response.text}")
+        data = response.json()
+        return data["start"], data["end"]
+
+    def get_stats(self):
+        """获取各表记录数，失败时返回 None"""
+        response = self.get("/data-import/stats")
+        if response.status_code == 200:
+            return response.json()
+        return None
+
+    def pacing_report(self):
+        """限速器的最终速率报告"""
+        if self.controller is None:
+            return "🎛️ 未启用自适应限速"
+        return self.controller.report()
+
+    def compression_report(self):
+        """各表请求体压缩前后的字节数报告"""
+        if self.compression is None:
+            return "🗜️ 未启用请求体压缩"
+        return self.compression_stats.report(self.compression)
+
+    def close(self):
+        self.session.close()
+
+
+_default_client = None
+
+
+def get_client():
+    """返回进程内共享的默认客户端"""
+    global _default_client
+    if _default_client is None:
+        _default_client = ApiClient(controller=AimdController())
+    return _default_client
+
+
+def login():
+    """登录获取token（兼容旧脚本的函数接口）"""
+    return get_client().login()
+
+
+def import_data(token, table_name, sql_data):
+    """导入数据到Railway（兼容旧脚本的函数接口，token 由客户端统一管理）"""
+    return get_client().import_data(table_name, sql_data)
+
+
+def pacing_report():
+    """默认客户端的限速报告"""
+    return get_client().pacing_report()
+
+
+def compression_report():
+    """默认客户端的压缩报告"""
+    return get_client().compression_report()
+
+
+# 供脚本直接发 GET/POST 的共享客户端（复用同一个连接池并受限速器控制）
+api = get_client()
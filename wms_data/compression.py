@@ -0,0 +1,74 @@
+"""请求体压缩
+
+导数脚本发送的 SQL / JSON 高度重复（相同的列名、'Demo数据-批次N' 之类的备注），压缩后通常只剩几分之一。
+- gzip：后端的 express.json / express.raw 原生支持，旧部署也能直接用，是默认编码
+- br：压缩率更高，需要安装 brotli 包且后端带有 decompressBody 中间件（WMS_COMPRESSION=br 开启）
+每张表累计压缩前后的字节数，运行结束时用 report() 输出。
+"""
+import threading
+import zlib
+
+try:
+    import brotli
+except ImportError:  # 可选依赖
+    brotli = None
+
+SUPPORTED_ENCODINGS = ("gzip", "br")
+
+
+def check_encoding(encoding):
+    """校验压缩编码；br 需要 brotli 包"""
+    if encoding not in SUPPORTED_ENCODINGS:
+        raise ValueError(f"不支持的压缩编码：{encoding}")
+    if encoding == "br" and brotli is None:
+        raise ValueError("使用 br 压缩需要先 pip install brotli")
+    return encoding
+
+
+def compress(data, encoding):
+    """压缩一段完整的请求体"""
+    stream = compressor(encoding)
+    return stream.compress(data) + stream.flush()
+
+
+def compressor(encoding):
+    """流式压缩器，提供 compress(chunk) 和 flush()"""
+    if encoding == "br":
+        return _BrotliCompressor()
+    return zlib.compressobj(6, zlib.DEFLATED, 31)
+
+
+class _BrotliCompressor:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=5)
+
+    def compress(self, chunk):
+        return self._compressor.process(chunk)
+
+    def flush(self):
+        return self._compressor.finish()
+
+
+class CompressionStats:
+    """按表累计压缩前后的字节数，线程安全"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.tables = {}
+
+    def record(self, key, raw_bytes, sent_bytes):
+        with self._lock:
+            raw, sent = self.tables.get(key, (0, 0))
+            self.tables[key] = (raw + raw_bytes, sent + sent_bytes)
+
+    def report(self, encoding):
+        if not self.tables:
+            return "🗜️ 请求体压缩：没有超过阈值的请求"
+        lines = [f"🗜️ 请求体压缩（{encoding}）："]
+        total_raw = total_sent = 0
+        for key, (raw, sent) in sorted(self.tables.items(), key=lambda item: -item[1][0]):
+            lines.append(f"   {key}: {raw / 1024:,.1f} KB → {sent / 1024:,.1f} KB（{sent / raw:.0%}）")
+            total_raw += raw
+            total_sent += sent
+        lines.append(f"   合计节省 {(total_raw - total_sent) / 1024:,.1f} KB（压缩后为原来的 {total_sent / total_raw:.0%}）")
+        return "\n".join(lines)
@@ -0,0 +1,370 @@
+"""data-export/*.sql 解析结果的列式缓存（.npy，按 mmap 装载）
+
+每次迁移（convert-data-format.py、fix-orders-data.py）都要从头解析同样的转储。这里把解析出的各表
+按列写成 .npy 文件，放在转储旁边的 .columnar/<文件名>/ 下，manifest.json 记下转储的大小、修改时间和 SHA-256：
+- 大小和修改时间都没变时直接用缓存，不读转储
+- 有变化时重算 SHA-256：内容相同只更新记录，内容变了就重新解析，整体替换缓存
+.npy 用 np.load(mmap_mode="r") 打开，装载只读文件头，值在用到时才从页缓存读入。
+
+每列按值的类型拆成几条流，读回的值与 DumpReader 完全相同（整数还是整数，NULL 还是 NULL）：
+    t<表>.c<列>.tag.npy      uint8，每行值的类型；整列同一类型时不写，记在 manifest 里
+    t<表>.c<列>.int.npy      int64
+    t<表>.c<列>.real.npy     float64
+    t<表>.c<列>.bytes.npy    uint8，文本（UTF-8）、BLOB、超出 int64 的整数依次拼接
+    t<表>.c<列>.offsets.npy  int64，bytes 流中每个值的结束位置
+写缓存时逐块追加，内存与转储大小无关。numpy 是可选依赖，没有时 named_blocks() 直接解析转储。
+
+用法：
+    tables = open_cache("data-export/sales_orders.sql")
+    amounts = tables["sales_orders"].array("total_amount")
+"""
+import hashlib
+import json
+import os
+import shutil
+import struct
+import tempfile
+
+from .dump_reader import DumpReader
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖，没有时不使用缓存
+    np = None
+
+CACHE_DIRECTORY = ".columnar"
+# 读缓存时每块的行数
+BLOCK_ROWS = 65536
+
+# 值的类型标记
+_NULL, _INT, _REAL, _TEXT, _BLOB, _BIGINT = range(6)
+_TAGS = {type(None): _NULL, int: _INT, float: _REAL, str: _TEXT, bytes: _BLOB}
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+# .npy 文件头预留的字节数：先写占位，数据写完后再填上行数
+_HEADER_BYTES = 128
+_MANIFEST = "manifest.json"
+
+
+def cache_directory(path):
+    """转储 path 的缓存目录"""
+    return os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIRECTORY, os.path.basename(path))
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def open_cache(path, workers=1):
+    """转储 path 中的各表 {表名: ColumnarTable}（按在转储中出现的顺序）；缓存缺失或过期时先解析转储重建"""
+    if np is None:
+        raise RuntimeError("列式缓存需要 numpy：pip install numpy")
+    directory = cache_directory(path)
+    stat = os.stat(path)
+    manifest = _read_manifest(directory)
+    if manifest is not None and (manifest["size"], manifest["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+        return _tables(directory, manifest)
+
+    digest = file_sha256(path)
+    if manifest is not None and manifest["sha256"] == digest:
+        # 只是修改时间变了（复制、touch），内容相同
+        manifest["size"], manifest["mtime_ns"] = stat.st_size, stat.st_mtime_ns
+        _write_manifest(directory, manifest)
+        return _tables(directory, manifest)
+    manifest = _build(path, directory, {"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns},
+                      workers)
+    return _tables(directory, manifest)
+
+
+def named_blocks(path, table=None, workers=1, cache=True):
+    """按块产出 (表名, {列名: 值列表})，与 DumpReader.named_blocks 相同；装了 numpy 且 cache 为真时走缓存"""
+    if not cache or np is None:
+        with DumpReader(path) as reader:
+            yield from reader.named_blocks(table, workers)
+        return
+    for name, cached in open_cache(path, workers).items():
+        if table is None or name == table:
+            for _, columns in cached.blocks():
+                yield name, dict(zip(cached.columns, columns))
+
+
+class ColumnarTable:
+    """缓存中的一张表：columns 是列名，create 是转储里的建表语句，rows 是行数"""
+
+    def __init__(self, directory, name, meta):
+        self.directory = directory
+        self.name = name
+        self.columns = meta["columns"]
+        self.create = meta["create"]
+        self.rows = meta["rows"]
+        self._prefix = meta["prefix"]
+        # 每列整列统一的类型标记，混合类型为 None
+        self._kinds = meta["kinds"]
+        self._streams = {}
+
+    def __len__(self):
+        return self.rows
+
+    def blocks(self, rows=BLOCK_ROWS):
+        """按块产出 (表名, columns)，与 DumpReader.blocks 的形式相同"""
+        positions = [{"int": 0, "real": 0, "bytes": 0} for _ in self.columns]
+        for start in range(0, self.rows, rows):
+            stop = min(start + rows, self.rows)
+            yield self.name, [self._values(index, start, stop, positions[index])
+                              for index in range(len(self.columns))]
+
+    def array(self, column):
+        """整列的 NumPy 数组
+
+        整数列是 int64、实数列是 float64（整数实数混合时也是 float64），直接映射缓存文件；
+        含 NULL 的数值列是 MaskedArray（NULL 处被遮住）；文本等其他列是 object 数组。
+        """
+        index = self.columns.index(column)
+        kind = self._kinds[index]
+        if kind == _INT:
+            return self._stream(index, "int", np.int64)
+        if kind == _REAL:
+            return self._stream(index, "real", np.float64)
+        if kind is None:
+            tags = self._stream(index, "tag", np.uint8)
+            present = np.flatnonzero(np.bincount(tags, minlength=_BIGINT + 1))
+            if set(present.tolist()) <= {_NULL, _INT, _REAL}:
+                dtype = np.float64 if _REAL in present else np.int64
+                values = np.zeros(self.rows, dtype=dtype)
+                values[tags == _INT] = self._stream(index, "int", np.int64)
+                values[tags == _REAL] = self._stream(index, "real", np.float64)
+                return np.ma.MaskedArray(values, mask=tags == _NULL) if _NULL in present else values
+        out = np.empty(self.rows, dtype=object)
+        position = {"int": 0, "real": 0, "bytes": 0}
+        for start in range(0, self.rows, BLOCK_ROWS):
+            stop = min(start + BLOCK_ROWS, self.rows)
+            out[start:stop] = self._values(index, start, stop, position)
+        return out
+
+    def _stream(self, index, stream, dtype):
+        """映射第 index 列的一条流（没有写过的流是空数组）"""
+        key = (index, stream)
+        array = self._streams.get(key)
+        if array is None:
+            path = os.path.join(self.directory, f"{self._prefix}.c{index}.{stream}.npy")
+            array = np.load(path, mmap_mode="r") if os.path.exists(path) else np.empty(0, dtype=dtype)
+            self._streams[key] = array
+        return array
+
+    def _values(self, index, start, stop, position):
+        """第 index 列 [start, stop) 行的值列表；position 记录各条流已经读到的位置"""
+        kind = self._kinds[index]
+        count = stop - start
+        if kind == _NULL:
+            return [None] * count
+        if kind is not None:
+            return self._take(index, kind, count, position)
+        tags = self._stream(index, "tag", np.uint8)[start:stop]
+        out = np.empty(count, dtype=object)
+        for tag in (_INT, _REAL):
+            mask = tags == tag
+            if mask.any():
+                out[mask] = self._take(index, tag, int(mask.sum()), position)
+        mask = tags >= _TEXT
+        if mask.any():
+            out[mask] = [_DECODE[tag](raw) for tag, raw in zip(
+                tags[mask].tolist(), self._raw(index, int(mask.sum()), position))]
+        return out.tolist()
+
+    def _take(self, index, kind, count, position):
+        """从第 index 列 kind 类型的流中接着读 count 个值"""
+        if kind in (_INT, _REAL):
+            stream = "int" if kind == _INT else "real"
+            at = position[stream]
+            position[stream] = at + count
+            return self._stream(index, stream, np.int64 if kind == _INT else np.float64)[at:at + count].tolist()
+        decode = _DECODE[kind]
+        return [decode(raw) for raw in self._raw(index, count, position)]
+
+    def _raw(self, index, count, position):
+        """从 bytes 流中接着读 count 个值的原始字节"""
+        at = position["bytes"]
+        position["bytes"] = at + count
+        offsets = self._stream(index, "offsets", np.int64)
+        ends = offsets[at:at + count]
+        first = int(offsets[at - 1]) if at else 0
+        data = self._stream(index, "bytes", np.uint8)[first:int(ends[-1])].tobytes()
+        starts = [0] + (ends[:-1] - first).tolist()
+        return [data[begin:end] for begin, end in zip(starts, (ends - first).tolist())]
+
+
+def _decode_text(raw):
+    return raw.decode("utf-8")
+
+
+_DECODE = {_TEXT: _decode_text, _BLOB: bytes, _BIGINT: int}
+
+
+class _Stream:
+    """一条 .npy 流：先写占位文件头，逐块追加数据，关闭时写上真实的长度"""
+
+    def __init__(self, path, dtype):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.count = 0
+        self.file = open(path, "wb")
+        self.file.write(b"\0" * _HEADER_BYTES)
+
+    def append(self, values):
+        values = np.ascontiguousarray(values, dtype=self.dtype)
+        values.tofile(self.file)
+        self.count += len(values)
+
+    def close(self):
+        header = repr({"descr": np.lib.format.dtype_to_descr(self.dtype), "fortran_order": False,
+                       "shape": (self.count,)})
+        header = header.ljust(_HEADER_BYTES - 11) + "\n"
+        self.file.seek(0)
+        self.file.write(b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1"))
+        self.file.close()
+
+
+class _ColumnWriter:
+    """一列的各条流，按块追加"""
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.streams = {}
+        self.tags = np.zeros(_BIGINT + 1, dtype=np.int64)
+        self.byte_count = 0
+
+    def _write(self, stream, values, dtype):
+        if stream not in self.streams:
+            self.streams[stream] = _Stream(f"{self.prefix}.{stream}.npy", dtype)
+        self.streams[stream].append(values)
+
+    def append(self, values):
+        kinds = set(map(type, values))
+        if kinds == {int}:
+            try:
+                ints = np.array(values, dtype=np.int64)
+            except OverflowError:
+                ints = None
+            if ints is not None:
+                self._write("int", ints, np.int64)
+                self._tag(np.full(len(values), _INT, dtype=np.uint8))
+                return
+        elif kinds == {float}:
+            self._write("real", values, np.float64)
+            self._tag(np.full(len(values), _REAL, dtype=np.uint8))
+            return
+        elif kinds == {str}:
+            self._bytes([value.encode("utf-8") for value in values])
+            self._tag(np.full(len(values), _TEXT, dtype=np.uint8))
+            return
+
+        tags = np.fromiter(map(_tag, values), dtype=np.uint8, count=len(values))
+        for tag, stream, dtype in ((_INT, "int", np.int64), (_REAL, "real", np.float64)):
+            rows = np.flatnonzero(tags == tag).tolist()
+            if rows:
+                self._write(stream, [values[row] for row in rows], dtype)
+        rows = np.flatnonzero(tags >= _TEXT).tolist()
+        if rows:
+            self._bytes([_encode(values[row]) for row in rows])
+        self._tag(tags)
+
+    def _bytes(self, raws):
+        lengths = np.fromiter(map(len, raws), dtype=np.int64, count=len(raws))
+        self._write("offsets", self.byte_count + np.cumsum(lengths), np.int64)
+        self._write("bytes", np.frombuffer(b"".join(raws), dtype=np.uint8), np.uint8)
+        self.byte_count += int(lengths.sum())
+
+    def _tag(self, tags):
+        self.tags += np.bincount(tags, minlength=_BIGINT + 1)
+        self._write("tag", tags, np.uint8)
+
+    def close(self):
+        """关闭各条流，返回整列统一的类型标记（混合类型为 None）；统一时删掉 tag 流"""
+        for stream in self.streams.values():
+            stream.close()
+        present = np.flatnonzero(self.tags)
+        if len(present) != 1:
+            return None
+        os.remove(self.streams["tag"].path)
+        return int(present[0])
+
+
+def _tag(value):
+    tag = _TAGS[type(value)]
+    if tag == _INT and not _INT64_MIN <= value <= _INT64_MAX:
+        return _BIGINT
+    return tag
+
+
+def _encode(value):
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    if isinstance(value, int):
+        return str(value).encode("ascii")
+    return bytes(value)
+
+
+def _build(path, directory, source, workers):
+    """解析转储，写到临时目录，完成后替换掉旧缓存；返回 manifest"""
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+    building = tempfile.mkdtemp(prefix=".building-", dir=parent)
+    try:
+        tables = {}
+        writers = {}
+        with DumpReader(path) as reader:
+            for name, columns in reader.blocks(workers=workers):
+                if name not in writers:
+                    prefix = f"t{len(writers)}"
+                    writers[name] = [_ColumnWriter(os.path.join(building, f"{prefix}.c{index}"))
+                                     for index in range(len(columns))]
+                    tables[name] = {"prefix": prefix, "columns": reader.column_names(name), "rows": 0}
+                for writer, values in zip(writers[name], columns):
+                    writer.append(values)
+                tables[name]["rows"] += len(columns[0])
+            for name, meta in tables.items():
+                meta["create"] = reader.create[name]
+                meta["kinds"] = [writer.close() for writer in writers[name]]
+            # 只有建表语句、没有数据的表
+            for name, sql in reader.create.items():
+                if name not in tables:
+                    columns = reader.column_names(name)
+                    tables[name] = {"prefix": f"t{len(tables)}", "columns": columns, "rows": 0, "create": sql,
+                                    "kinds": [_NULL] * len(columns)}
+        manifest = dict(source, tables=tables)
+        _write_manifest(building, manifest)
+    except BaseException:
+        shutil.rmtree(building, ignore_errors=True)
+        raise
+
+    # 旧缓存先挪开再换上新的，别的进程不会读到写了一半的目录
+    stale = None
+    if os.path.exists(directory):
+        stale = tempfile.mkdtemp(prefix=".stale-", dir=parent)
+        os.rename(directory, os.path.join(stale, "cache"))
+    os.rename(building, directory)
+    if stale is not None:
+        shutil.rmtree(stale, ignore_errors=True)
+    return manifest
+
+
+def _read_manifest(directory):
+    try:
+        with open(os.path.join(directory, _MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(directory, manifest):
+    path = os.path.join(directory, _MANIFEST)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(path + ".tmp", path)
+
+
+def _tables(directory, manifest):
+    return {name: ColumnarTable(directory, name, meta) for name, meta in manifest["tables"].items()}
@@ -0,0 +1,500 @@
+"""流式读取 sqlite3 .dump 转储（data-export/*.sql），逐行产出带类型的值元组
+
+原来的转换脚本 f.read() 整个文件后用 re.findall(r"INSERT INTO \\w+ VALUES\\((.*?)\\);") 取出值，
+再 split(',') 按位置取列：备注里有一个逗号、一个 '' 转义或一个换行，后面的列就全部错位。
+这里按 SQL 字面量的语法切分：
+- '...' 字符串（'' 转义、跨行的值）、NULL、整数、实数、X'..' 二进制
+- 新版 sqlite3 为换行写出的 replace('..','\\n',char(10))、unistr('..')
+文件用 mmap 映射，处理过的页及时交还，内存与文件大小无关。
+大文件可以按语句边界切成若干段，在多个进程里并行解析（blocks(workers=N)），产出顺序与单进程相同。
+
+.dump 每条语句占一行，同一张表的 INSERT 连成一片。快速路径用 NumPy 一次处理一大块（_BLOCK_BYTES）：
+引号个数的奇偶（异或累积）标出哪些字节在字符串里，字符串外的换行是行尾、逗号是字段边界，
+整数按位向量化求值，实数整列交给 NumPy 解析，只有最终的值才变成 Python 对象。
+列数不对的行（用了 replace() 等带逗号的表达式）和不成形的语句改用逐个字面量解析的精确路径，
+两条路径的结果完全相同；没有安装 numpy 时全部走精确路径。
+实数与 Python 的 float() 一样正确舍入；SQLite 自己解析多位有效数字时偶尔差最后一位（ulp），
+这种值与装载进 SQLite 的结果不逐位相同。
+
+用法：
+    with DumpReader("data-export/sales_orders.sql") as reader:
+        for row in reader.rows():
+            ...
+"""
+import mmap
+import multiprocessing
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .schema import create_columns
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖，没有时只用精确路径
+    np = None
+
+# 快速路径一次处理的字节数
+_BLOCK_BYTES = 1 << 20
+# 处理过的映射页每攒够这么多字节交还一次
+_RELEASE_BYTES = 16 << 20
+# 多进程解析时每段的字节数：一段解析出的值整体留在内存里（最多 2 * workers 段）
+_RANGE_BYTES = 8 << 20
+# 快速路径按 int64 求值的最多位数，更长的整数和实数逐个转换
+_MAX_INT_DIGITS = 18
+_MAX_REAL_CHARS = 40
+
+_SPACE = re.compile(rb"\s*")
+_INSERT = re.compile(rb'INSERT\s+INTO\s+("(?:[^"]|"")+"|\w+)\s*VALUES\s*\(')
+_CREATE_TABLE = re.compile(rb'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?("(?:[^"]|"")+"|\w+)', re.I)
+# 其他语句：引号内的分号不算语句结束
+_STATEMENT = re.compile(rb"""(?:[^'";]+|'[^']*(?:''[^']*)*'|"[^"]*(?:""[^"]*)*")*;""")
+_LITERAL = re.compile(rb"""\s*(?:
+    '([^']*(?:''[^']*)*)'
+  | (NULL)\b
+  | ([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+  | [Xx]'([0-9A-Fa-f]*)'
+  | (\w+)\s*\(
+)""", re.X | re.I)
+_NEXT = re.compile(rb"\s*([,)])")
+_END = re.compile(rb"\s*;")
+_UNISTR = re.compile(r"\\(\\|[0-9A-Fa-f]{4}|u[0-9A-Fa-f]{4}|\+[0-9A-Fa-f]{6}|U[0-9A-Fa-f]{8})")
+
+
+def _identifier(raw):
+    name = raw.decode("utf-8")
+    return name[1:-1].replace('""', '"') if name.startswith('"') else name
+
+
+def _unistr(text):
+    """sqlite 的 unistr()：\\XXXX、\\uXXXX、\\+XXXXXX、\\UXXXXXXXX 和 \\\\"""
+    def code(match):
+        escape = match.group(1)
+        return "\\" if escape == "\\" else chr(int(escape.lstrip("uU+"), 16))
+    return _UNISTR.sub(code, text)
+
+
+_FUNCTIONS = {
+    "replace": lambda text, old, new: text.replace(old, new) if old else text,
+    "char": lambda *codes: "".join(map(chr, codes)),
+    "unistr": _unistr,
+}
+
+
+class DumpReader:
+    """sqlite3 .dump 转储文件的流式读取器
+
+    blocks() 按列产出 (表名, 列表的列表)，rows() 逐行产出元组，named_blocks() 按列名产出；
+    读到的 CREATE TABLE 语句按表名记在 create 中。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.create = {}
+        self._file = open(path, "rb")
+        try:
+            self.buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # 空文件不能映射
+            self.buffer = b""
+        self.size = len(self.buffer)
+        # 每张表的列数，由第一行精确解析得出，快速路径用来校验切分
+        self._widths = {}
+        self._names = {}
+        self._released = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        self.buffer = b""
+        self._file.close()
+
+    def rows(self, table=None, workers=1):
+        """逐行产出值元组；给出 table 时只产出这张表的行"""
+        for name, columns in self.blocks(table, workers):
+            yield from zip(*columns)
+
+    def named_blocks(self, table=None, workers=1):
+        """按块产出 (表名, {列名: 值列表})，列名取自转储里这张表的 CREATE TABLE"""
+        for name, columns in self.blocks(table, workers):
+            names = self.column_names(name)
+            if len(names) != len(columns):
+                raise ValueError(f"{self.path}: {name} 的 CREATE TABLE 有 {len(names)} 列，INSERT 给了 {len(columns)} 个值")
+            yield name, dict(zip(names, columns))
+
+    def column_names(self, table):
+        """转储中 table 的列名，按 INSERT 的值顺序"""
+        names = self._names.get(table)
+        if names is None:
+            if table not in self.create:
+                raise ValueError(f"{self.path}: 在 {table} 的 INSERT 之前没有它的 CREATE TABLE")
+            names = self._names[table] = [column[0] for column in create_columns(self.create[table], table)]
+        return names
+
+    def blocks(self, table=None, workers=1):
+        """按块产出 (表名, columns)，columns[i] 是这一块里第 i 列的值列表
+
+        workers > 1 时文件切成若干段（ranges()）交给进程池并行解析，再按文件顺序产出，结果与单进程相同。
+        """
+        if workers > 1 and self.size > _RANGE_BYTES:
+            yield from self._parallel_blocks(table, workers)
+            return
+        for name, columns in self._scan(0, self.size):
+            if table is None or name == table:
+                yield name, columns
+
+    def ranges(self, size=_RANGE_BYTES):
+        """把文件切成约 size 字节的段 [(start, end)]，段首对齐到 ";\n" 之后
+
+        .dump 每条语句占一行，";\n" 之后通常就是下一条语句的开头；字符串里也可能出现 ";\n"，
+        这样的段首由 _parallel_blocks 在合并时发现并改为顺序解析。
+        """
+        bounds = [0]
+        while bounds[-1] + size < self.size:
+            cut = self.buffer.find(b";\n", bounds[-1] + size)
+            if cut < 0:
+                break
+            bounds.append(cut + 2)
+        bounds.append(self.size)
+        return list(zip(bounds, bounds[1:]))
+
+    def _parallel_blocks(self, table, workers):
+        """各段在子进程里从段首解析到段内最后一条语句，主进程按顺序核对衔接后产出
+
+        第 k 段解析到的终点应当正好是第 k+1 段的起点；不相等说明第 k+1 段的段首落在了字符串里，
+        丢掉它的结果，从第 k 段的终点起在主进程里顺序解析这一段。
+        """
+        # 主进程里可能已有发送请求的线程，fork 会把它们持有的锁带进子进程，所以用 spawn（与 shards 相同）
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(workers, mp_context=context) as pool:
+            pending = deque()
+            pos = _SPACE.match(self.buffer, 0).end()
+            ranges = iter(self.ranges())
+            while True:
+                for start, end in ranges:
+                    pending.append((start, end, pool.submit(_scan_range, self.path, start, end, table)))
+                    if len(pending) >= 2 * workers:
+                        break
+                if not pending:
+                    return
+                start, end, future = pending.popleft()
+                result = future.result()
+                if result is not None and result[0] == pos:
+                    _, pos, blocks, create = result
+                    self.create.update(create)
+                    yield from blocks
+                    continue
+                if pos >= end:  # 上一段的最后一条语句已经越过了这一段
+                    continue
+                scan = self._scan(pos, end)
+                while True:
+                    try:
+                        name, columns = next(scan)
+                    except StopIteration as done:
+                        pos = done.value
+                        break
+                    if table is None or name == table:
+                        yield name, columns
+
+    def _scan(self, pos, end):
+        """从语句开头 pos 起解析到 end 之前开始的最后一条语句，返回之后下一条语句的位置"""
+        buf = self.buffer
+        while True:
+            pos = _SPACE.match(buf, pos).end()
+            if pos >= end:
+                return pos
+            self._release(pos)
+            insert = _INSERT.match(buf, pos)
+            if insert is None:
+                pos = self._other_statement(pos)
+                continue
+            table = _identifier(insert.group(1))
+            if table in self._widths:
+                run = yield from self._insert_run(table, insert, end)
+                if run is not None:
+                    pos = run
+                    continue
+            row, pos = self._insert_values(insert.end())
+            self._widths[table] = len(row)
+            yield table, [[value] for value in row]
+
+    def _other_statement(self, pos):
+        match = _STATEMENT.match(self.buffer, pos)
+        if match is None or match.end() == pos:
+            raise ValueError(f"{self.path}: 第 {pos} 字节处的语句不完整")
+        create = _CREATE_TABLE.match(self.buffer, pos)
+        if create:
+            self.create[_identifier(create.group(1))] = match.group(0)[:-1].decode("utf-8")
+        return match.end()
+
+    def _insert_values(self, pos):
+        """精确路径：从 VALUES( 之后逐个字面量解析一条 INSERT，返回 (值元组, 语句结束的位置)"""
+        try:
+            values, pos = parse_values(self.buffer, pos)
+        except ValueError as error:
+            raise ValueError(f"{self.path}: {error}") from None
+        end = _END.match(self.buffer, pos)
+        if end is None:
+            raise ValueError(f"{self.path}: 第 {pos} 字节处的 INSERT 缺少分号")
+        return tuple(values), end.end()
+
+    def _insert_run(self, table, insert, end):
+        """快速路径：一次处理从 insert 起连续的同表 INSERT，产出 (表名, columns)，返回下一条语句的位置
+
+        列数不对的行用精确路径逐条解析；第一行就不能走快速路径时什么也不产出，返回 None。
+        """
+        buf = self.buffer
+        prefix = bytes(buf[insert.start():insert.end()])
+        if np is None or any(char in prefix for char in b"',\n"):
+            return None
+        start = insert.end()
+        block = _Block(buf[start:min(start + _BLOCK_BYTES, end)], prefix)
+        if block.rows == 0:
+            return None
+        width = self._widths[table]
+        lo, hi = block.commas_per_row()
+        good = hi - lo == width - 1
+        # 列数不对的行先逐条交给精确路径，它应当正好在块内算出的行尾结束，否则块在这一行截止
+        limit, resume, exact = block.rows, None, []
+        for index in np.flatnonzero(~good).tolist():
+            row, pos = self._insert_values(start + int(block.body_start[index]))
+            if len(row) != width:
+                raise ValueError(f"{self.path}: {table} 有 {width} 列，第 {start + int(block.body_start[index])} "
+                                 f"字节处的 INSERT 给了 {len(row)} 个值")
+            exact.append(row)
+            if pos != start + int(block.body_end[index]) + 2:
+                limit, resume = index + 1, pos
+                break
+        # 其余的行一次转换，再把精确路径的行按原来的位置插回去
+        chosen = np.flatnonzero(good[:limit])
+        columns = block.columns(chosen, lo[chosen], width)
+        if exact:
+            bad = np.flatnonzero(~good[:limit])
+            merged = []
+            for column, values in zip(columns, zip(*exact)):
+                out = np.empty(limit, dtype=object)
+                out[chosen] = column
+                out[bad] = values
+                merged.append(out.tolist())
+            columns = merged
+        yield table, columns
+        return resume if resume is not None else start + int(block.body_end[block.rows - 1]) + 3
+
+    def _release(self, pos):
+        """把 pos 之前已处理的映射页交还给系统"""
+        if pos - self._released >= _RELEASE_BYTES and hasattr(mmap, "MADV_DONTNEED") \
+                and isinstance(self.buffer, mmap.mmap):
+            start = self._released - self._released % mmap.PAGESIZE
+            stop = pos - pos % mmap.PAGESIZE
+            self.buffer.madvise(mmap.MADV_DONTNEED, start, stop - start)
+            self._released = stop
+
+
+def _scan_range(path, start, end, table):
+    """子进程：解析从 start 起、在 end 之前开始的语句，返回 (起点, 终点, blocks, create)
+
+    起点是跳过空白后的第一条语句，终点是 _scan 返回的下一条语句的位置；
+    start 不在语句开头（落在字符串里）而解析出错时返回 None。
+    """
+    with DumpReader(path) as reader:
+        reader._released = start
+        begin = _SPACE.match(reader.buffer, start).end()
+        blocks = []
+        scan = reader._scan(start, end)
+        try:
+            while True:
+                name, columns = next(scan)
+                if table is None or name == table:
+                    blocks.append((name, columns))
+        except StopIteration as done:
+            return begin, done.value, blocks, reader.create
+        except ValueError:
+            return None
+
+
+def parse_values(buf, pos):
+    """从 pos 起解析逗号分隔的值直到配对的右括号，返回 (值列表, 右括号之后的位置)"""
+    values = []
+    while True:
+        match = _LITERAL.match(buf, pos)
+        if match is None:
+            raise ValueError(f"第 {pos} 字节处不是合法的值：{bytes(buf[pos:pos + 40])!r}")
+        text, null, number, blob, function = match.groups()
+        pos = match.end()
+        if text is not None:
+            value = text.replace(b"''", b"'").decode("utf-8")
+        elif null is not None:
+            value = None
+        elif number is not None:
+            value = int(number) if number.lstrip(b"+-").isdigit() else float(number)
+        elif blob is not None:
+            value = bytes.fromhex(blob.decode("ascii"))
+        else:
+            name = function.decode("ascii").lower()
+            if name not in _FUNCTIONS:
+                raise ValueError(f"第 {match.start(5)} 字节处是不支持的函数 {name}()")
+            arguments, pos = parse_values(buf, pos)
+            value = _FUNCTIONS[name](*arguments)
+        values.append(value)
+        separator = _NEXT.match(buf, pos)
+        if separator is None:
+            raise ValueError(f"第 {pos} 字节处缺少逗号或右括号")
+        pos = separator.end()
+        if separator.group(1) == b")":
+            return values, pos
+
+
+class _Block:
+    """快速路径的一块：从一行的值开头起的一段字节，按字符串外的换行切成完整的行
+
+    body_start[i]、body_end[i] 是第 i 行值列表的字节范围（body_end 处是 ");\\n"）；
+    只收到下一行不再是同一前缀的 INSERT、或字符串外的换行前面不是 ");" 为止。
+    """
+
+    def __init__(self, data, prefix):
+        self.data = data
+        self.a = a = np.frombuffer(data, dtype=np.uint8)
+        # 到每个字节为止的引号个数为奇数 → 在字符串里（'' 转义是一对，不影响）
+        self.inside = np.logical_xor.accumulate(a == 39)
+        newlines = np.flatnonzero((a == 10) & ~self.inside)
+        newlines = newlines[newlines >= 2]
+        ends = (a[newlines - 2] == 41) & (a[newlines - 1] == 59)
+        size = len(prefix)
+        follows = np.zeros(len(newlines), dtype=bool)
+        room = newlines + 1 + size <= len(a)
+        if room.any():
+            window = a[newlines[room, None] + 1 + np.arange(size)]
+            follows[room] = (window == np.frombuffer(prefix, dtype=np.uint8)).all(axis=1)
+        # 第 k 行在 newlines[k] 处结束；下一行不是同表 INSERT 或第 k 行没有以 ");" 结尾时到此为止
+        stops = np.flatnonzero(~(ends & follows))
+        rows = int(stops[0]) + 1 if len(stops) else len(newlines)
+        if rows and not ends[rows - 1]:
+            rows -= 1
+        self.rows = rows
+        self.body_start = np.concatenate(([0], newlines[:rows - 1] + 1 + size)) if rows else newlines[:0]
+        self.body_end = newlines[:rows] - 2
+        self._escaped = b"''" in data
+
+    def commas_per_row(self):
+        """每行字段分隔逗号在 commas 中的下标范围 [lo, hi)"""
+        limit = int(self.body_end[-1])
+        a = self.a[:limit]
+        self.commas = np.flatnonzero((a == 44) & ~self.inside[:limit])
+        return np.searchsorted(self.commas, self.body_start), np.searchsorted(self.commas, self.body_end)
+
+    def columns(self, rows, lo, width):
+        """选出的行（下标数组，列数都正确）按列转换成 Python 值列表"""
+        body_start, body_end = self.body_start[rows], self.body_end[rows]
+        commas = self.commas[lo[:, None] + np.arange(width - 1)]
+        starts = np.column_stack((body_start, commas + 1))
+        ends = np.column_stack((commas, body_end))
+        return [self._convert(starts[:, column], ends[:, column]) for column in range(width)]
+
+    def _convert(self, starts, ends):
+        """一列字段（字节范围 [starts, ends)）→ Python 值列表"""
+        a = self.a
+        first = a[starts]
+        length = ends - starts
+        is_text = (first == 39) & (a[np.maximum(ends - 1, 0)] == 39) & (length >= 2)
+        if is_text.all():
+            return self._texts(starts + 1, ends - 1)
+        rest = ~is_text & (length > 0)
+        is_int = rest & (length <= _MAX_INT_DIGITS + 1) & _NUMBER_START[first]
+        if is_int.any():
+            ints, is_int[is_int] = self._ints(starts[is_int], ends[is_int])
+            if is_int.all():
+                return ints.tolist()
+
+        values = np.empty(len(starts), dtype=object)
+        if is_int.any():
+            values[is_int] = ints.tolist()
+        if is_text.any():
+            values[is_text] = self._texts(starts[is_text] + 1, ends[is_text] - 1)
+        rest &= ~is_int
+        null = rest & (length == 4)
+        if null.any():
+            at = starts[null]
+            null[null] = (a[at] == 78) & (a[at + 1] == 85) & (a[at + 2] == 76) & (a[at + 3] == 76)
+        rest &= ~null
+        # 实数：含小数点或指数的数字字段，交给 NumPy 解析（与 float() 结果相同）
+        is_real = rest & (length <= _MAX_REAL_CHARS) & _NUMBER_START[first]
+        if is_real.any():
+            matrix = self._matrix(starts[is_real], ends[is_real])
+            point = ((matrix == 46) | (matrix == 101) | (matrix == 69)).any(axis=1)
+            is_real[is_real] = point
+            try:
+                values[is_real] = matrix[point].view(f"S{matrix.shape[1]}").ravel().astype(np.float64).tolist()
+            except ValueError:  # 形如 1e 的字段，逐个转换时报错
+                is_real[:] = False
+            rest &= ~is_real
+        if rest.any():
+            values[rest] = [_literal(text) for text in self._texts(starts[rest], ends[rest], raw=True)]
+        return values.tolist()
+
+    def _ints(self, starts, ends):
+        """候选字段按整数求值，返回 (确实是不超过 18 位整数的那些字段的 int64 数组, 是否是这样的整数)
+
+        按位数分组，每组是一个 (字段数, 位数) 的矩阵，点乘 10 的幂次求值。
+        """
+        a = self.a
+        negative = a[starts] == 45
+        digits = ends - starts - (negative | (a[starts] == 43))
+        ok = np.zeros(len(starts), dtype=bool)
+        result = np.zeros(len(starts), dtype=np.int64)
+        for count in np.unique(digits).tolist():
+            if not 0 < count <= _MAX_INT_DIGITS:
+                continue
+            group = np.flatnonzero(digits == count)
+            matrix = a[ends[group, None] - count + np.arange(count)] - np.uint8(48)
+            valid = (matrix < 10).all(axis=1)
+            ok[group] = valid
+            result[group] = matrix.astype(np.int64) @ _POWERS[count - 1::-1]
+        result[negative] = -result[negative]
+        return result[ok], ok
+
+    def _matrix(self, starts, ends):
+        """字段拷成每行一个字段的 uint8 矩阵，右侧补 0（按 S 类型看时会被去掉）"""
+        places = np.arange(int((ends - starts).max()))
+        valid = places < (ends - starts)[:, None]
+        return np.where(valid, self.a[np.where(valid, starts[:, None] + places, 0)], 0).astype(np.uint8)
+
+    def _texts(self, starts, ends, raw=False):
+        """字节范围 → str 列表；raw 为假时把 '' 还原成 '"""
+        data = self.data
+        texts = [data[start:end].decode("utf-8") for start, end in zip(starts.tolist(), ends.tolist())]
+        if not raw and self._escaped:
+            texts = [value.replace("''", "'") for value in texts]
+        return texts
+
+
+def _byte_table(chars):
+    table = np.zeros(256, dtype=bool)
+    table[list(chars)] = True
+    return table
+
+
+if np is not None:
+    # 可能是数字的首字节
+    _NUMBER_START = _byte_table(b"0123456789+-.")
+    _POWERS = 10 ** np.arange(_MAX_INT_DIGITS + 1, dtype=np.int64)
+
+
+def _literal(text):
+    """单个字面量文本 → Python 值（快速路径里不是字符串、整数、实数、NULL 的字段）"""
+    text = text.strip()
+    if text.startswith("'") and text.endswith("'"):
+        return text[1:-1].replace("''", "'")
+    if text == "NULL":
+        return None
+    if text.lstrip("+-").isdigit():
+        return int(text)
+    try:
+        return float(text)
+    except ValueError:
+        # X'..'、unistr('..') 等，交给精确路径
+        return parse_values((text + ")").encode("utf-8"), 0)[0][0]
@@ -0,0 +1,241 @@
+"""离线造数：批次写成 gzip 压缩的 SQL 转储文件，格式与 data-export/*.sql 相同
+
+data-export/ 下是 sqlite3 .dump 的输出，每张表一个文件：
+    PRAGMA foreign_keys=OFF;
+    BEGIN TRANSACTION;
+    CREATE TABLE sales_orders (...);
+    INSERT INTO sales_orders VALUES(1,'SO-...',...);
+    COMMIT;
+migrate-real-data.sh、convert-data-format.py 都按这个格式读取。这里把生成的批次按表写成
+<表名>.sql.gz，边生成边压缩写出，内存与行数无关；之后用
+    gunzip -c dump/*.sql.gz | sqlite3 wms.db
+以 sqlite3 的原生速度装载，不必再经 API 重新生成。生成中途出错时不写 COMMIT，写了一半的文件会被删掉。
+
+INSERT 按表的全部列依次给值（与 .dump 一致）：批次没有给出的列写列默认值
+（CURRENT_TIMESTAMP 取打开转储时的时间，传了 now 时固定取 now，同一种子两次生成的转储相同），没有给出的自增主键写 NULL，装载时由 SQLite 分配。
+表结构取自 init.ts（见 schema.init_statements），转储假定装载到没有这些表的新库中。
+
+--dump（和 SqliteSink 的 --sqlite）只有按 Python 值生成批次的脚本支持：generate-million-revenue-data.py、
+generate-massive-demo-data.py、create-investor-grade-data.py、scale-to-million.py、generate-scenario-data.py
+（convert-data-format.py 另有 --sqlite）。generate-correct-orders.py、create-demo-data.py、
+final-investor-demo.py 的行是带 datetime('now') 的 SQL 文本、主数据用 INSERT OR REPLACE，
+create-orders-via-api.py 经业务接口建单，这些只能经 API 导入。
+"""
+import gzip
+import os
+import sqlite3
+import time
+
+from .orders import Product
+from .schema import init_statements, pinned_default
+
+DEFAULT_COMPRESSLEVEL = 6
+
+DUMP_HEADER = "PRAGMA foreign_keys=OFF;\nBEGIN TRANSACTION;\n"
+DUMP_FOOTER = "COMMIT;\n"
+
+
+def dump_literal(value):
+    """按 sqlite3 .dump 的写法渲染一个值
+
+    整数值的浮点数写成整数（DECIMAL 列按 NUMERIC 亲和性存成整数，.dump 也是这样输出的），
+    含换行的文本用 replace(...,'\\n',char(10)) 写在一行内，按行处理转储的脚本不会被截断。
+    """
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        return str(int(value)) if value.is_integer() else repr(value)
+    if isinstance(value, bytes):
+        return f"X'{value.hex().upper()}'"
+    text = str(value).replace("'", "''")
+    replaced = []
+    for char, name, code in (("\r", "r", 13), ("\n", "n", 10)):
+        if char in text:
+            token = _escape_token(text, name)
+            text = text.replace(char, token)
+            replaced.append((token, code))
+    text = f"'{text}'"
+    for token, code in replaced:
+        text = f"replace({text},'{token}',char({code}))"
+    return text
+
+
+def _escape_token(text, name):
+    """文本中没有出现过的转义记号：\\n，被占用时换成 \\n1、\\n2……（与 .dump 的做法类似）"""
+    token = "\\" + name
+    suffix = 0
+    while token in text:
+        suffix += 1
+        token = f"\\{name}{suffix}"
+    return token
+
+
+class DumpSink:
+    """把 InsertBatch 写成按表分文件、gzip 压缩的 SQL 转储（接口与 SqliteSink 相同）
+
+    now 不为空时，取当前时间的列默认值（created_at、updated_at 等）固定写成 now。
+
+    用法：
+        with DumpSink("dump") as sink:
+            sink.import_all(batches)
+    """
+
+    def __init__(self, directory, compresslevel=DEFAULT_COMPRESSLEVEL, verbose=True, now=None):
+        self.directory = directory
+        self.now = now
+        self.path = directory
+        self.compresslevel = compresslevel
+        self.verbose = verbose
+        self.rows = {}
+        self.transactions = 0
+        self.started = time.perf_counter()
+        self._files = {}
+        self._layouts = {}
+        self._next_ids = {}
+        os.makedirs(directory, exist_ok=True)
+
+        # 在内存库里按 init.ts 建表，取出建表语句、列和默认值
+        self._schema = sqlite3.connect(":memory:")
+        for sql in init_statements():
+            self._schema.execute(sql)
+        self._create = dict(self._schema.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'table' AND name != 'sqlite_sequence'"))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(complete=exc_type is None)
+
+    def _file(self, table):
+        """表的转储文件，第一次写入时创建并写好文件头和建表语句"""
+        f = self._files.get(table)
+        if f is None:
+            if table not in self._create:
+                raise ValueError(f"init.ts 中没有表 {table}")
+            path = os.path.join(self.directory, f"{table}.sql.gz")
+            f = gzip.open(path, "wt", compresslevel=self.compresslevel, encoding="utf-8", newline="\n")
+            f.write(DUMP_HEADER)
+            f.write(self._create[table] + ";\n")
+            self._files[table] = f
+        return f
+
+    def _layout(self, batch):
+        """表的每一列取批次中的第几列，或者一个固定的默认值字面量"""
+        key = (batch.table, batch.columns)
+        layout = self._layouts.get(key)
+        if layout is None:
+            positions = {name: index for index, name in enumerate(batch.column_names)}
+            table_info = self._schema.execute(f"PRAGMA table_info({batch.table})").fetchall()
+            unknown = set(positions) - {column[1] for column in table_info}
+            if unknown:
+                raise ValueError(f"{batch.table} 没有这些列：{', '.join(sorted(unknown))}")
+            layout = []
+            for _, name, _, _, default, pk in table_info:
+                if name in positions:
+                    layout.append(positions[name])
+                elif pk or default is None:
+                    layout.append("NULL")
+                elif pinned_default(default, self.now) is not None:
+                    layout.append(dump_literal(pinned_default(default, self.now)))
+                else:
+                    layout.append(dump_literal(self._schema.execute(f"SELECT {default}").fetchone()[0]))
+            self._layouts[key] = layout
+        return layout
+
+    def _insert(self, batch):
+        if not batch.typed:
+            raise ValueError(f"{batch.label} 的行是 SQL 字符串，不能写成转储")
+        f = self._file(batch.table)
+        if batch.replace:
+            # 替换整表：转储里这张表之前写出的行装载时一并删掉
+            f.write(f"DELETE FROM {batch.table};\n")
+            self.rows[batch.table] = 0
+        layout = self._layout(batch)
+        prefix = f"INSERT INTO {batch.table} VALUES("
+        lines = []
+        for row in batch.values:
+            values = [dump_literal(row[source]) if isinstance(source, int) else source for source in layout]
+            lines.append(prefix + ",".join(values) + ");\n")
+        f.write("".join(lines))
+        self.rows[batch.table] = self.rows.get(batch.table, 0) + len(batch.values)
+
+    def write_shard(self, batches):
+        """写入一个分片的全部批次，返回写入的行数"""
+        count = 0
+        for batch in batches:
+            if batch.values:
+                self._insert(batch)
+                count += len(batch.values)
+        self.transactions += 1
+        return count
+
+    def import_all(self, batches):
+        """写入一个批次迭代器（与 BulkImporter.import_all 对应）"""
+        for batch in batches:
+            if batch.values:
+                self._insert(batch)
+        if self.verbose:
+            print(f"🗜️ 已写入 {self.directory}/：{self.summary()}")
+
+    def allocate_ids(self, table_name, count):
+        """在转储内部连续分配主键，返回 (start, end)；从 init.ts 默认数据之后开始编号"""
+        start = self._next_ids.get(table_name)
+        if start is None:
+            start = self._schema.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table_name}").fetchone()[0]
+        self._next_ids[table_name] = start + count
+        return start, start + count - 1
+
+    def catalog(self):
+        """init.ts 默认数据中售价和进价都大于 0 的商品（转储装载到新库时商品表就是这些）"""
+        return [Product(*row) for row in self._schema.execute(
+            "SELECT id, sale_price, purchase_price FROM items "
+            "WHERE sale_price > 0 AND purchase_price > 0 ORDER BY id")]
+
+    def inventory(self):
+        """init.ts 默认数据中的库存（转储装载到新库时的期初库存）"""
+        return self._schema.execute(
+            "SELECT item_id, warehouse_id, quantity, avg_cost FROM inventory ORDER BY item_id, warehouse_id").fetchall()
+
+    def clear(self, table):
+        """转储装载到新库，没有需要清掉的旧数据；后端启动时 init.ts 的默认库存遇到唯一约束会被 INSERT OR IGNORE 跳过"""
+
+    def get_stats(self):
+        """各表写入的行数"""
+        return dict(self.rows)
+
+    def summary(self):
+        total = sum(self.rows.values())
+        elapsed = time.perf_counter() - self.started
+        rate = total / elapsed if elapsed > 0 else 0
+        return f"{total:,} 行，{len(self.rows)} 张表，耗时 {elapsed:.1f}s，{rate:,.0f} 行/s"
+
+    def close(self, complete=True):
+        """给每个转储文件写上 COMMIT 并关闭
+
+        complete 为假（生成中途出错）时不写 COMMIT，并删掉写了一半的转储文件：
+        否则截断的转储以 COMMIT 结尾，装载时看起来和完整的一样。
+        """
+        if self._schema is None:
+            return
+        for f in self._files.values():
+            if complete:
+                f.write(DUMP_FOOTER)
+            f.close()
+        self._schema.close()
+        self._schema = None
+        if not complete:
+            for table in self._files:
+                os.remove(os.path.join(self.directory, f"{table}.sql.gz"))
+            if self.verbose and self._files:
+                print(f"🗑️ 生成中途出错，已删除 {self.directory}/ 下写了一半的 {len(self._files)} 个转储文件")
+            return
+        if self.verbose and self._files:
+            size = sum(os.path.getsize(os.path.join(self.directory, f"{table}.sql.gz"))
+                       for table in self._files) / 1024 / 1024
+            print(f"🗜️ {len(self._files)} 个转储文件共 {size:.1f} MB："
+                  f"gunzip -c {self.directory}/*.sql.gz | sqlite3 wms.db")
@@ -0,0 +1,250 @@
+"""基于 asyncio 的批量导入引擎
+
+生成器产出的批次先进入有界队列，再由 N 个并发发送者调用 /api/data-import/import。
+- concurrency 是同时在途请求数的上限，queue_size 控制生成领先发送的批次数（背压）
+- 客户端配置了 AIMD 限速器时，实际并发和速率由限速器在上限内自动调整
+- 有外键依赖的表（如 sales_order_items → sales_orders）会等待在它之前入队的父表批次全部提交后再发送
+- 传入 SeedJournal 时，已提交的批次会被跳过，部分提交的批次只重发临时错误拒绝的行，
+  新提交的批次写入日志，支持断点续跑
+- 设置 envelope_bytes 时，相邻批次（可跨表）打包成信封走 /api/data-import/bulk，
+  每个信封在服务器上只提交一次事务；columnar=True 时信封编码为列式 MessagePack
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .bulk import pack_envelopes
+from .client import get_client
+from .retry import BatchSender, RejectLog
+from .schema import FOREIGN_KEYS
+
+
+def sql_literal(value):
+    """把 Python 值渲染成 SQL 字面量"""
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    text = str(value).replace("'", "''")
+    return f"'{text}'"
+
+
+def sql_tuple(row):
+    return "(" + ", ".join(sql_literal(value) for value in row) + ")"
+
+
+class InsertBatch:
+    """同一张表的一批 INSERT 行
+
+    values 中每一项是一行数据：可以是已经格式化好的 SQL 元组字符串，例如 "('SO-1', 1, 2)"，
+    也可以是 Python 值的元组，例如 ('SO-1', 1, 2)。只有元组形式的批次能走
+    /data-import/bulk 的预编译语句。
+    offset 是这批行在原始批次中的起始位置（二分重发时用于定位出错行）。
+    replace 为真时这批行替换整张表：导入目标先删掉表中原有的行，删除和插入在同一个事务里提交。
+    """
+
+    def __init__(self, table, columns, values, label=None, offset=0, replace=False):
+        self.table = table
+        self.columns = columns
+        self.values = values
+        self.label = label or table
+        self.offset = offset
+        self.replace = replace
+
+    def __len__(self):
+        return len(self.values)
+
+    def slice(self, start, end):
+        """取其中 [start, end) 的行组成新批次（只有从头开始的切片保留 replace）"""
+        return InsertBatch(self.table, self.columns, self.values[start:end],
+                           label=self.label, offset=self.offset + start, replace=self.replace and start == 0)
+
+    @property
+    def column_names(self):
+        return [name.strip() for name in self.columns.split(",")]
+
+    @property
+    def typed(self):
+        """是否全部是 Python 值元组（而不是 SQL 字符串）"""
+        return not any(isinstance(value, str) for value in self.values)
+
+    def to_sql(self):
+        rows = ", ".join(value if isinstance(value, str) else sql_tuple(value)
+                         for value in self.values)
+        return f"INSERT INTO {self.table} ({self.columns}) VALUES {rows};"
+
+    def payload(self):
+        """/data-import/bulk 信封中这批行的表示"""
+        if not self.typed:
+            raise ValueError(f"{self.label} 的行是 SQL 字符串，不能走预编译语句批量导入")
+        payload = {
+            "tableName": self.table,
+            "columns": self.column_names,
+            "rows": [list(value) for value in self.values],
+        }
+        if self.replace:
+            payload["replace"] = True
+        return payload
+
+
+class ImportStats:
+    """一次导入运行的统计"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.batches = 0
+        self.transactions = 0
+        self.skipped_batches = 0
+        self.failed_batches = 0
+        self.retryable_batches = 0
+        self.rejected_rows = 0
+        self.rows = {}
+
+    def record(self, batch, result):
+        self.batches += 1
+        self.transactions += result.commits
+        self.rows[batch.table] = self.rows.get(batch.table, 0) + result.committed
+        if not result.ok:
+            self.failed_batches += 1
+            self.rejected_rows += result.rejected
+        if result.retryable:
+            self.retryable_batches += 1
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def total_rows(self):
+        return sum(self.rows.values())
+
+    def summary(self):
+        rate = self.batches / self.elapsed if self.elapsed > 0 else 0
+        skipped = f"，续跑跳过 {self.skipped_batches} 批" if self.skipped_batches else ""
+        return (f"{self.batches} 批（含拒绝行 {self.failed_batches}），{self.total_rows:,} 行，"
+                f"拒绝 {self.rejected_rows:,} 行，{self.transactions} 次事务，"
+                f"耗时 {self.elapsed:.1f}s，{rate:.1f} 批/s{skipped}")
+
+
+class BulkImporter:
+    """有界并发的批量导入器"""
+
+    def __init__(self, client=None, concurrency=4, queue_size=None,
+                 foreign_keys=FOREIGN_KEYS, reject_file=None, journal=None,
+                 envelope_bytes=None, columnar=False, verbose=True):
+        self.client = client or get_client()
+        self.journal = journal
+        self.envelope_bytes = envelope_bytes
+        self.concurrency = max(1, concurrency)
+        self.queue_size = queue_size or self.concurrency * 2
+        self.foreign_keys = foreign_keys
+        self.verbose = verbose
+        self.client.resize_pool(self.concurrency)
+        if self.client.controller is not None:
+            self.client.controller.max_concurrency = self.concurrency
+        reject_log = RejectLog(reject_file) if reject_file else None
+        self.sender = BatchSender(self.client, reject_log=reject_log, columnar=columnar)
+
+    def import_all(self, batches):
+        """同步入口：导入一个批次迭代器，返回 ImportStats"""
+        return asyncio.run(self.run(batches))
+
+    async def run(self, batches):
+        stats = ImportStats()
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        # 每张表尚未完成的批次序号，用来保证父表批次先于子表批次提交
+        pending = {}
+        committed = asyncio.Condition()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            senders = [
+                asyncio.create_task(self._sender(queue, pending, committed, executor, stats))
+                for _ in range(self.concurrency)
+            ]
+
+            # 队列中的每一项是一组 (序号, 批次)：逐批导入时只有一个，信封模式下是整个信封
+            numbered = self._numbered(batches, stats)
+            if self.envelope_bytes:
+                units = (envelope.items for envelope in pack_envelopes(numbered, self.envelope_bytes))
+            else:
+                units = ([item] for item in numbered)
+
+            for unit in units:
+                for seq, batch in unit:
+                    pending.setdefault(batch.table, set()).add(seq)
+                await queue.put(unit)
+
+            for _ in senders:
+                await queue.put(None)
+            await asyncio.gather(*senders)
+
+        stats.finished = time.perf_counter()
+        if self.verbose:
+            print(f"📦 导入完成：{stats.summary()}")
+            if stats.rejected_rows:
+                print(f"⚠️ 被拒绝的行已写入 {self.sender.reject_log.path}")
+        return stats
+
+    def _numbered(self, batches, stats):
+        """给非空批次编号，跳过日志中已提交的批次，部分提交的只保留待重发的行"""
+        seq = -1
+        for batch in batches:
+            if not batch.values:
+                continue
+            seq += 1
+            if self.journal is not None:
+                batch = self.journal.unsent(seq, batch)
+                if batch is None:
+                    stats.skipped_batches += 1
+                    continue
+            yield seq, batch
+
+    def _parents_done(self, pending, table, seq):
+        for parent in self.foreign_keys.get(table, []):
+            if any(s < seq for s in pending.get(parent, ())):
+                return False
+        return True
+
+    async def _sender(self, queue, pending, committed, executor, stats):
+        loop = asyncio.get_running_loop()
+        while True:
+            unit = await queue.get()
+            if unit is None:
+                return
+            # 信封内的父表批次与子表批次在同一事务里按顺序插入，只需等待信封之前的父表批次
+            first_seq = unit[0][0]
+
+            async with committed:
+                await committed.wait_for(lambda: all(
+                    self._parents_done(pending, batch.table, first_seq) for _, batch in unit))
+
+            results = await loop.run_in_executor(executor, self._send, unit)
+            for (seq, batch), result in zip(unit, results):
+                stats.record(batch, result)
+                if self.journal is not None:
+                    self.journal.record(seq, batch, result)
+
+            async with committed:
+                for seq, batch in unit:
+                    pending[batch.table].discard(seq)
+                committed.notify_all()
+
+    def _send(self, unit):
+        batches = [batch for _, batch in unit]
+        if self.envelope_bytes:
+            results = self.sender.send_envelope(batches)
+        else:
+            results = [self.sender.send(batches[0])]
+        if self.verbose:
+            for batch, result in zip(batches, results):
+                if result.ok:
+                    print(f"✅ {batch.label} 成功")
+                elif result.committed:
+                    print(f"⚠️ {batch.label} 部分成功：{result.committed}/{len(batch)} 行，"
+                          f"{result.rejected} 行写入拒绝文件")
+                else:
+                    print(f"❌ {batch.label} 失败：{result.rejected} 行写入拒绝文件")
+        return results
@@ -0,0 +1,297 @@
+"""由生成的采购入库和销售出库推导库存流水与期末库存
+
+complete-inventory-fix.py 等脚本给每个商品每个仓库随机填 20-100 件库存，与订单毫无关系，
+进销存报表、库存周转报表因此对不上。这里在生成订单的批次流上做一个旁路：
+- track() 原样转发批次，顺带把已完成订单的表头（仓库、日期）和明细（商品、出入库数量、成本）
+  记成紧凑的 NumPy 列，不改变原来的生成和发送
+- batches() 按 (商品, 仓库) 排序后用分组累加求出每笔出入库后的结存；
+  结存会变成负数的地方在那笔出库之前插入补货采购单，补货量按 lot_size 取整，整体仍是向量化计算
+- 依次产出补货采购单及明细、inventory_transactions（入库为正、出库为负，与后端写法一致）
+  和期末 inventory（数量 = 期初 + 流水之和，平均成本按入库加权）
+
+opening 是期初库存 [(item_id, warehouse_id, quantity, avg_cost)]，只作为结存的起点，不再产出流水。
+inventory 有 (item_id, warehouse_id) 唯一约束，期末库存批次标为 replace：导入目标在插入它的同一个事务里
+先删掉原有库存，之前生成或发送出错时原有库存不受影响。
+
+用法：
+    ledger = InventoryLedger(opening)
+    yield from ledger.track(order_batches(...))
+    yield from ledger.batches(IdRange("purchase_orders", client=sink))
+"""
+from datetime import datetime
+
+from .client import get_client
+from .importer import InsertBatch
+from .orders import Product, order_batches, purchase_order
+from .vectorized import np, require_numpy
+
+TRANSACTION_COLUMNS = [
+    "item_id", "warehouse_id", "transaction_type", "reference_no", "reference_type", "quantity",
+    "unit_cost", "transaction_date", "remarks",
+]
+INVENTORY_COLUMNS = [
+    "item_id", "warehouse_id", "quantity", "available_quantity", "reserved_quantity", "avg_cost", "last_updated",
+]
+
+DEFAULT_LOT_SIZE = 20
+DEFAULT_SUPPLIER_ID = 1
+TRANSACTION_BATCH_SIZE = 5000
+REPLENISH_BATCH_SIZE = 50
+# 表头、明细攒够这么多行再转成 NumPy 数组
+_FLUSH_ROWS = 65536
+# 同一时刻先入库后出库
+_IN, _OUT = 0, 1
+
+
+def fetch_inventory(client=None):
+    """读取 /inventory 的现有库存，返回 [(item_id, warehouse_id, quantity, avg_cost)]，作为推导的期初"""
+    client = client or get_client()
+    response = client.get("/inventory")
+    if response.status_code != 200:
+        raise RuntimeError(f"获取库存失败: {response.text}")
+    return [(row["item_id"], row["warehouse_id"], row.get("quantity") or 0, row.get("avg_cost") or 0)
+            for row in response.json()]
+
+
+class _Columns:
+    """按列追加、定期压成 NumPy 数组的缓冲区"""
+
+    def __init__(self, dtypes):
+        self.dtypes = dtypes
+        self.pending = [[] for _ in dtypes]
+        self.chunks = [[] for _ in dtypes]
+
+    def append(self, values):
+        for column, value in zip(self.pending, values):
+            column.append(value)
+        if len(self.pending[0]) >= _FLUSH_ROWS:
+            self.flush()
+
+    def flush(self):
+        if self.pending[0]:
+            for chunks, column, dtype in zip(self.chunks, self.pending, self.dtypes):
+                chunks.append(np.asarray(column, dtype=dtype))
+            self.pending = [[] for _ in self.dtypes]
+
+    def arrays(self):
+        self.flush()
+        return [np.concatenate(chunks) if chunks else np.zeros(0, dtype=dtype)
+                for chunks, dtype in zip(self.chunks, self.dtypes)]
+
+
+class InventoryLedger:
+    """从订单批次流推导库存流水和期末库存"""
+
+    # 表 → (订单类型, 明细表, 明细中的出入库数量列, 明细中的单位成本列)
+    ORDER_KINDS = {
+        "purchase_orders": (_IN, "purchase_order_items", "received_quantity", "unit_price"),
+        "sales_orders": (_OUT, "sales_order_items", "delivered_quantity", "unit_cost"),
+    }
+
+    def __init__(self, opening=(), lot_size=DEFAULT_LOT_SIZE, supplier_id=DEFAULT_SUPPLIER_ID):
+        require_numpy()
+        self.opening = list(opening)
+        self.lot_size = max(1, lot_size)
+        self.supplier_id = supplier_id
+        self.replenishments = 0
+        self._headers = {kind: _Columns([np.int64, np.int64, "datetime64[s]"])
+                         for kind, *_ in self.ORDER_KINDS.values()}
+        self._lines = {kind: _Columns([np.int64, np.int64, np.int64, np.float64])
+                       for kind, *_ in self.ORDER_KINDS.values()}
+        self._item_tables = {item_table: (kind, quantity, cost)
+                             for kind, item_table, quantity, cost in self.ORDER_KINDS.values()}
+
+    def track(self, batches):
+        """原样转发批次，记录已完成订单的表头和明细（只认带 id 的 Python 值元组批次）"""
+        for batch in batches:
+            if batch.values and batch.typed:
+                self._observe(batch)
+            yield batch
+
+    def _observe(self, batch):
+        names = batch.column_names
+        if batch.table in self.ORDER_KINDS and "id" in names:
+            kind = self.ORDER_KINDS[batch.table][0]
+            id_, warehouse, date, status = (names.index(name) for name in
+                                            ("id", "warehouse_id", "order_date", "status"))
+            headers = self._headers[kind]
+            for row in batch.values:
+                if row[status] == "completed":
+                    headers.append((row[id_], row[warehouse], row[date]))
+        elif batch.table in self._item_tables:
+            kind, quantity_name, cost_name = self._item_tables[batch.table]
+            order, item, quantity, cost = (names.index(name) for name in
+                                           ("order_id", "item_id", quantity_name, cost_name))
+            lines = self._lines[kind]
+            for row in batch.values:
+                if row[quantity]:
+                    lines.append((row[order], row[item], row[quantity], row[cost] or 0))
+
+    def _movements(self):
+        """已完成订单的出入库明细：(类型, 订单 id, 商品, 仓库, 时间, 带符号数量, 单位成本)"""
+        parts = []
+        for kind in (_IN, _OUT):
+            header_id, warehouse, date = self._headers[kind].arrays()
+            order_id, item, quantity, cost = self._lines[kind].arrays()
+            # 明细按订单 id 接上表头，未完成订单的明细没有对应表头，丢掉
+            order = np.argsort(header_id, kind="stable")
+            header_id, warehouse, date = header_id[order], warehouse[order], date[order]
+            position = np.minimum(np.searchsorted(header_id, order_id), max(len(header_id) - 1, 0))
+            matched = (header_id[position] == order_id) if len(header_id) else np.zeros(len(order_id), bool)
+            position = position[matched]
+            parts.append((
+                np.full(matched.sum(), kind, dtype=np.int8), order_id[matched], item[matched],
+                warehouse[position], date[position],
+                quantity[matched] if kind == _IN else -quantity[matched], cost[matched],
+            ))
+        return [np.concatenate(columns) for columns in zip(*parts)]
+
+    def derive(self):
+        """计算流水、补货和期末库存，返回 dict（全部是 NumPy 数组，按 (商品, 仓库, 时间) 排序）
+
+        movements：kind、order_id、item_id、warehouse_id、date、quantity、unit_cost，
+        其中 order_id 为 -1 的是补货（在 batches() 中分配采购单 id）；
+        inventory：item_id、warehouse_id、quantity、avg_cost、last_updated。
+        """
+        kind, order_id, item, warehouse, date, quantity, cost = self._movements()
+        if self.opening:
+            opening = np.asarray([row[:3] for row in self.opening], dtype=np.int64).reshape(-1, 3)
+            opening_cost = np.asarray([row[3] or 0 for row in self.opening], dtype=np.float64)
+        else:
+            opening = np.zeros((0, 3), dtype=np.int64)
+            opening_cost = np.zeros(0)
+
+        # 每个 (商品, 仓库) 一组；期初库存也要参与分组，没有流水的组也要有期末库存。
+        # 两列合成一个整数键再去重，比 unique(axis=0) 快一个数量级
+        pairs = np.concatenate([item << 32 | warehouse, opening[:, 0] << 32 | opening[:, 1]])
+        keys, group = np.unique(pairs, return_inverse=True)
+        keys = np.stack([keys >> 32, keys & 0xFFFFFFFF], axis=1)
+        group = group.reshape(-1)
+        groups = len(keys)
+        moving_group, opening_group = group[:len(item)], group[len(item):]
+        opening_quantity = np.bincount(opening_group, weights=opening[:, 2], minlength=groups).astype(np.int64)
+        opening_value = np.bincount(opening_group, weights=opening[:, 2] * opening_cost, minlength=groups)
+
+        # lexsort 是稳定排序，同组同一时刻同类型的保持生成顺序
+        order = np.lexsort((kind, date, moving_group))
+        kind, order_id, date, quantity, cost = kind[order], order_id[order], date[order], quantity[order], cost[order]
+        moving_group = moving_group[order]
+
+        # 分组累加得到每笔之后的结存（期初为起点）
+        counts = np.bincount(moving_group, minlength=groups)
+        starts = (np.cumsum(counts) - counts)[counts > 0]
+        total = np.cumsum(quantity)
+        balance = total - np.repeat(total[starts] - quantity[starts], counts[counts > 0]) \
+            + opening_quantity[moving_group]
+
+        # 到每一笔为止累计缺口 = max(0, -组内结存最小值)；按 lot_size 向上取整得到累计补货量，
+        # 相邻两笔的差就是要插在这一笔之前的补货
+        low = _grouped_cummin(balance, moving_group, counts)
+        replenished = -(-np.maximum(0, -low) // self.lot_size) * self.lot_size
+        previous = np.concatenate(([0], replenished[:-1]))
+        previous[starts] = 0
+        refill = replenished - previous
+        needed = np.flatnonzero(refill > 0)
+        self.replenishments = len(needed)
+
+        # 补货插在触发它的出库之前（同一时刻，入库在前）
+        insert_at = needed
+        kind = np.insert(kind, insert_at, _IN)
+        order_id = np.insert(order_id, insert_at, -1)
+        date = np.insert(date, insert_at, date[needed])
+        cost = np.insert(cost, insert_at, cost[needed])
+        moving_group = np.insert(moving_group, insert_at, moving_group[needed])
+        quantity = np.insert(quantity, insert_at, refill[needed])
+
+        closing = opening_quantity + np.bincount(moving_group, weights=quantity, minlength=groups).astype(np.int64)
+        inbound = quantity > 0
+        in_quantity = np.bincount(moving_group[inbound], weights=quantity[inbound], minlength=groups)
+        in_value = np.bincount(moving_group[inbound], weights=(quantity * cost)[inbound], minlength=groups)
+        stocked = opening_quantity + in_quantity
+        avg_cost = np.round(np.divide(opening_value + in_value, stocked,
+                                      out=np.zeros(groups), where=stocked > 0), 2)
+        # 每组最后一笔的时间（组内按时间排好序）
+        last_updated = np.full(groups, np.datetime64("NaT"), dtype="datetime64[s]")
+        counts = np.bincount(moving_group, minlength=groups)
+        last_updated[counts > 0] = date[np.cumsum(counts)[counts > 0] - 1]
+
+        return {
+            "movements": {
+                "kind": kind, "order_id": order_id, "item_id": keys[moving_group, 0],
+                "warehouse_id": keys[moving_group, 1], "date": date, "quantity": quantity, "unit_cost": cost,
+            },
+            "inventory": {
+                "item_id": keys[:, 0], "warehouse_id": keys[:, 1], "quantity": closing,
+                "avg_cost": avg_cost, "last_updated": last_updated,
+            },
+        }
+
+    def batches(self, ids, now=None):
+        """产出补货采购单及明细、库存流水和期末库存的批次；ids 逐个给出补货采购单的 id（如 IdRange）"""
+        result = self.derive()
+        movements = result["movements"]
+        dates = _date_text(movements["date"])
+
+        # 补货采购单：每次补货一张已完成的采购单，明细一行
+        refill = np.flatnonzero(movements["order_id"] == -1)
+        orders = []
+        for number, index in enumerate(refill.tolist(), 1):
+            order_id = next(ids)
+            movements["order_id"][index] = order_id
+            product = Product(int(movements["item_id"][index]), 0, float(movements["unit_cost"][index]))
+            orders.append(purchase_order(
+                order_id, [(product, int(movements["quantity"][index]))],
+                f"PO-REPL-{dates[index][:10].replace('-', '')}-{number}", self.supplier_id,
+                int(movements["warehouse_id"][index]), dates[index], "completed", "库存不足自动补货"))
+        yield from order_batches("purchase_orders", orders, REPLENISH_BATCH_SIZE, label="补货采购")
+
+        # 库存流水：与后端入库/出库接口的写法一致（PO-/SO- 加订单 id，出库数量为负）
+        for start in range(0, len(dates), TRANSACTION_BATCH_SIZE):
+            part = slice(start, start + TRANSACTION_BATCH_SIZE)
+            rows = []
+            for kind, order_id, item, warehouse, date, quantity, cost in zip(
+                    movements["kind"][part].tolist(), movements["order_id"][part].tolist(),
+                    movements["item_id"][part].tolist(), movements["warehouse_id"][part].tolist(),
+                    dates[part], movements["quantity"][part].tolist(), movements["unit_cost"][part].tolist()):
+                if kind == _IN:
+                    rows.append((item, warehouse, "IN", f"PO-{order_id}", "PURCHASE", quantity, cost, date, None))
+                else:
+                    rows.append((item, warehouse, "OUT", f"SO-{order_id}", "SALES", quantity, cost, date, None))
+            yield InsertBatch("inventory_transactions", ", ".join(TRANSACTION_COLUMNS), rows,
+                              label=f"库存流水 {start // TRANSACTION_BATCH_SIZE + 1}")
+
+        # 只有期初、没有流水的库存，更新时间取 now
+        inventory = result["inventory"]
+        now_text = (now or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+        updated = [now_text if missing else text for missing, text in
+                   zip(np.isnat(inventory["last_updated"]).tolist(), _date_text(inventory["last_updated"]))]
+        rows = [(item, warehouse, quantity, quantity, 0, avg_cost, last_updated)
+                for item, warehouse, quantity, avg_cost, last_updated in zip(
+                    inventory["item_id"].tolist(), inventory["warehouse_id"].tolist(),
+                    inventory["quantity"].tolist(), inventory["avg_cost"].tolist(), updated)]
+        yield InsertBatch("inventory", ", ".join(INVENTORY_COLUMNS), rows, label="期末库存", replace=True)
+
+
+def _grouped_cummin(values, group, counts):
+    """组内（group 已排序）的前缀最小值
+
+    给每组减去一个足够大的递增偏移，使后一组的值都小于前一组，整列做一次 minimum.accumulate 再加回来；
+    偏移可能溢出 int64 时退回逐组计算。
+    """
+    if len(values) == 0:
+        return values
+    span = int(values.max()) - int(values.min()) + 1
+    if span * (int(group[-1]) + 1) < 2 ** 62:
+        offset = group.astype(np.int64) * span
+        return np.minimum.accumulate(values - offset) + offset
+    result = np.empty_like(values)
+    start = 0
+    for count in counts[counts > 0].tolist():
+        result[start:start + count] = np.minimum.accumulate(values[start:start + count])
+        start += count
+    return result
+
+
+def _date_text(dates):
+    """datetime64[s] 数组 → 'YYYY-MM-DD HH:MM:SS' 文本列表"""
+    return np.char.replace(np.datetime_as_string(dates, unit="s"), "T", " ").tolist()
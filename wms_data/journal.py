@@ -0,0 +1,307 @@
+"""造数运行的断点续传日志
+
+每次运行在本地 SQLite 文件里记录：
+- 运行开始时的随机数状态和基准时间（datetime.now），续跑时恢复，使生成结果与首次运行完全一致
+  （新运行传入 seed / now 时用它们代替随机种子和当前时间，不同环境可以生成同样的数据）
+- 每个已提交批次的序号、行数、首尾主键和内容摘要
+- 部分提交的批次中因临时错误被拒绝的行区间，续跑时只重发这些行
+- 向服务器预留的主键区间，续跑时原样复用
+- 运行开始时从服务器读取的数据（如期初库存），续跑时用记录的值，不再重新读取
+- 经业务接口逐个执行的操作（如 POST /sales 创建订单）是否已成功，续跑时跳过已成功的
+
+--resume 续跑时重新生成全部批次，跳过日志中已提交的批次，部分提交的批次只重发待重发的行，
+因此不会重复也不会遗漏；若重新生成的批次摘要与日志不符则立即停止。
+"""
+import hashlib
+import os
+import pickle
+import random
+import re
+import sqlite3
+import uuid
+from datetime import datetime
+
+from .importer import InsertBatch
+from .retry import send_batch
+
+DEFAULT_JOURNAL_FILE = "seed-journal.db"
+
+# 取一行 VALUES 元组中的第一个字段作为主键（如订单号）
+_FIRST_FIELD = re.compile(r"^\s*\(\s*('(?:[^']|'')*'|[^,)]*)")
+
+
+def batch_digest(batch):
+    return hashlib.sha1(batch.to_sql().encode("utf-8")).hexdigest()
+
+
+def batch_keys(batch):
+    """批次首行和末行的主键"""
+    def first_field(value):
+        if not isinstance(value, str):
+            return str(value[0])
+        match = _FIRST_FIELD.match(value)
+        return match.group(1).strip().strip("'") if match else None
+    return first_field(batch.values[0]), first_field(batch.values[-1])
+
+
+def map_ranges(pending, ranges):
+    """把重发批次（原批次 pending 各区间依次拼接而成）中的行区间映射回原批次的行号"""
+    mapped = []
+    base = 0
+    for start, end in pending:
+        for low, high in ranges:
+            low, high = max(low, base), min(high, base + end - start)
+            if low < high:
+                mapped.append((start + low - base, start + high - base))
+        base += end - start
+    return sorted(mapped)
+
+
+class JournalMismatch(Exception):
+    """续跑时重新生成的批次与日志记录不一致"""
+
+
+class SeedJournal:
+    """一个脚本的造数运行日志"""
+
+    def __init__(self, conn, run_id, now, resumed):
+        self.conn = conn
+        self.run_id = run_id
+        self.now = now
+        self.resumed = resumed
+        self._next_seq = 0
+        self._next_range = 0
+        self.incomplete = 0
+        self._committed = {
+            seq: digest for seq, digest in conn.execute(
+                "SELECT seq, digest FROM batches WHERE run_id = ?", (run_id,))
+        }
+        # 部分提交的批次：{序号: [(起, 止))]}，行号相对于重新生成的原批次
+        self._pending = {}
+        for seq, start, end in conn.execute(
+                "SELECT seq, start_row, end_row FROM pending_rows WHERE run_id = ? ORDER BY seq, start_row",
+                (run_id,)):
+            self._pending.setdefault(seq, []).append((start, end))
+
+    @classmethod
+    def open(cls, script, resume=False, seed=None, now=None, path=DEFAULT_JOURNAL_FILE):
+        """开始新运行，或在 resume=True 时接上该脚本最近一次未完成的运行
+
+        续跑时沿用原运行的随机数状态和基准时间，忽略 seed 和 now。
+        """
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                script TEXT NOT NULL,
+                started_at TEXT NOT NULL,
+                now TEXT NOT NULL,
+                rng_state BLOB NOT NULL,
+                finished_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS batches (
+                run_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                table_name TEXT NOT NULL,
+                label TEXT,
+                rows INTEGER NOT NULL,
+                rejected INTEGER NOT NULL DEFAULT 0,
+                first_key TEXT,
+                last_key TEXT,
+                digest TEXT NOT NULL,
+                committed_at TEXT NOT NULL,
+                PRIMARY KEY (run_id, seq)
+            );
+            CREATE TABLE IF NOT EXISTS pending_rows (
+                run_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                start_row INTEGER NOT NULL,
+                end_row INTEGER NOT NULL,
+                PRIMARY KEY (run_id, seq, start_row)
+            );
+            CREATE TABLE IF NOT EXISTS snapshots (
+                run_id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                value BLOB NOT NULL,
+                PRIMARY KEY (run_id, name)
+            );
+            CREATE TABLE IF NOT EXISTS id_ranges (
+                run_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                table_name TEXT NOT NULL,
+                start_id INTEGER NOT NULL,
+                end_id INTEGER NOT NULL,
+                PRIMARY KEY (run_id, seq)
+            );
+        """)
+
+        if resume:
+            row = conn.execute(
+                "SELECT run_id, now, rng_state FROM runs "
+                "WHERE script = ? AND finished_at IS NULL ORDER BY started_at DESC LIMIT 1",
+                (script,)).fetchone()
+            if row:
+                run_id, now, rng_state = row
+                random.setstate(pickle.loads(rng_state))
+                journal = cls(conn, run_id, datetime.fromisoformat(now), True)
+                print(f"♻️ 续跑 {run_id}：已提交 {len(journal._committed)} 个批次"
+                      f"（其中 {len(journal._pending)} 个部分提交）")
+                return journal
+            print("⚠️ 没有找到未完成的运行，开始新的运行")
+
+        random.seed(int.from_bytes(os.urandom(8), "big") if seed is None else seed)
+        run_id = f"{script}-{uuid.uuid4().hex[:8]}"
+        now = now or datetime.now()
+        conn.execute(
+            "INSERT INTO runs (run_id, script, started_at, now, rng_state) VALUES (?, ?, ?, ?, ?)",
+            (run_id, script, datetime.now().isoformat(), now.isoformat(),
+             pickle.dumps(random.getstate())))
+        conn.commit()
+        return cls(conn, run_id, now, False)
+
+    def is_committed(self, seq, batch):
+        """该序号的批次是否已提交（含部分提交）；摘要不符说明生成结果已改变，抛出 JournalMismatch"""
+        digest = self._committed.get(seq)
+        if digest is None:
+            return False
+        if digest != batch_digest(batch):
+            raise JournalMismatch(f"批次 {seq}（{batch.label}）与日志记录不一致，无法安全续跑")
+        return True
+
+    def unsent(self, seq, batch):
+        """该序号还需要发送的行：全部已提交返回 None；部分提交返回只含待重发行的批次"""
+        if not self.is_committed(seq, batch):
+            return batch
+        pending = self._pending.get(seq)
+        if not pending:
+            return None
+        values = [row for start, end in pending for row in batch.values[start:end]]
+        return InsertBatch(batch.table, batch.columns, values,
+                           label=f"{batch.label}（续跑重发 {len(values)} 行）", offset=batch.offset)
+
+    def record(self, seq, batch, result):
+        """记录批次的处理结果
+
+        batch 是 unsent() 返回、实际发送的批次。因临时错误被拒绝的行记为待重发，批次保持未完成；
+        首次发送就整批因临时错误失败的不记录，续跑时整批重新发送。
+        """
+        ranges = [(start - batch.offset, end - batch.offset) for start, end in result.pending]
+        previous = self._pending.get(seq)
+        if previous is not None:
+            ranges = map_ranges(previous, ranges)
+        elif seq not in self._committed and result.committed == 0 and result.retryable:
+            self.incomplete += 1
+            return
+        if ranges:
+            self.incomplete += 1
+
+        if seq in self._committed:
+            # 续跑重发：摘要、标签和首尾主键保留原批次的，重发的行原先都记在拒绝数里
+            digest = self._committed[seq]
+            label, rows, rejected, first_key, last_key = self.conn.execute(
+                "SELECT label, rows, rejected, first_key, last_key FROM batches WHERE run_id = ? AND seq = ?",
+                (self.run_id, seq)).fetchone()
+            rows, rejected = rows + result.committed, rejected - len(batch) + result.rejected
+        else:
+            digest = batch_digest(batch)
+            label, rows, rejected = batch.label, result.committed, result.rejected
+            first_key, last_key = batch_keys(batch)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO batches (run_id, seq, table_name, label, rows, rejected, "
+            "first_key, last_key, digest, committed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (self.run_id, seq, batch.table, label, rows, rejected,
+             first_key, last_key, digest, datetime.now().isoformat()))
+        self.conn.execute("DELETE FROM pending_rows WHERE run_id = ? AND seq = ?", (self.run_id, seq))
+        self.conn.executemany(
+            "INSERT INTO pending_rows (run_id, seq, start_row, end_row) VALUES (?, ?, ?, ?)",
+            [(self.run_id, seq, start, end) for start, end in ranges])
+        self.conn.commit()
+        self._committed[seq] = digest
+        if ranges:
+            self._pending[seq] = ranges
+        else:
+            self._pending.pop(seq, None)
+
+    def send(self, batch, sender=send_batch):
+        """同步脚本用：按生成顺序发送批次，已提交的跳过并返回 None，部分提交的只重发待重发的行"""
+        seq = self._next_seq
+        self._next_seq += 1
+        batch = self.unsent(seq, batch)
+        if batch is None:
+            return None
+        result = sender(batch)
+        self.record(seq, batch, result)
+        return result
+
+    def allocate_ids(self, table, count, allocate):
+        """预留 count 个主键，返回 (start, end)；allocate(table, count) 负责向服务器申请
+
+        续跑时按调用顺序返回原运行预留过的区间，重新生成的批次主键不变，摘要才能对上。
+        """
+        seq = self._next_range
+        self._next_range += 1
+        row = self.conn.execute(
+            "SELECT table_name, start_id, end_id FROM id_ranges WHERE run_id = ? AND seq = ?",
+            (self.run_id, seq)).fetchone()
+        if row:
+            if row[0] != table or row[2] - row[1] + 1 != count:
+                raise JournalMismatch(f"第 {seq} 次主键预留（{table} × {count}）与日志记录不一致，无法安全续跑")
+            return row[1], row[2]
+        start, end = allocate(table, count)
+        self.conn.execute(
+            "INSERT INTO id_ranges (run_id, seq, table_name, start_id, end_id) VALUES (?, ?, ?, ?, ?)",
+            (self.run_id, seq, table, start, end))
+        self.conn.commit()
+        return start, end
+
+    def remember(self, name, compute):
+        """首次运行时调用 compute() 并记录结果，续跑时直接返回记录的值
+
+        用于生成依赖的服务器状态（如期初库存）：续跑时服务器上的数据已被本次运行改过，
+        重新读取会得到不同的批次。
+        """
+        row = self.conn.execute("SELECT value FROM snapshots WHERE run_id = ? AND name = ?",
+                                (self.run_id, name)).fetchone()
+        if row:
+            return pickle.loads(row[0])
+        value = compute()
+        self.conn.execute("INSERT INTO snapshots (run_id, name, value) VALUES (?, ?, ?)",
+                          (self.run_id, name, pickle.dumps(value)))
+        self.conn.commit()
+        return value
+
+    def once(self, name, action, ok=bool):
+        """只需成功执行一次、又不是批量插入的操作（如经业务接口创建一张订单）
+
+        续跑时已成功的直接跳过并返回 None；否则执行 action()，ok(结果) 为真时记录下来。
+        不成功或抛出异常时不记录，运行保持未完成，续跑时重新执行。
+        """
+        key = f"once:{name}"
+        if self.conn.execute("SELECT 1 FROM snapshots WHERE run_id = ? AND name = ?",
+                             (self.run_id, key)).fetchone():
+            return None
+        try:
+            result = action()
+        except Exception:
+            self.incomplete += 1
+            raise
+        if not ok(result):
+            self.incomplete += 1
+            return result
+        self.conn.execute("INSERT INTO snapshots (run_id, name, value) VALUES (?, ?, ?)",
+                          (self.run_id, key, pickle.dumps(True)))
+        self.conn.commit()
+        return result
+
+    def finish(self):
+        """结束运行：还有因临时错误未完成的批次时保持未完成状态，留给 --resume"""
+        if self.incomplete:
+            print(f"⚠️ {self.incomplete} 个批次因临时错误未完成，可用 --resume 续跑")
+            self.conn.close()
+            return
+        self.conn.execute("UPDATE runs SET finished_at = ? WHERE run_id = ?",
+                          (datetime.now().isoformat(), self.run_id))
+        self.conn.commit()
+        self.conn.close()
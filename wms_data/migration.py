@@ -0,0 +1,132 @@
+"""整表迁移：data-export/*.sql 的全部行按 init.ts 的表结构成批导入
+
+convert-data-format.py 每张表只取前 20 行，fix-orders-data.py 只取前 50 个销售订单、30 个采购订单，
+而且每行一个 HTTP 请求。这里把各表的全部行（经列式缓存读出、Projection 按列名映射）切成
+batch_rows 行一批的 InsertBatch，按外键顺序产出，交给：
+- BulkImporter：批次打包成信封走 /data-import/bulk，一个信封在服务器上一次事务
+- SqliteSink：凑满一个分片一次事务，直接写进 wms.db 兼容的文件
+主键随行一起迁移，明细表引用的订单 id 不变。MigrationProgress 按已交给导入目标的行数
+报告进度、速率和预计剩余时间。
+"""
+import os
+import time
+
+from .dump_cache import open_cache
+from .projection import dump_batches
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖，没有时不知道各表总行数，进度不报剩余时间
+    np = None
+
+# 父表在前，与 schema.FOREIGN_KEYS 一致
+MIGRATION_ORDER = [
+    "warehouses",
+    "suppliers",
+    "customers",
+    "items",
+    "inventory",
+    "purchase_orders",
+    "purchase_order_items",
+    "sales_orders",
+    "sales_order_items",
+    "inventory_transactions",
+]
+
+DEFAULT_BATCH_ROWS = 2000
+# 进度最多每隔这么多秒打印一次
+PROGRESS_INTERVAL = 2.0
+
+
+def export_files(directory="data-export", tables=None):
+    """要迁移的 [(表名, 转储路径)]，按外键顺序；目录里没有的表跳过"""
+    files = []
+    for table in tables or MIGRATION_ORDER:
+        path = os.path.join(directory, f"{table}.sql")
+        if os.path.exists(path):
+            files.append((table, path))
+    return files
+
+
+def table_rows(files, workers=1):
+    """各表的总行数（读列式缓存，第一次时先建缓存）；没有 numpy 时返回 None"""
+    if np is None:
+        return None
+    totals = {}
+    for table, path in files:
+        cached = open_cache(path, workers).get(table)
+        totals[table] = len(cached) if cached is not None else 0
+    return totals
+
+
+def migration_batches(files, batch_rows=DEFAULT_BATCH_ROWS, workers=1, cache=True, progress=None):
+    """逐表产出全部行的 InsertBatch，每批 batch_rows 行"""
+    for table, path in files:
+        offset = 0
+        for block in dump_batches(path, table, workers=workers, cache=cache):
+            for start in range(0, len(block), batch_rows):
+                batch = block.slice(start, start + batch_rows)
+                batch.label = f"{table} 第 {offset + 1:,}-{offset + len(batch):,} 行"
+                offset += len(batch)
+                yield batch
+                if progress is not None:
+                    progress.advance(table, len(batch))
+        if progress is not None:
+            progress.table_done(table)
+
+
+class MigrationProgress:
+    """迁移进度：已交给导入目标的行数、速率和预计剩余时间
+
+    totals 是各表的总行数（未知时为 None，只报行数和速率）。
+    """
+
+    def __init__(self, totals=None, interval=PROGRESS_INTERVAL):
+        self.totals = totals
+        self.total = sum(totals.values()) if totals else None
+        self.interval = interval
+        self.rows = {}
+        self.done = 0
+        self.started = time.perf_counter()
+        self._printed = self.started
+
+    def advance(self, table, rows):
+        self.rows[table] = self.rows.get(table, 0) + rows
+        self.done += rows
+        now = time.perf_counter()
+        if now - self._printed >= self.interval:
+            self._printed = now
+            print(self.line(table))
+
+    def table_done(self, table):
+        print(self.line(table))
+
+    def line(self, table):
+        elapsed = time.perf_counter() - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0
+        table_rows = f"{self.rows.get(table, 0):,}"
+        if self.totals and table in self.totals:
+            table_rows += f"/{self.totals[table]:,}"
+        text = f"📦 {table} {table_rows} 行，累计 {self.done:,}"
+        if self.total:
+            text += f"/{self.total:,} 行（{self.done / self.total:.1%}）"
+        else:
+            text += " 行"
+        text += f"，{rate:,.0f} 行/s"
+        if self.total and rate > 0:
+            text += f"，预计剩余 {format_duration((self.total - self.done) / rate)}"
+        return text
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0
+        return f"{self.done:,} 行，{len(self.rows)} 张表，耗时 {format_duration(elapsed)}，{rate:,.0f} 行/s"
+
+
+def format_duration(seconds):
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds // 3600}h{seconds // 60 % 60:02d}m"
@@ -0,0 +1,185 @@
+"""订单表头与明细一次生成
+
+旧的 generate_order_items() 在订单导入之后另起一轮生成明细：假定订单 id 是 1..N、单价来自
+写死的 item_prices，于是表头金额与明细之和对不上，库里已有数据时外键还会指错订单。
+这里逐单生成：先按商品目录（/items 的售价和进价）挑出明细，再由明细汇总出表头的
+金额、成本、毛利和毛利率；表头 id 取自服务器预留的主键区间，明细直接引用，不需要第二轮和修数脚本。
+
+用法：
+    catalog = fetch_catalog()
+    ids = IdRange("sales_orders", journal=journal)
+    header, lines = sales_order(next(ids), pick_lines(rng, catalog, 1500, 2), "SO-...", ...)
+    yield from order_batches("sales_orders", orders, batch_size=20, label="...")
+"""
+from collections import namedtuple
+
+from .client import get_client
+from .importer import InsertBatch
+
+# 列顺序与 backend/src/database/init.ts 一致，表头带显式 id
+SALES_ORDER_COLUMNS = [
+    "id", "order_no", "customer_id", "warehouse_id", "order_date", "total_amount", "discount_amount",
+    "final_amount", "paid_amount", "total_cost", "gross_profit", "profit_margin",
+    "payment_status", "status", "remarks",
+]
+SALES_ITEM_COLUMNS = [
+    "order_id", "item_id", "quantity", "unit_price", "unit_cost", "total_price", "total_cost",
+    "delivered_quantity",
+]
+PURCHASE_ORDER_COLUMNS = [
+    "id", "order_no", "supplier_id", "warehouse_id", "order_date", "total_amount", "status", "remarks",
+]
+PURCHASE_ITEM_COLUMNS = [
+    "order_id", "item_id", "quantity", "unit_price", "total_price", "received_quantity",
+]
+
+# 表头表 → (表头列, 明细表, 明细列)
+ORDER_TABLES = {
+    "sales_orders": (SALES_ORDER_COLUMNS, "sales_order_items", SALES_ITEM_COLUMNS),
+    "purchase_orders": (PURCHASE_ORDER_COLUMNS, "purchase_order_items", PURCHASE_ITEM_COLUMNS),
+}
+
+DEFAULT_ID_BLOCK = 1000
+
+Product = namedtuple("Product", "id sale_price purchase_price")
+
+
+def fetch_catalog(client=None, page_size=100):
+    """分页读取 /items，返回售价和进价都大于 0 的商品列表"""
+    client = client or get_client()
+    catalog = []
+    page = 1
+    while True:
+        response = client.get(f"/items?page={page}&pageSize={page_size}")
+        if response.status_code != 200:
+            raise RuntimeError(f"获取商品第 {page} 页失败: {response.text}")
+        items = response.json().get("data", [])
+        if not items:
+            break
+        for item in items:
+            sale_price = item.get("sale_price") or 0
+            purchase_price = item.get("purchase_price") or 0
+            if sale_price > 0 and purchase_price > 0:
+                catalog.append(Product(item["id"], sale_price, purchase_price))
+        page += 1
+    if not catalog:
+        raise RuntimeError("商品目录为空（或商品都没有售价/进价），无法生成订单明细")
+    return catalog
+
+
+class IdRange:
+    """按块向服务器预留主键、逐个发放的迭代器
+
+    传入 journal 时预留经 SeedJournal.allocate_ids 记录，续跑复用原来的区间。
+    最后一块没用完的 id 只是留下空号，不影响其他写入。
+    """
+
+    def __init__(self, table, block=DEFAULT_ID_BLOCK, client=None, journal=None):
+        self.table = table
+        self.block = block
+        self.client = client or get_client()
+        self.journal = journal
+        self._next = 1
+        self._end = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._next > self._end:
+            if self.journal is not None:
+                self._next, self._end = self.journal.allocate_ids(self.table, self.block, self.client.allocate_ids)
+            else:
+                self._next, self._end = self.client.allocate_ids(self.table, self.block)
+        order_id = self._next
+        self._next += 1
+        return order_id
+
+
+def pick_lines(rng, catalog, amount, count, price="sale_price"):
+    """按金额预算挑 count 个不同商品，返回 [(商品, 数量)]
+
+    只从单价不超过预算份额的商品中挑（都超过时只取最便宜的一个），每行数量 = 份额 / 单价
+    取整（至少 1 件），明细金额之和接近 amount。rng 是 random.Random 或 random 模块。
+    """
+    affordable = [product for product in catalog if getattr(product, price) <= amount / count]
+    if not affordable:
+        affordable = [min(catalog, key=lambda product: getattr(product, price))]
+    products = rng.sample(affordable, min(count, len(affordable)))
+    share = amount / len(products)
+    return [(product, max(1, round(share / getattr(product, price)))) for product in products]
+
+
+def sales_order(order_id, lines, order_no, customer_id, warehouse_id, order_date, status,
+                discount=0, payment_status="paid", remarks=None):
+    """由明细汇总出销售订单表头，返回 (sales_orders 行, sales_order_items 行列表)
+
+    lines 是 [(商品, 数量)]；单价取售价、单位成本取进价，已完成订单的明细视为全部出库。
+    折扣不超过订单金额，已付款订单的实付等于实收。
+    """
+    item_rows = []
+    total_amount = 0
+    total_cost = 0
+    for product, quantity in lines:
+        line_amount = round(product.sale_price * quantity, 2)
+        line_cost = round(product.purchase_price * quantity, 2)
+        item_rows.append((order_id, product.id, quantity, product.sale_price, product.purchase_price,
+                          line_amount, line_cost, quantity if status == "completed" else 0))
+        total_amount += line_amount
+        total_cost += line_cost
+
+    total_amount = round(total_amount, 2)
+    total_cost = round(total_cost, 2)
+    discount = min(discount, total_amount)
+    final_amount = round(total_amount - discount, 2)
+    paid_amount = final_amount if payment_status == "paid" else 0
+    gross_profit = round(final_amount - total_cost, 2)
+    profit_margin = round(gross_profit / final_amount * 100, 2) if final_amount > 0 else 0
+
+    header = (order_id, order_no, customer_id, warehouse_id, order_date, total_amount, discount,
+              final_amount, paid_amount, total_cost, gross_profit, profit_margin,
+              payment_status, status, remarks)
+    return header, item_rows
+
+
+def purchase_order(order_id, lines, order_no, supplier_id, warehouse_id, order_date, status, remarks=None):
+    """由明细汇总出采购订单表头，返回 (purchase_orders 行, purchase_order_items 行列表)
+
+    lines 是 [(商品, 数量)]，单价取进价；已完成订单的明细视为全部入库。
+    """
+    item_rows = []
+    total_amount = 0
+    for product, quantity in lines:
+        line_amount = round(product.purchase_price * quantity, 2)
+        item_rows.append((order_id, product.id, quantity, product.purchase_price, line_amount,
+                          quantity if status == "completed" else 0))
+        total_amount += line_amount
+
+    header = (order_id, order_no, supplier_id, warehouse_id, order_date, round(total_amount, 2),
+              status, remarks)
+    return header, item_rows
+
+
+def order_batches(table, orders, batch_size, label=None):
+    """orders 逐个产出 (表头行, 明细行列表)；每 batch_size 个订单产出一个表头批次和紧随其后的明细批次
+
+    明细批次排在对应表头批次之后，BulkImporter 会等表头提交后再发送明细（或放进同一个信封）。
+    """
+    header_columns, item_table, item_columns = ORDER_TABLES[table]
+    label = label or table
+    headers = []
+    items = []
+    number = 0
+    for header, item_rows in orders:
+        headers.append(header)
+        items.extend(item_rows)
+        if len(headers) == batch_size:
+            number += 1
+            yield InsertBatch(table, ", ".join(header_columns), headers, label=f"{label} 批次 {number}")
+            yield InsertBatch(item_table, ", ".join(item_columns), items, label=f"{label} 明细批次 {number}")
+            headers = []
+            items = []
+    if headers:
+        number += 1
+        yield InsertBatch(table, ", ".join(header_columns), headers, label=f"{label} 批次 {number}")
+        yield InsertBatch(item_table, ", ".join(item_columns), items, label=f"{label} 明细批次 {number}")
@@ -0,0 +1,150 @@
+"""转储表按列名映射到 init.ts 的表结构
+
+data-export/ 的表结构比 backend/src/database/init.ts 旧：sales_orders 没有 discount_amount、
+round_amount、final_amount 等列，items 的 en_name 在最后一列而不是第四列。转换脚本原来按位置取值
+（parts[6] 当总额、parts[8] 当税额——其实是 gross_profit），多一列少一列金额就整体错位。
+
+Projection 按源表（转储里的 CREATE TABLE）和目标表（init.ts）的列名编译一次映射，之后逐块套用：
+- 同名列原样搬过去，值列表直接复用
+- 源表没有、能按后端算法推出的列（DERIVED）整列向量化计算
+- 其余目标列不写，由 SQLite 取默认值
+源表有而目标表没有的列、目标表必填却无从得到的列，在编译时就报错，不会悄悄丢掉或错位。
+
+用法：
+    with DumpReader("data-export/sales_orders.sql") as reader:
+        for table, columns in reader.named_blocks():
+            batch = Projection(table, reader.column_names(table)).batch(columns)
+或者直接 dump_batches("data-export/sales_orders.sql")。
+"""
+import re
+import sqlite3
+from itertools import repeat
+
+from .dump_cache import named_blocks
+from .importer import InsertBatch
+from .schema import table_columns
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖，没有时逐行计算推导列
+    np = None
+
+# 源转储没有、按后端的算法从其他列推出的列：{表: {列: (函数, 参数列)}}
+# 参数列在源表中没有时取目标表的默认值
+DERIVED = {
+    "sales_orders": {
+        # 与 routes/sales.ts 创建订单时相同
+        "final_amount": (lambda total, discount, rounding: total - discount + rounding,
+                         ("total_amount", "discount_amount", "round_amount")),
+    },
+}
+
+_DECIMAL_SCALE = re.compile(r"DECIMAL\s*\(\s*\d+\s*,\s*(\d+)\s*\)", re.I)
+
+
+class Projection:
+    """源表的列（按名字）到目标表列的映射
+
+    table 是源表名，source_columns 是源表的列名（按 INSERT 的值顺序）；
+    target 默认与源表同名，renames 给出改过名的列 {源列名: 目标列名}。
+    """
+
+    def __init__(self, table, source_columns, target=None, renames=None):
+        self.source = table
+        self.table = target or table
+        renames = renames or {}
+        info = table_columns(self.table)
+        sources = {renames.get(name, name): name for name in source_columns}
+        unknown = set(sources) - {column[0] for column in info}
+        if unknown:
+            raise ValueError(f"{self.table} 没有源表 {table} 的这些列：{', '.join(sorted(unknown))}")
+
+        derived = DERIVED.get(self.table, {})
+        defaults = {name: default for name, _, _, default, _ in info}
+        # 每个目标列的来源：("column", 源列名) 或 ("derived", 函数, 参数, 小数位数)
+        self._plan = []
+        names = []
+        for name, kind, notnull, default, pk in info:
+            if name in sources:
+                self._plan.append(("column", sources[name]))
+            elif name in derived:
+                function, inputs = derived[name]
+                arguments = [("column", sources[column]) if column in sources
+                             else ("constant", _default_value(self.table, column, defaults[column]))
+                             for column in inputs]
+                scale = _DECIMAL_SCALE.match(kind)
+                self._plan.append(("derived", function, arguments, int(scale.group(1)) if scale else None))
+            elif notnull and default is None and not pk:
+                raise ValueError(f"源表 {table} 没有 {self.table} 的必填列 {name}")
+            else:
+                continue
+            names.append(name)
+        self.column_names = names
+        self.columns = ", ".join(names)
+
+    def project(self, columns):
+        """一块 {源列名: 值列表} → 按 column_names 顺序的值列表"""
+        out = []
+        for step in self._plan:
+            if step[0] == "column":
+                out.append(columns[step[1]])
+            else:
+                out.append(self._derive(columns, *step[1:]))
+        return out
+
+    def batch(self, columns, label=None):
+        """一块 {源列名: 值列表} → 目标表的 InsertBatch（Python 值元组）"""
+        return InsertBatch(self.table, self.columns, list(zip(*self.project(columns))), label=label)
+
+    def _derive(self, columns, function, arguments, scale):
+        values = [columns[source] if kind == "column" else source for kind, source in arguments]
+        if np is not None:
+            # NULL 转成 NaN 参与运算，结果再还原成 NULL（与 SQL 中 NULL 参与算术相同）
+            result = function(*[np.array(value, dtype=np.float64) for value in values])
+            result = np.broadcast_to(result, (len(next(iter(columns.values()))),))
+            if scale is not None:
+                result = np.round(result, scale)
+            missing = np.isnan(result)
+            result = result.tolist()
+            if missing.any():
+                result = [None if gone else value for value, gone in zip(result, missing.tolist())]
+            return result
+        rows = zip(*[value if isinstance(value, list) else repeat(value) for value in values])
+        return [None if None in row else function(*row) if scale is None else round(function(*row), scale)
+                for row in rows]
+
+
+def _default_value(table, column, default):
+    """推导列的参数在源表中没有时，取目标表这一列的默认值（必须是常量）"""
+    if default is None:
+        return None
+    db = sqlite3.connect(":memory:")
+    try:
+        value = db.execute(f"SELECT {default}").fetchone()[0]
+    finally:
+        db.close()
+    if not isinstance(value, (int, float)):
+        raise ValueError(f"{table}.{column} 的默认值 {default} 不是数值，不能用来推导其他列")
+    return value
+
+
+def dump_batches(path, table=None, limit=None, workers=1, cache=True):
+    """读一个转储文件，按块产出映射到 init.ts 表结构的 InsertBatch
+
+    limit 限制总行数，workers 是解析进程数；cache 为真时经转储旁边的列式缓存读取（见 dump_cache），
+    第一次读或转储改变后先完整解析一遍写好缓存。
+    """
+    projections = {}
+    remaining = limit
+    for name, columns in named_blocks(path, table, workers, cache):
+        projection = projections.get(name)
+        if projection is None:
+            projection = projections[name] = Projection(name, list(columns))
+        batch = projection.batch(columns)
+        if remaining is not None:
+            batch = batch.slice(0, remaining)
+            remaining -= len(batch)
+        if batch.values:
+            yield batch
+        if remaining == 0:
+            return
@@ -0,0 +1,126 @@
+"""AIMD 自适应限速
+
+取代脚本里写死的 time.sleep(0.1~1.0)：
+- 服务器空闲（延迟低、全部成功）时加性/慢启动地提高请求速率和并发
+- 出现 429、502/503/504、SQLITE_BUSY 或 Retry-After 等繁忙信号时乘性降速
+- 延迟超过阈值时温和降速
+运行结束后用 report() 输出最终稳定下来的速率。
+"""
+import threading
+import time
+
+# 视为"服务器繁忙"的状态码，以及 500 响应中表示写锁竞争的错误信息
+BUSY_STATUS_CODES = {429, 502, 503, 504}
+BUSY_MARKERS = ("SQLITE_BUSY", "database is locked")
+
+
+def is_busy_response(response):
+    """判断响应是否是服务器繁忙信号"""
+    if response is None:
+        return True
+    if response.status_code in BUSY_STATUS_CODES:
+        return True
+    if response.headers.get("Retry-After"):
+        return True
+    if response.status_code >= 500:
+        return any(marker in response.text for marker in BUSY_MARKERS)
+    return False
+
+
+def retry_after_seconds(response):
+    """解析 Retry-After 头（只支持秒数），没有则返回 0"""
+    if response is None:
+        return 0
+    try:
+        return float(response.headers.get("Retry-After", 0))
+    except ValueError:
+        return 0
+
+
+class AimdController:
+    """根据延迟和繁忙信号调整请求速率（次/秒）与并发数，线程安全"""
+
+    def __init__(self, rate=5.0, min_rate=0.5, max_rate=200.0,
+                 concurrency=1, max_concurrency=16, target_latency=2.0,
+                 increase=1.0, decrease=0.5, slow_decrease=0.8):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.concurrency = concurrency
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_decrease = slow_decrease
+
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._next_slot = 0.0
+        self._slow_start = True
+        self._streak = 0
+
+        self.started = None
+        self.completed = 0
+        self.backoffs = 0
+        self.settled_rate = rate
+
+    def acquire(self):
+        """阻塞直到允许发出下一个请求"""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self.started is None:
+                    self.started = now
+                if self._in_flight < self.concurrency and now >= self._next_slot:
+                    self._next_slot = max(now, self._next_slot) + 1.0 / self.rate
+                    self._in_flight += 1
+                    return
+                wait = max(self._next_slot - now, 0) if self._in_flight < self.concurrency else None
+                self._cond.wait(wait)
+
+    def release(self, latency, response):
+        """记录一次请求的结果并调整速率"""
+        with self._cond:
+            self._in_flight -= 1
+            self.completed += 1
+
+            if is_busy_response(response):
+                self._backoff(self.decrease)
+                self.concurrency = max(1, self.concurrency // 2)
+                pause = retry_after_seconds(response)
+                if pause:
+                    self._next_slot = max(self._next_slot, time.monotonic() + pause)
+            elif latency > self.target_latency:
+                self._backoff(self.slow_decrease)
+                self.concurrency = max(1, self.concurrency - 1)
+            else:
+                self._grow()
+
+            self.settled_rate = 0.9 * self.settled_rate + 0.1 * self.rate
+            self._cond.notify_all()
+
+    def _backoff(self, factor):
+        self.backoffs += 1
+        self._slow_start = False
+        self._streak = 0
+        self.rate = max(self.min_rate, self.rate * factor)
+
+    def _grow(self):
+        if self._slow_start:
+            self.rate = min(self.max_rate, self.rate * 1.25)
+        else:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+        # 每连续成功一"轮"（等于当前并发数的请求）并发加一
+        self._streak += 1
+        if self._streak >= self.concurrency and self.concurrency < self.max_concurrency:
+            self.concurrency += 1
+            self._streak = 0
+
+    def report(self):
+        """运行结束时的速率报告"""
+        elapsed = time.monotonic() - self.started if self.started is not None else 0
+        throughput = self.completed / elapsed if elapsed > 0 else 0
+        return (f"🎛️ 自适应限速：稳定在 {self.settled_rate:.1f} 请求/s（当前 {self.rate:.1f}），"
+                f"并发 {self.concurrency}，实际吞吐 {throughput:.1f} 请求/s，"
+                f"共 {self.completed} 个请求，降速 {self.backoffs} 次")
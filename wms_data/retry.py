@@ -0,0 +1,191 @@
+"""导入批次的重试与二分定位
+
+- 临时错误（连接异常、超时、429/5xx 繁忙信号）按指数退避重试
+- 确定性的 SQL 错误（非繁忙的 500）把批次二分后分别重发，直到定位出出错的单行；
+  多行 INSERT 在 SQLite 中是原子的，所以失败的批次不会留下半批数据
+- 无法导入的行连同服务器错误写入拒绝文件（JSON Lines），好的行照常提交
+- 信封（多个批次）走 /data-import/bulk 一次事务提交；整个信封回滚时逐批改走上面的流程
+"""
+import json
+import random
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+from .client import get_client
+from .columnar import encode_envelope
+from .ratelimit import is_busy_response, retry_after_seconds
+
+DEFAULT_REJECT_FILE = "import-rejects.jsonl"
+
+
+def error_detail(response):
+    """提取服务器返回的错误信息"""
+    try:
+        body = response.json()
+        return body.get("details") or body.get("error") or response.text
+    except ValueError:
+        return response.text
+
+
+class RejectLog:
+    """追加写入被拒绝行的日志文件，线程安全"""
+
+    def __init__(self, path=DEFAULT_REJECT_FILE):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def write(self, batch, rows, error):
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                for i, row in enumerate(rows):
+                    f.write(json.dumps({
+                        "time": datetime.now().isoformat(timespec="seconds"),
+                        "table": batch.table,
+                        "columns": batch.columns,
+                        "label": batch.label,
+                        "index": batch.offset + i,
+                        "row": row,
+                        "error": error,
+                    }, ensure_ascii=False) + "\n")
+            self.count += len(rows)
+
+
+class BatchResult:
+    """一个批次最终提交和拒绝的行数
+
+    retryable 表示有行是因为临时错误（重试次数用完）被拒绝的，稍后重发可能成功；
+    pending 是这些行的 [(起, 止)) 区间（按 InsertBatch.offset 计的行号），续跑时只重发它们。
+    commits 是服务器为这些行提交的事务数（信封中只记在第一个批次上）。
+    """
+
+    def __init__(self, committed=0, rejected=0, requests=0, retryable=False, commits=0, pending=None):
+        self.committed = committed
+        self.rejected = rejected
+        self.requests = requests
+        self.retryable = retryable
+        self.commits = commits
+        self.pending = pending or []
+
+    @property
+    def ok(self):
+        return self.rejected == 0
+
+    def merge(self, other):
+        self.committed += other.committed
+        self.rejected += other.rejected
+        self.requests += other.requests
+        self.commits += other.commits
+        self.retryable = self.retryable or other.retryable
+        self.pending.extend(other.pending)
+        return self
+
+
+class BatchSender:
+    """带重试、二分和拒绝文件的批次发送器"""
+
+    def __init__(self, client=None, max_retries=5, base_delay=0.5, max_delay=30.0,
+                 reject_log=None, columnar=False):
+        self.client = client or get_client()
+        self.columnar = columnar
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.reject_log = reject_log or RejectLog()
+
+    def send(self, batch):
+        """发送一个 InsertBatch，返回 BatchResult
+
+        替换整表的批次把 DELETE 和 INSERT 放进同一个事务，出错时整批回滚、原有的行保留，不做二分。
+        """
+        sql = batch.to_sql()
+        if batch.replace:
+            sql = f"BEGIN; DELETE FROM {batch.table}; {sql} COMMIT;"
+        response, requests_made = self._send_with_retry(
+            lambda: self.client.import_data(batch.table, sql))
+        if response is not None and response.status_code == 200:
+            return BatchResult(committed=len(batch), requests=requests_made, commits=1)
+
+        error = error_detail(response) if response is not None else "请求异常，重试次数已用完"
+        splittable = response is not None and response.status_code == 500 \
+            and not is_busy_response(response)
+
+        if splittable and len(batch) > 1 and not batch.replace:
+            mid = len(batch) // 2
+            result = BatchResult(requests=requests_made)
+            result.merge(self.send(batch.slice(0, mid)))
+            result.merge(self.send(batch.slice(mid, len(batch))))
+            return result
+
+        self.reject_log.write(batch, batch.values, error)
+        if response is None or is_busy_response(response):
+            return BatchResult(rejected=len(batch), requests=requests_made, retryable=True,
+                               pending=[(batch.offset, batch.offset + len(batch))])
+        return BatchResult(rejected=len(batch), requests=requests_made)
+
+    def send_envelope(self, batches):
+        """在一个事务里发送多个批次（columnar=True 时用列式载荷），返回每个批次的 BatchResult
+
+        服务器因确定性错误回滚整个信封（或还没有 /bulk 接口）时，逐批改用 send() 重发，
+        由二分定位出错的行；重试次数用完的临时错误则整个信封记为可重试的拒绝。
+        """
+        if self.columnar:
+            body = encode_envelope(batches)
+            tables = [batch.table for batch in batches]
+            request = lambda: self.client.bulk_import_columnar(body, tables)
+        else:
+            envelope = {"tables": [batch.payload() for batch in batches]}
+            request = lambda: self.client.bulk_import(envelope)
+        response, requests_made = self._send_with_retry(request)
+        if response is not None and response.status_code == 200:
+            results = [BatchResult(committed=len(batch)) for batch in batches]
+            results[0].requests = requests_made
+            results[0].commits = 1
+            return results
+
+        if response is not None and not is_busy_response(response):
+            results = [self.send(batch) for batch in batches]
+            results[0].requests += requests_made
+            return results
+
+        error = error_detail(response) if response is not None else "请求异常，重试次数已用完"
+        results = []
+        for batch in batches:
+            self.reject_log.write(batch, batch.values, error)
+            results.append(BatchResult(rejected=len(batch), retryable=True,
+                                       pending=[(batch.offset, batch.offset + len(batch))]))
+        results[0].requests = requests_made
+        return results
+
+    def _send_with_retry(self, request):
+        """发送一次请求，临时错误按指数退避重试；返回 (最后的响应, 请求次数)"""
+        response = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = request()
+            except (requests.RequestException, OSError):
+                # 只有连接、超时这类网络异常算临时错误；编码等程序错误直接抛出，不重试也不记为拒绝
+                response = None
+            else:
+                if not is_busy_response(response):
+                    return response, attempt + 1
+
+            if attempt < self.max_retries:
+                delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+                delay = max(delay * random.uniform(0.5, 1.0), retry_after_seconds(response))
+                time.sleep(delay)
+        return response, self.max_retries + 1
+
+
+_default_sender = None
+
+
+def send_batch(batch):
+    """用默认客户端发送一个批次（供同步脚本使用）"""
+    global _default_sender
+    if _default_sender is None:
+        _default_sender = BatchSender()
+    return _default_sender.send(batch)
@@ -0,0 +1,148 @@
+"""精确达成收入目标的订单金额抽样
+
+create_growth_trajectory_orders() 原来逐单用 remaining_target / remaining_orders 推算金额再截断，
+状态又在金额之后抽取，月目标总是差一截。这里一次性向量化地完成：
+1. 先抽状态，只有已完成订单计入收入
+2. 按金额档位和浮动抽出每单的相对大小（形状）
+3. 按形状把每组（天、周或月）的目标收入精确分配给组内已完成订单，满足金额上下限
+未完成订单按同组的比例取金额，不计入目标。百万级订单也只需几次整列运算。
+
+需要 numpy。
+"""
+from .sampling import Categorical
+from .vectorized import np, require_numpy
+
+BISECT_STEPS = 60
+
+
+class InfeasibleTarget(ValueError):
+    """目标收入无法在金额上下限内达成"""
+
+
+def _group_sum(group, values, groups):
+    return np.rint(np.bincount(group, weights=values, minlength=groups)).astype(np.int64)
+
+
+def allocate_exact(weights, group, targets, low, high):
+    """把每组的整数目标按权重分配给组内元素
+
+    返回整数数组 x：low <= x <= high，每组 x 之和恰好等于 targets[组]，x 与 weights 大致成正比。
+    先对每组的比例系数同时二分（向下取整后不超过目标的最大系数），再把剩下的几个单位
+    按小数部分从大到小逐个补给还有余量的元素。
+    """
+    require_numpy()
+    weights = np.asarray(weights, dtype=float)
+    group = np.asarray(group, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    n = len(weights)
+    groups = len(targets)
+    low = np.broadcast_to(np.asarray(low, dtype=np.int64), n)
+    high = np.broadcast_to(np.asarray(high, dtype=np.int64), n)
+
+    if np.any(targets < _group_sum(group, low, groups)) or np.any(targets > _group_sum(group, high, groups)):
+        raise InfeasibleTarget("目标收入超出该组订单金额上下限之和，无法精确达成")
+
+    # 系数上界：所有元素都取到上限
+    scale_high = np.zeros(groups)
+    np.maximum.at(scale_high, group, (high + 1) / np.maximum(weights, 1e-12))
+    scale_low = np.zeros(groups)
+    for _ in range(BISECT_STEPS):
+        middle = (scale_low + scale_high) / 2
+        x = np.clip(np.floor(weights * middle[group]), low, high)
+        over = _group_sum(group, x, groups) > targets
+        scale_high = np.where(over, middle, scale_high)
+        scale_low = np.where(over, scale_low, middle)
+
+    exact = weights * scale_low[group]
+    x = np.clip(np.floor(exact), low, high).astype(np.int64)
+    remainder = exact - np.floor(exact)
+
+    # 组内按 (有余量, 小数部分) 排序，每轮给排在前 residual 位的元素各加 1
+    while True:
+        residual = targets - _group_sum(group, x, groups)
+        if not residual.any():
+            return x
+        slack = x < high
+        order = np.lexsort((-remainder, ~slack, group))
+        sorted_group = group[order]
+        rank = np.arange(n) - np.searchsorted(sorted_group, np.arange(groups))[sorted_group]
+        give = order[(rank < residual[sorted_group]) & slack[order]]
+        x[give] += 1
+
+
+class RevenueSampler:
+    """按档位、折扣和状态比例抽样订单金额，每组已完成订单的实收（金额 - 折扣）之和精确等于目标
+
+    classes 是 [{"weight": 40, "min": 200, "max": 800}, ...]，只决定订单之间的相对大小，
+    实际金额由目标收入决定；min_amount / max_amount 是单笔订单金额的上下限。
+    折扣以 discount_rate 概率出现，金额在 [discount_min, min(discount_max, 金额 × discount_fraction)] 内。
+    """
+
+    def __init__(self, classes, statuses, status_weights, variation=(1, 1), min_amount=0, max_amount=None,
+                 discount_rate=0, discount_min=0, discount_max=0, discount_fraction=1):
+        require_numpy()
+        if "completed" not in statuses:
+            raise ValueError("statuses 必须包含 completed")
+        self.class_dist = Categorical(range(len(classes)), [c["weight"] for c in classes])
+        self.class_low = np.asarray([c["min"] for c in classes], dtype=np.int64)
+        self.class_high = np.asarray([c["max"] for c in classes], dtype=np.int64)
+        self.statuses = list(statuses)
+        self.status_dist = Categorical(self.statuses, status_weights)
+        self.completed = self.statuses.index("completed")
+        self.variation = variation
+        self.min_amount = min_amount or 0
+        self.max_amount = max_amount
+        self.discount_rate = discount_rate
+        self.discount_min = discount_min
+        self.discount_max = discount_max
+        self.discount_fraction = discount_fraction
+
+    def sample(self, rng, group, targets, multiplier=None):
+        """为每个订单抽样金额
+
+        group 是每个订单所属的组（0 .. len(targets)-1），targets 是每组已完成订单的目标实收；
+        multiplier 可以给每个订单再乘一个形状系数（如周末客单价更高）。
+        返回 dict：size_class、status、total_amount、discount_amount、final_amount（整数数组）。
+        """
+        group = np.asarray(group, dtype=np.int64)
+        targets = np.asarray(np.rint(targets), dtype=np.int64)
+        n = len(group)
+        groups = len(targets)
+
+        status = self.status_dist.sample(rng, n)
+        completed = status == self.completed
+        size_class = self.class_dist.sample(rng, n)
+        shape = rng.integers(self.class_low[size_class], self.class_high[size_class] + 1) \
+            * rng.uniform(self.variation[0], self.variation[1], size=n)
+        if multiplier is not None:
+            shape = shape * multiplier
+
+        # 按同组已完成订单的形状之和换算出大致金额，用来定折扣和未完成订单的金额
+        shape_sum = np.bincount(group, weights=np.where(completed, shape, 0), minlength=groups)
+        scale = targets / np.where(shape_sum > 0, shape_sum, 1)
+        provisional = np.clip(np.floor(shape * scale[group]), self.min_amount, self.max_amount)
+
+        has_discount = rng.random(size=n) < self.discount_rate
+        discount_high = np.minimum(self.discount_max, np.floor(provisional * self.discount_fraction + 1e-9))
+        discount_high = np.maximum(discount_high, self.discount_min).astype(np.int64)
+        discount_draw = (rng.random(size=n) * (discount_high - self.discount_min + 1)).astype(np.int64)
+        discount = np.where(has_discount, self.discount_min + discount_draw, 0)
+
+        # 已完成订单：实收精确分配，金额 = 实收 + 折扣 仍在上下限内，折扣不超过金额 × discount_fraction
+        final_low = np.maximum(self.min_amount - discount, 0)
+        if self.discount_fraction > 0:
+            final_low = np.maximum(final_low, np.ceil(discount / self.discount_fraction - 1e-9) - discount)
+        final_high = (self.max_amount - discount if self.max_amount is not None
+                      else np.maximum(targets[group], final_low))
+        total_amount = provisional.astype(np.int64)
+        total_amount[completed] = allocate_exact(
+            shape[completed], group[completed], targets,
+            final_low[completed], final_high[completed]) + discount[completed]
+
+        return {
+            "size_class": size_class,
+            "status": status,
+            "total_amount": total_amount,
+            "discount_amount": discount,
+            "final_amount": total_amount - discount,
+        }
@@ -0,0 +1,94 @@
+"""预编译的加权类别抽样（Walker/Vose 别名法）
+
+random.choices(values, weights=...)[0] 每次调用都要重新累加权重、再二分查找；
+生成器热循环里每个订单要调几次（规模、状态、明细行数），百万订单就是几百万次重建。
+别名表在导入时按权重建好一次，之后每次抽样只需一个均匀随机数和一次比较：
+    ORDER_SIZE.draw(rng)              # 逐单：rng 是 random.Random 或 random 模块
+    ORDER_SIZE.sample(np_rng, n)      # 向量化：返回类别下标数组，np_rng 是 numpy.random.Generator
+
+向量化时只有几个类别，NumPy 里对预先算好的累积分布做 searchsorted 比别名表的两次取下标更快，
+sample() 用的是前者，结果与 Generator.choice(n, p=...) 逐位相同，原有种子的输出不变。
+
+生成器用到的分布都在这里定义，权重与原来的 random.choices 调用一一对应。
+"""
+try:
+    import numpy as np
+except ImportError:  # 可选依赖，只有 sample() 需要
+    np = None
+
+
+class Categorical:
+    """一个加权类别分布的别名表
+
+    prob[i] 是落在第 i 格时取 values[i] 的概率，否则取 values[alias[i]]；
+    draw() 把一个 [0, n) 的均匀数拆成格号和格内位置，只消耗一个 rng.random()。
+    """
+
+    def __init__(self, values, weights):
+        if len(values) != len(weights) or not values:
+            raise ValueError("values 和 weights 长度必须相同且不为空")
+        total = sum(weights)
+        if total <= 0 or min(weights) < 0:
+            raise ValueError("权重必须非负且总和大于 0")
+        self.values = list(values)
+        self.weights = list(weights)
+        n = len(values)
+        scaled = [w * n / total for w in weights]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1 - scaled[s]
+            (small if scaled[l] < 1 else large).append(l)
+        # 剩下的格子（含浮点误差留下的）概率都是 1
+        self._cdf = None
+
+    def __len__(self):
+        return len(self.values)
+
+    def draw(self, rng):
+        """抽一个值，rng 是 random.Random 或 random 模块"""
+        u = rng.random() * len(self.prob)
+        i = int(u)
+        return self.values[i] if u - i < self.prob[i] else self.values[self.alias[i]]
+
+    def draw_index(self, rng):
+        """抽一个类别下标"""
+        u = rng.random() * len(self.prob)
+        i = int(u)
+        return i if u - i < self.prob[i] else self.alias[i]
+
+    def sample(self, rng, size):
+        """一次抽 size 个类别下标（int64 数组），rng 是 numpy.random.Generator"""
+        if np is None:
+            raise RuntimeError("向量化抽样需要 numpy：pip install numpy")
+        if self._cdf is None:
+            # 与 Generator.choice(p=...) 内部的算法相同，只是不必每次调用都重新归一化和校验
+            weights = np.asarray(self.weights, dtype=float)
+            cdf = (weights / weights.sum()).cumsum()
+            self._cdf = cdf / cdf[-1]
+        return self._cdf.searchsorted(rng.random(size), side="right")
+
+    def take(self, indexes):
+        """把 sample() 的下标数组换成对应的值数组"""
+        return np.asarray(self.values)[indexes]
+
+
+# 销售订单（generate-million-revenue-data.py、vectorized.py）：小单多，大单少
+ORDER_SIZE = Categorical(["small", "medium", "large", "bulk"], [40, 35, 20, 5])
+# 92%完成，6%待处理，2%取消
+SALES_STATUS = Categorical(["completed", "pending", "cancelled"], [92, 6, 2])
+SALES_ITEM_COUNT = Categorical([1, 2, 3, 4], [50, 30, 15, 5])
+
+# 采购订单
+PURCHASE_TYPE = Categorical(["regular", "large", "bulk"], [60, 30, 10])
+PURCHASE_STATUS = Categorical(["completed", "pending"], [85, 15])
+PURCHASE_ITEM_COUNT = Categorical([1, 2, 3], [40, 40, 20])
+
+# scale-to-million.py 的演示销售订单
+DEMO_SALES_STATUS = Categorical(["completed", "pending", "cancelled"], [90, 8, 2])
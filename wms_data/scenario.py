@@ -0,0 +1,319 @@
+"""声明式造数场景
+
+各造数脚本把数据形态写死在循环里：generate-million-revenue-data.py 是平稳的月销100万，
+create-investor-grade-data.py 是 6 个月的增长轨迹，fix-reports-and-dates.py 是 20→78 单/天的线性爬坡。
+这里把形态统一描述成一个 JSON 场景文件（示例见 scenarios/ 目录），由同一个编译后的向量化生成器执行：
+- period：多少个周期单位（如 6 个月），每个单位多少天，最后一天距基准日期几天
+- orders：每天的单量曲线（from→to 线性变化加随机抖动），或每个单位的订单总数
+- revenue：每个单位已完成订单的收入目标（可选，由 RevenueSampler 精确达成）
+- weekday：按星期几（周一起）的单量和金额系数
+- amounts / discount / status_mix / catalog 等：金额档位、折扣、状态比例、客户和仓库范围
+新的负载形态（例如 12 个月、50 家门店）只需要一个新的场景文件，用 generate-scenario-data.py 运行。
+"""
+import json
+from datetime import timedelta
+
+from .revenue import RevenueSampler
+from .shards import shard_seed
+from .sampling import Categorical
+from .vectorized import SalesOrderArrays, np, probabilities, require_numpy
+
+# 场景生成的销售订单列，与 backend/src/database/init.ts 的 sales_orders 对应
+SCENARIO_COLUMNS = [
+    "order_no", "customer_id", "warehouse_id", "order_date", "total_amount", "discount_amount",
+    "final_amount", "paid_amount", "total_cost", "gross_profit", "profit_margin",
+    "payment_status", "status", "remarks",
+]
+
+DEFAULTS = {
+    "period": {"units": 1, "unit_days": 30, "end_days_ago": 0},
+    "weekday": {"orders": [1] * 7, "amounts": [1] * 7},
+    "amounts": {"classes": [{"weight": 1, "min": 500, "max": 3000}],
+                "variation": [1, 1], "trend": [1, 1], "min": 0, "max": None},
+    "discount": {"rate": 0, "min": 0, "max": 0, "max_fraction": 1},
+    "tax_rate": 0,
+    "cost_ratio": 0.6,
+    "status_mix": {"completed": 1},
+    "catalog": {"customers": [1, 6], "warehouses": [1, 2]},
+    "order_no": {"prefix": "SO", "start": 10001},
+    "hours": None,
+    "payment_status": "paid",
+    "remarks": "Demo数据",
+}
+
+
+class ScenarioError(ValueError):
+    """场景文件格式错误"""
+
+
+def load_scenario(path):
+    """读取并编译场景文件"""
+    with open(path, encoding="utf-8") as f:
+        try:
+            spec = json.load(f)
+        except ValueError as e:
+            raise ScenarioError(f"{path} 不是合法的 JSON：{e}")
+    return compile_scenario(spec)
+
+
+def compile_scenario(spec):
+    """校验场景描述并预先算好生成用到的查找表，返回 Scenario"""
+    require_numpy()
+    return Scenario(spec)
+
+
+def _section(spec, key):
+    """读取一个对象类型的配置段，未给出的字段取默认值"""
+    value = spec.get(key, {})
+    if not isinstance(value, dict):
+        raise ScenarioError(f"{key} 应该是一个对象")
+    unknown = set(value) - set(DEFAULTS[key])
+    if unknown:
+        raise ScenarioError(f"{key} 中有未知字段：{', '.join(sorted(unknown))}")
+    return {**DEFAULTS[key], **value}
+
+
+def _range(value, name):
+    if not (isinstance(value, (list, tuple)) and len(value) == 2 and value[0] <= value[1]):
+        raise ScenarioError(f"{name} 应该是 [最小值, 最大值]")
+    return value
+
+
+def _per_unit(value, units, name):
+    """单个数值对每个单位都一样，列表则逐个单位给出"""
+    values = value if isinstance(value, list) else [value] * units
+    if len(values) != units:
+        raise ScenarioError(f"{name} 应该有 {units} 个值（每个周期单位一个）")
+    return np.asarray(values, dtype=float)
+
+
+class Scenario:
+    """编译后的场景：按周期单位逐个生成订单列数组"""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.name = spec.get("name", "scenario")
+        self.description = spec.get("description", "")
+
+        period = _section(spec, "period")
+        self.units = int(period["units"])
+        self.unit_days = int(period["unit_days"])
+        self.end_days_ago = int(period["end_days_ago"])
+        if self.units < 1 or self.unit_days < 1:
+            raise ScenarioError("period.units 和 period.unit_days 必须大于 0")
+        self.days = self.units * self.unit_days
+
+        orders = spec.get("orders")
+        if not isinstance(orders, dict) or len(set(orders) & {"per_day", "per_unit"}) != 1:
+            raise ScenarioError("orders 需要且只能指定 per_day 或 per_unit 之一")
+        if "per_day" in orders:
+            per_day = orders["per_day"]
+            self.daily_from = float(per_day["from"])
+            self.daily_to = float(per_day.get("to", per_day["from"]))
+            self.jitter = _range(per_day.get("jitter", [0, 0]), "orders.per_day.jitter")
+            self.unit_orders = None
+        else:
+            self.unit_orders = _per_unit(orders["per_unit"], self.units, "orders.per_unit").astype(np.int64)
+
+        revenue = spec.get("revenue")
+        self.revenue_targets = (_per_unit(revenue["per_unit"], self.units, "revenue.per_unit")
+                                if revenue else None)
+
+        weekday = _section(spec, "weekday")
+        self.weekday_orders = np.asarray(weekday["orders"], dtype=float)
+        self.weekday_amounts = np.asarray(weekday["amounts"], dtype=float)
+        if len(self.weekday_orders) != 7 or len(self.weekday_amounts) != 7:
+            raise ScenarioError("weekday.orders 和 weekday.amounts 应该各有 7 个值（周一到周日）")
+
+        amounts = _section(spec, "amounts")
+        classes = amounts["classes"]
+        if not classes:
+            raise ScenarioError("amounts.classes 不能为空")
+        self.class_names = [c.get("name", f"class{i}") for i, c in enumerate(classes)]
+        self.class_dist = Categorical(range(len(classes)), [c["weight"] for c in classes])
+        self.class_low = np.asarray([c["min"] for c in classes], dtype=np.int64)
+        self.class_high = np.asarray([c["max"] for c in classes], dtype=np.int64)
+        if np.any(self.class_low > self.class_high):
+            raise ScenarioError("amounts.classes 中有 min 大于 max 的档位")
+        self.variation = _range(amounts["variation"], "amounts.variation")
+        self.trend = amounts["trend"]
+        self.amount_min = amounts["min"] or 0
+        self.amount_max = amounts["max"]
+
+        self.discount = _section(spec, "discount")
+        self.tax_rate = float(spec.get("tax_rate", DEFAULTS["tax_rate"]))
+        self.cost_ratio = float(spec.get("cost_ratio", DEFAULTS["cost_ratio"]))
+
+        status_mix = spec.get("status_mix", DEFAULTS["status_mix"])
+        self.statuses = list(status_mix)
+        self.status_dist = Categorical(self.statuses, list(status_mix.values()))
+        if "completed" not in self.statuses:
+            raise ScenarioError("status_mix 必须包含 completed")
+
+        catalog = _section(spec, "catalog")
+        self.customers = _range(catalog["customers"], "catalog.customers")
+        self.warehouses = _range(catalog["warehouses"], "catalog.warehouses")
+
+        order_no = _section(spec, "order_no")
+        self.order_prefix = order_no["prefix"]
+        self.first_order_number = int(order_no["start"])
+        self.hours = _range(spec["hours"], "hours") if spec.get("hours") else None
+        self.payment_status = spec.get("payment_status", DEFAULTS["payment_status"])
+        self.remarks = spec.get("remarks", DEFAULTS["remarks"])
+
+        if self.revenue_targets is not None:
+            if self.tax_rate:
+                raise ScenarioError("revenue 目标按不含税实收计算，不能与 tax_rate 同时使用")
+            self.sampler = RevenueSampler(
+                classes, self.statuses, list(status_mix.values()), variation=self.variation,
+                min_amount=self.amount_min, max_amount=self.amount_max,
+                discount_rate=self.discount["rate"], discount_min=self.discount["min"],
+                discount_max=self.discount["max"], discount_fraction=self.discount["max_fraction"],
+            )
+
+    def start_date(self, as_of):
+        """周期第一天"""
+        return as_of - timedelta(days=self.end_days_ago + self.days - 1)
+
+    def unit_rng(self, seed, unit):
+        """每个周期单位独立的随机数流，由主种子和单位序号派生"""
+        return np.random.default_rng(shard_seed(seed, (self.name, unit)))
+
+    def units_orders(self, seed, as_of):
+        """按时间顺序逐个周期单位产出 ScenarioOrders，内存只与单个单位的订单数有关"""
+        start = self.start_date(as_of)
+        first_number = self.first_order_number
+        for unit in range(self.units):
+            orders = self.generate_unit(self.unit_rng(seed, unit), unit,
+                                        start + timedelta(days=unit * self.unit_days), first_number)
+            first_number += len(orders)
+            yield orders
+
+    def _daily_counts(self, rng, unit, weekday):
+        if self.unit_orders is not None:
+            # 单位内订单总数固定，按星期系数随机分到各天
+            return rng.multinomial(self.unit_orders[unit], probabilities(self.weekday_orders[weekday]))
+        # from→to 在整个周期上线性变化，加抖动后乘星期系数（取整方式与原脚本一致）
+        day_index = unit * self.unit_days + np.arange(self.unit_days)
+        position = day_index / max(self.days - 1, 1)
+        base = (self.daily_from + (self.daily_to - self.daily_from) * position).astype(np.int64)
+        counts = base + rng.integers(self.jitter[0], self.jitter[1] + 1, size=self.unit_days)
+        return np.maximum((counts * self.weekday_orders[weekday]).astype(np.int64), 0)
+
+    def generate_unit(self, rng, unit, unit_start, first_order_number):
+        day_dates = [unit_start + timedelta(days=d) for d in range(self.unit_days)]
+        weekday = np.array([d.weekday() for d in day_dates])
+        day = np.repeat(np.arange(self.unit_days), self._daily_counts(rng, unit, weekday))
+        n = len(day)
+
+        customer_id = rng.integers(self.customers[0], self.customers[1] + 1, size=n)
+        warehouse_id = rng.integers(self.warehouses[0], self.warehouses[1] + 1, size=n)
+        if self.hours:
+            hour = rng.integers(self.hours[0], self.hours[1] + 1, size=n)
+            minute = rng.integers(0, 60, size=n)
+        else:
+            hour = minute = np.zeros(n, dtype=np.int64)
+
+        position = (unit * self.unit_days + day) / max(self.days - 1, 1)
+        trend = self.trend[0] + (self.trend[1] - self.trend[0]) * position
+        multiplier = self.weekday_amounts[weekday][day] * trend
+
+        if self.revenue_targets is not None:
+            # 有收入目标：金额、折扣、状态一起抽样，已完成订单的实收精确等于目标
+            sampled = self.sampler.sample(rng, np.zeros(n, dtype=np.int64), [self.revenue_targets[unit]],
+                                          multiplier=multiplier)
+            size_class = sampled["size_class"]
+            status = sampled["status"]
+            total_amount = sampled["total_amount"]
+            discount_amount = sampled["discount_amount"]
+        else:
+            # 档位 → 区间内均匀取整，乘浮动、星期系数和整体趋势后取整
+            size_class = self.class_dist.sample(rng, n)
+            base_amount = rng.integers(self.class_low[size_class], self.class_high[size_class] + 1)
+            variation = rng.uniform(self.variation[0], self.variation[1], size=n)
+            total_amount = np.clip((base_amount * variation * multiplier).astype(np.int64),
+                                   self.amount_min, self.amount_max)
+            status = self.status_dist.sample(rng, n)
+
+            # 折扣：rate 概率出现，金额在 [min, min(max, 金额 × max_fraction)] 内均匀取整
+            discount_draw = rng.random(size=n)
+            high = np.minimum(self.discount["max"], np.floor(total_amount * self.discount["max_fraction"] + 1e-9))
+            high = np.maximum(high, self.discount["min"]).astype(np.int64)
+            discount = self.discount["min"] + (rng.random(size=n) * (high - self.discount["min"] + 1)).astype(np.int64)
+            discount_amount = np.where(discount_draw < self.discount["rate"], discount, 0)
+
+        return ScenarioOrders(self, unit, unit_start, day_dates, day, {
+            "order_number": first_order_number + np.arange(n),
+            "hour": hour,
+            "minute": minute,
+            "customer_id": customer_id,
+            "warehouse_id": warehouse_id,
+            "size_class": size_class,
+            "total_amount": total_amount,
+            "tax_amount": np.round(total_amount * self.tax_rate, 2) if self.tax_rate else np.zeros(n, dtype=np.int64),
+            "discount_amount": discount_amount,
+            "status": status,
+        })
+
+
+class ScenarioOrders(SalesOrderArrays):
+    """一个周期单位的订单列数组，rows() 按 SCENARIO_COLUMNS 渲染"""
+
+    def __init__(self, scenario, unit, start_date, day_dates, day, columns):
+        super().__init__(start_date, day_dates, day, columns)
+        self.scenario = scenario
+        self.unit = unit
+
+    @property
+    def final_amount(self):
+        if not self.scenario.tax_rate:
+            return self.total_amount - self.discount_amount
+        return np.round(self.total_amount + self.tax_amount - self.discount_amount, 2)
+
+    @property
+    def completed(self):
+        return self.status == self.scenario.statuses.index("completed")
+
+    @property
+    def remarks(self):
+        units_ago = self.scenario.units - self.unit
+        return self.scenario.remarks.format(unit=self.unit + 1, units_ago=units_ago)
+
+    def rows(self, start=0, end=None):
+        part = slice(start, end)
+        scenario = self.scenario
+        date_prefix, date_text, clock = self._text_tables()
+
+        day = self.day[part]
+        order_no = np.char.add(np.char.add(f"{scenario.order_prefix}-", date_prefix[day]),
+                               np.char.add("-", self.order_number[part].astype(str)))
+        if scenario.hours:
+            order_date = np.char.add(date_text[day], clock[self.hour[part] * 60 + self.minute[part]])
+        else:
+            order_date = np.char.rstrip(date_text[day])
+
+        total = self.total_amount[part]
+        final = self.final_amount[part]
+        total_cost = np.round(total * scenario.cost_ratio).astype(np.int64)
+        gross_profit = np.round(final - total_cost, 2) if scenario.tax_rate else final - total_cost
+        margin = np.where(final > 0, np.round(gross_profit / np.where(final > 0, final, 1) * 100), 0)
+        status = np.asarray(scenario.statuses)[self.status[part]]
+        final_list = final.tolist()
+        n = len(day)
+
+        return list(zip(
+            order_no.tolist(),
+            self.customer_id[part].tolist(),
+            self.warehouse_id[part].tolist(),
+            order_date.tolist(),
+            total.tolist(),
+            self.discount_amount[part].tolist(),
+            final_list,
+            final_list,
+            total_cost.tolist(),
+            gross_profit.tolist(),
+            margin.astype(np.int64).tolist(),
+            [scenario.payment_status] * n,
+            status.tolist(),
+            [self.remarks] * n,
+        ))
@@ -0,0 +1,82 @@
+"""与 backend/src/database/init.ts 对应的表结构信息"""
+import functools
+import os
+import re
+import sqlite3
+
+# 取当前时间的列默认值在 SQLite 中的文本格式
+TIME_DEFAULTS = {"CURRENT_TIMESTAMP": "%Y-%m-%d %H:%M:%S", "CURRENT_DATE": "%Y-%m-%d"}
+
+# 每张表依赖的父表（外键），导入时父表的批次必须先提交
+FOREIGN_KEYS = {
+    "items": [],
+    "suppliers": [],
+    "customers": [],
+    "warehouses": [],
+    "purchase_orders": ["suppliers", "warehouses"],
+    "purchase_order_items": ["purchase_orders", "items"],
+    "sales_orders": ["customers", "warehouses"],
+    "sales_order_items": ["sales_orders", "items"],
+    "inventory": ["items", "warehouses"],
+    "inventory_transactions": ["items", "warehouses"],
+}
+
+INIT_TS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       "backend", "src", "database", "init.ts")
+
+# initDatabase() 中 db.run(`...`) 的 SQL 模板字符串
+_DB_RUN = re.compile(r"db\.run\(\s*`(.*?)`", re.S)
+
+
+def init_statements(path=INIT_TS):
+    """从 init.ts 的 initDatabase() 中取出建表和默认数据语句，按执行顺序返回
+
+    直接读后端源码而不是另抄一份 DDL，离线建出的库与后端启动时建的库结构一致。
+    ALTER TABLE 迁移针对的是旧库，新库的建表语句里已经有这些列，这里跳过。
+    """
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    body = source[source.index("initDatabase"):source.index("require.main === module")]
+    statements = []
+    for sql in _DB_RUN.findall(body):
+        sql = sql.strip()
+        if sql.upper().startswith(("CREATE TABLE", "INSERT")):
+            statements.append(sql)
+    return statements
+
+
+@functools.lru_cache(maxsize=None)
+def table_columns(table, path=INIT_TS):
+    """init.ts 中一张表的列，按建表顺序：[(列名, 类型, NOT NULL, 默认值表达式, 是否主键)]"""
+    create = _init_tables(path).get(table)
+    if create is None:
+        raise ValueError(f"init.ts 中没有表 {table}")
+    return create_columns(create, table)
+
+
+def create_columns(create_sql, table):
+    """CREATE TABLE 语句定义的列（格式同 table_columns），交给 SQLite 解析而不是自己切分列定义"""
+    db = sqlite3.connect(":memory:")
+    try:
+        db.execute(create_sql)
+        quoted = table.replace('"', '""')
+        return [(name, kind, bool(notnull), default, bool(pk))
+                for _, name, kind, notnull, default, pk in db.execute(f'PRAGMA table_info("{quoted}")')]
+    finally:
+        db.close()
+
+
+@functools.lru_cache(maxsize=None)
+def _init_tables(path):
+    tables = {}
+    for sql in init_statements(path):
+        match = re.match(r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)', sql, re.I)
+        if match:
+            tables[match.group(1)] = sql
+    return tables
+
+
+def pinned_default(default, now):
+    """列默认值取当前时间（CURRENT_TIMESTAMP、CURRENT_DATE）时换成 now 的文本，其他默认值返回 None"""
+    fmt = TIME_DEFAULTS.get((default or "").upper())
+    return now.strftime(fmt) if fmt and now is not None else None
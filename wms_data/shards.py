@@ -0,0 +1,87 @@
+"""按种子复现、分片并行的数据生成
+
+数据按天或按月切成分片，每个分片用 (主种子, 分片键) 派生出自己独立的随机数流：
+分片的结果只取决于主种子和分片参数，与它在哪个进程、以什么顺序执行无关。
+run_shards() 把分片分发到进程池，再按分片顺序产出结果，所以同一个种子无论用几个进程，
+生成的数据都逐字节相同，而生成耗时随核数下降。
+
+主种子由 random 派生：脚本传 --seed 时可以在不同环境间复现，
+断点续跑时 SeedJournal 恢复随机数状态，主种子和各分片的结果也都不变。
+"""
+import hashlib
+import itertools
+import multiprocessing
+import os
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+# 一个分片最多生成的订单数：分片结果整体留在内存里（最多 2 * workers 个），
+# 订单再多也只是分片变多，内存上限不变
+MAX_SHARD_ORDERS = 20000
+# split_count 每次抽取的订单数，千万订单也不会先攒出千万个下标
+_SPLIT_CHUNK = 65536
+
+
+def shard_seed(seed, key):
+    """由主种子和分片键派生分片种子（SHA-256，各分片之间互不相关）"""
+    digest = hashlib.sha256(f"{seed}:{key!r}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:16], "big")
+
+
+def shard_random(seed, key):
+    """分片专用的 random.Random"""
+    return random.Random(shard_seed(seed, key))
+
+
+def split_count(rng, total, weights):
+    """把 total 个订单按权重随机分到各分片，与逐单独立抽取所属分片的分布相同"""
+    counts = [0] * len(weights)
+    population = range(len(weights))
+    cum_weights = list(itertools.accumulate(weights))
+    # 分块抽取与一次抽 total 个消耗同样的随机数，结果相同
+    for start in range(0, total, _SPLIT_CHUNK):
+        for index in rng.choices(population, cum_weights=cum_weights, k=min(_SPLIT_CHUNK, total - start)):
+            counts[index] += 1
+    return counts
+
+
+def split_shard(key, count, limit=MAX_SHARD_ORDERS):
+    """把一个分片的 count 个订单切成不超过 limit 个的子分片，返回 [(key, 订单数, 在分片内的偏移)]
+
+    第一个子分片沿用原来的 key，订单数不超过 limit 时与不切分完全相同（同一种子的结果不变）。
+    """
+    parts = [(key, min(count, limit), 0)]
+    for part, offset in enumerate(range(limit, count, limit), 1):
+        parts.append((key + (part,), min(limit, count - offset), offset))
+    return parts
+
+
+def _run_shard(func, seed, key, args):
+    return func(shard_random(seed, key), *args)
+
+
+def run_shards(func, shards, seed, workers=DEFAULT_WORKERS):
+    """按 shards 的顺序逐个产出 func(rng, *args)
+
+    shards 是 (key, args) 列表，key 在同一次生成中唯一，如 ("sales_orders", 3)。
+    func 必须是模块顶层函数（要传给子进程）；workers <= 1 时直接在当前进程执行。
+    最多 2 * workers 个分片同时在生成或等待消费，内存与分片总数无关。
+    """
+    shards = list(shards)
+    if workers <= 1 or len(shards) <= 1:
+        for key, args in shards:
+            yield _run_shard(func, seed, key, args)
+        return
+
+    # 主进程里可能已有发送请求的线程，fork 会把它们持有的锁带进子进程，所以用 spawn
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(min(workers, len(shards)), mp_context=context) as pool:
+        pending = deque()
+        for key, args in shards:
+            pending.append(pool.submit(_run_shard, func, seed, key, args))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
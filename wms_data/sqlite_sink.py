@@ -0,0 +1,204 @@
+"""离线造数：批次直接写进 wms.db 兼容的 SQLite 文件
+
+给新部署准备数据库时，所有造数原来也要经 HTTP 调用 /api/data-import/import 一批批回放。
+这里用 Python 自带的 sqlite3 直接写文件：
+- 新文件按 init.ts 的 initDatabase() 建表并写入同样的默认数据（见 schema.init_statements）
+- 每个分片一次事务，同一张表的行用 executemany 走同一条预编译语句
+- 写入期间用 WAL 日志、关闭同步；二级索引先删掉，全部写完后一次建好
+- 传了 now 时，取当前时间的列默认值（created_at、updated_at 等）固定写成 now，同一种子两次生成的库相同
+- 关闭时合并 WAL 并切回 DELETE 日志模式，得到一个可以直接拷到 backend/database/wms.db 的单文件
+
+百万订单的库在本地一分钟内就能建好，部署时直接发这个文件，不用再回放。
+"""
+import os
+import sqlite3
+import time
+
+from .orders import Product
+from .schema import init_statements, pinned_default
+
+# 报表和明细查询用到的二级索引，批量写入之后再建（init.ts 没有建索引，这些只是加速查询）
+DEFERRED_INDEXES = {
+    "idx_sales_orders_order_date": "sales_orders (order_date)",
+    "idx_sales_orders_customer_id": "sales_orders (customer_id)",
+    "idx_sales_order_items_order_id": "sales_order_items (order_id)",
+    "idx_sales_order_items_item_id": "sales_order_items (item_id)",
+    "idx_purchase_orders_order_date": "purchase_orders (order_date)",
+    "idx_purchase_order_items_order_id": "purchase_order_items (order_id)",
+    "idx_inventory_item_warehouse": "inventory (item_id, warehouse_id)",
+    "idx_inventory_transactions_item_id": "inventory_transactions (item_id)",
+}
+
+DEFAULT_SHARD_ROWS = 100000
+
+STATS_TABLES = ["items", "suppliers", "customers", "warehouses", "sales_orders", "sales_order_items",
+                "purchase_orders", "purchase_order_items", "inventory"]
+
+
+class SqliteSink:
+    """把 InsertBatch 直接写进 SQLite 文件的导入目标
+
+    用法：
+        with SqliteSink("wms.db") as sink:
+            sink.write_shard(batches)   # 一个分片一次事务
+            sink.import_all(batches)    # 或者按 shard_rows 行自动分片，可替代 BulkImporter
+    """
+
+    def __init__(self, path, indexes=DEFERRED_INDEXES, verbose=True, now=None):
+        self.path = path
+        self.now = now
+        self.indexes = indexes
+        self.verbose = verbose
+        self.rows = {}
+        self.transactions = 0
+        self.started = time.perf_counter()
+        self._pinned = {}
+
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # 整个文件写坏了重新生成即可，写入期间不必每次提交都落盘
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.execute("PRAGMA cache_size=-262144")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+
+        fresh = self.conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table'").fetchone()[0] == 0
+        if fresh:
+            self.conn.execute("BEGIN")
+            for sql in init_statements():
+                self.conn.execute(sql)
+            # 默认数据的时间列同样固定成 now
+            for (table,) in self.conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND name != 'sqlite_sequence'").fetchall():
+                pinned = self._pinned_columns(table)
+                if pinned:
+                    self.conn.execute(f"UPDATE {table} SET {', '.join(f'{name} = ?' for name, _ in pinned)}",
+                                      [value for _, value in pinned])
+            self.conn.execute("COMMIT")
+        for name in self.indexes:
+            self.conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _pinned_columns(self, table):
+        """表中默认值取当前时间的列及固定的值 [(列名, now 的文本)]，没有传 now 时为空"""
+        pinned = self._pinned.get(table)
+        if pinned is None:
+            pinned = []
+            for _, name, _, _, default, _ in self.conn.execute(f"PRAGMA table_info({table})").fetchall():
+                value = pinned_default(default, self.now)
+                if value is not None:
+                    pinned.append((name, value))
+            self._pinned[table] = pinned
+        return pinned
+
+    def _insert(self, batch):
+        if batch.replace:
+            self.conn.execute(f"DELETE FROM {batch.table}")
+        if batch.typed:
+            columns = batch.column_names
+            values = batch.values
+            # 批次没有给出的时间列补上固定的 now，不让 SQLite 取写入时的时间
+            extra = [(name, value) for name, value in self._pinned_columns(batch.table) if name not in columns]
+            if extra:
+                columns = columns + [name for name, _ in extra]
+                tail = tuple(value for _, value in extra)
+                values = [tuple(row) + tail for row in values]
+            placeholders = ", ".join("?" * len(columns))
+            self.conn.executemany(
+                f"INSERT INTO {batch.table} ({', '.join(columns)}) VALUES ({placeholders})", values)
+        else:
+            self.conn.execute(batch.to_sql())
+        self.rows[batch.table] = self.rows.get(batch.table, 0) + len(batch.values)
+
+    def write_shard(self, batches):
+        """在一个事务中写入一个分片的全部批次，出错时整个分片回滚，返回写入的行数"""
+        count = 0
+        self.conn.execute("BEGIN")
+        try:
+            for batch in batches:
+                if batch.values:
+                    self._insert(batch)
+                    count += len(batch.values)
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+        self.transactions += 1
+        return count
+
+    def import_all(self, batches, shard_rows=DEFAULT_SHARD_ROWS):
+        """写入一个批次迭代器：相邻批次凑满 shard_rows 行作为一个分片提交（与 BulkImporter.import_all 对应）"""
+        shard = []
+        rows = 0
+        for batch in batches:
+            shard.append(batch)
+            rows += len(batch.values)
+            if rows >= shard_rows:
+                self.write_shard(shard)
+                shard = []
+                rows = 0
+        if shard:
+            self.write_shard(shard)
+        if self.verbose:
+            print(f"🗄️ 已写入 {self.path}：{self.summary()}")
+
+    def allocate_ids(self, table_name, count):
+        """预留 count 个连续主键，返回 (start, end)，与后端 /data-import/allocate-ids 的做法相同
+
+        用保存点而不是 BEGIN，在 write_shard 的事务中（边生成边写入时）也能调用。
+        """
+        self.conn.execute("SAVEPOINT allocate_ids")
+        last = self.conn.execute(
+            f"SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = ?), 0), "
+            f"COALESCE((SELECT MAX(id) FROM {table_name}), 0))", (table_name,)).fetchone()[0]
+        end = last + count
+        if not self.conn.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = ?", (end, table_name)).rowcount:
+            self.conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table_name, end))
+        self.conn.execute("RELEASE allocate_ids")
+        return last + 1, end
+
+    def catalog(self):
+        """库里售价和进价都大于 0 的商品（与 orders.fetch_catalog 对应）"""
+        return [Product(*row) for row in self.conn.execute(
+            "SELECT id, sale_price, purchase_price FROM items "
+            "WHERE sale_price > 0 AND purchase_price > 0 ORDER BY id")]
+
+    def inventory(self):
+        """库里现有的库存 [(item_id, warehouse_id, quantity, avg_cost)]（与 inventory.fetch_inventory 对应）"""
+        return self.conn.execute(
+            "SELECT item_id, warehouse_id, quantity, avg_cost FROM inventory ORDER BY item_id, warehouse_id").fetchall()
+
+    def clear(self, table):
+        """清空一张表（替换整表的批次不必先调用，写入时会在同一个事务里删掉旧行）"""
+        self.conn.execute(f"DELETE FROM {table}")
+
+    def get_stats(self):
+        """各表记录数（与 ApiClient.get_stats 对应）"""
+        return {table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in STATS_TABLES}
+
+    def summary(self):
+        total = sum(self.rows.values())
+        elapsed = time.perf_counter() - self.started
+        rate = total / elapsed if elapsed > 0 else 0
+        return f"{total:,} 行，{self.transactions} 次事务，耗时 {elapsed:.1f}s，{rate:,.0f} 行/s"
+
+    def close(self):
+        """建好推迟的索引，合并 WAL 并切回单文件的 DELETE 日志模式"""
+        if self.conn is None:
+            return
+        start = time.perf_counter()
+        for name, target in self.indexes.items():
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+        self.conn.execute("ANALYZE")
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.conn.execute("PRAGMA journal_mode=DELETE")
+        self.conn.close()
+        self.conn = None
+        if self.verbose:
+            size = os.path.getsize(self.path) / 1024 / 1024
+            print(f"🗄️ 索引建立耗时 {time.perf_counter() - start:.1f}s，{self.path} 共 {size:.1f} MB")
@@ -0,0 +1,56 @@
+"""NDJSON 流式导入
+
+把行生成器直接编码成分块传输的 NDJSON 请求体发给 /api/data-import/stream：
+- 不再拼接 INSERT 语句，也不需要先攒出 batch_values 列表，客户端内存与总行数无关
+- 服务器边接收边用预编译语句插入，整个请求在一个事务中提交
+
+请求体格式：对象行 {"tableName": ..., "columns": [...]} 切换当前表，数组行 [...] 是一行数据。
+"""
+import json
+
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+# 攒够这么多字节再交给 requests 发送一块，避免每行一个 TCP 写
+DEFAULT_CHUNK_BYTES = 64 * 1024
+
+
+class RowStream:
+    """可迭代的 NDJSON 请求体
+
+    sections 是 (表名, 列名列表, 行迭代器) 的可迭代对象，按顺序编码；
+    发送过程中 rows / bytes / tables 记录已编码的行数和字节数，可用于进度和统计。
+    """
+
+    def __init__(self, sections, chunk_bytes=DEFAULT_CHUNK_BYTES, progress_every=None):
+        self.sections = sections
+        self.chunk_bytes = chunk_bytes
+        self.progress_every = progress_every
+        self.rows = 0
+        self.bytes = 0
+        self.tables = {}
+
+    def __iter__(self):
+        chunk = []
+        size = 0
+        for table, columns, rows in self.sections:
+            header = json.dumps({"tableName": table, "columns": list(columns)}, ensure_ascii=False)
+            chunk.append(header + "\n")
+            size += len(header) + 1
+            for row in rows:
+                line = json.dumps(list(row), ensure_ascii=False, separators=(",", ":"))
+                chunk.append(line + "\n")
+                size += len(line) + 1
+                self.rows += 1
+                self.tables[table] = self.tables.get(table, 0) + 1
+                if self.progress_every and self.rows % self.progress_every == 0:
+                    print(f"📤 已发送 {self.rows:,} 行")
+                if size >= self.chunk_bytes:
+                    yield self._encode(chunk)
+                    chunk = []
+                    size = 0
+        if chunk:
+            yield self._encode(chunk)
+
+    def _encode(self, chunk):
+        data = "".join(chunk).encode("utf-8")
+        self.bytes += len(data)
+        return data
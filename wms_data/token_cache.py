@@ -0,0 +1,83 @@
+"""登录 token 的磁盘缓存
+
+cron 里接连运行多个导数/修复脚本时，每个脚本启动都要 /api/auth/login 一次。
+token 连同过期时间（从 JWT 的 exp 读出）按 "接口地址 + 用户名" 缓存到本地文件，
+过期前一段时间内一直复用；服务器返回 401/403 时由客户端重新登录并刷新缓存。
+"""
+import base64
+import json
+import os
+import threading
+import time
+
+DEFAULT_TOKEN_CACHE = os.environ.get(
+    "WMS_TOKEN_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "wms-data", "token.json"))
+# 距离过期不足这么多秒的 token 不再复用
+EXPIRY_MARGIN = 300
+
+
+def jwt_expiry(token):
+    """读取 JWT 的 exp（不校验签名），读不出时返回 None"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenCache:
+    """以 JSON 文件保存的 token 缓存，文件权限 0600"""
+
+    def __init__(self, path=DEFAULT_TOKEN_CACHE, margin=EXPIRY_MARGIN):
+        self.path = path
+        self.margin = margin
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, entries):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.replace(tmp, self.path)
+
+    def get(self, key):
+        """返回仍然有效的缓存 token，没有或即将过期时返回 None"""
+        with self._lock:
+            entry = self._load().get(key)
+        if not entry or entry.get("expires_at", 0) - self.margin <= time.time():
+            return None
+        return entry.get("token")
+
+    def put(self, key, token):
+        """缓存 token；读不出过期时间的 token 不缓存"""
+        expires_at = jwt_expiry(token)
+        if expires_at is None:
+            return
+        with self._lock:
+            entries = self._load()
+            entries = {k: v for k, v in entries.items() if v.get("expires_at", 0) > time.time()}
+            entries[key] = {"token": token, "expires_at": expires_at}
+            try:
+                self._save(entries)
+            except OSError as e:
+                print(f"⚠️ 无法写入 token 缓存 {self.path}: {e}")
+
+    def discard(self, key):
+        with self._lock:
+            entries = self._load()
+            if entries.pop(key, None) is not None:
+                try:
+                    self._save(entries)
+                except OSError:
+                    pass
@@ -0,0 +1,167 @@
+"""NumPy 向量化的订单生成
+
+generate_realistic_sales_data() 逐单调用 random.*、逐行拼 f-string，千万级订单要跑几个小时。
+这里按整段日期一次性生成 NumPy 数组：
+- 加权类别（订单规模、状态）用预编译的别名表（sampling.Categorical）一次抽完
+- 规模对应的金额区间、浮动系数、税费、折扣掩码都是整列运算
+- 订单号、下单时间用查表和字符串数组拼接
+分布与逐单循环完全相同（同样的区间、权重、取整方式），千万订单只需几秒。
+
+numpy 是可选依赖，只有用到向量化生成时才需要安装。
+"""
+from datetime import timedelta
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖
+    np = None
+
+from .sampling import ORDER_SIZE, SALES_STATUS
+
+# 订单规模：权重与金额区间（含两端），与 generate_realistic_sales_data() 一致
+SIZE_CLASSES = ORDER_SIZE.values
+SIZE_WEIGHTS = ORDER_SIZE.weights
+SIZE_LOW = [200, 800, 2000, 5000]
+SIZE_HIGH = [800, 2000, 5000, 15000]
+
+STATUSES = SALES_STATUS.values
+STATUS_WEIGHTS = SALES_STATUS.weights
+
+WEEKDAY_MULTIPLIER = 0.9
+WEEKEND_MULTIPLIER = 1.3
+WEEKEND_ORDER_BOOST = 1.2
+DISCOUNT_RATE = 0.25
+TAX_RATE = 0.15
+
+SALES_ORDER_COLUMNS = (
+    "order_no, customer_id, warehouse_id, order_date, total_amount, tax_amount, "
+    "discount_amount, status, created_by"
+)
+
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("向量化生成需要 numpy：pip install numpy")
+
+
+def probabilities(weights):
+    weights = np.asarray(weights, dtype=float)
+    return weights / weights.sum()
+
+
+class SalesOrderArrays:
+    """一段日期内全部销售订单的列数组
+
+    day 是每个订单所在的天（相对 start_date 的下标），其余属性与 sales_orders 的列一一对应。
+    """
+
+    def __init__(self, start_date, day_dates, day, columns):
+        self.start_date = start_date
+        self.day_dates = day_dates
+        self.day = day
+        self._tables = None
+        for name, values in columns.items():
+            setattr(self, name, values)
+
+    def __len__(self):
+        return len(self.day)
+
+    @property
+    def final_amount(self):
+        return self.total_amount + self.tax_amount - self.discount_amount
+
+    @property
+    def completed(self):
+        return self.status == STATUSES.index("completed")
+
+    def day_bounds(self):
+        """每天订单在数组中的 [起, 止) 下标"""
+        ends = np.cumsum(np.bincount(self.day, minlength=len(self.day_dates)))
+        return np.concatenate(([0], ends[:-1])), ends
+
+    def daily_revenue(self, completed_only=False):
+        weights = np.where(self.completed, self.final_amount, 0) if completed_only else self.final_amount
+        return np.bincount(self.day, weights=weights, minlength=len(self.day_dates))
+
+    def _text_tables(self):
+        """订单号日期前缀、日期文本和时刻文本的查找表（只构造一次）"""
+        if self._tables is None:
+            seconds = self.start_date.strftime("%S")
+            self._tables = (
+                np.array([d.strftime("%Y%m%d") for d in self.day_dates]),
+                np.array([d.strftime("%Y-%m-%d ") for d in self.day_dates]),
+                np.array([f"{h:02d}:{m:02d}:{seconds}" for h in range(24) for m in range(60)]),
+            )
+        return self._tables
+
+    def rows(self, start=0, end=None):
+        """渲染成 sales_orders 的行元组（列顺序同 SALES_ORDER_COLUMNS）"""
+        part = slice(start, end)
+        date_prefix, date_text, clock = self._text_tables()
+
+        day = self.day[part]
+        order_no = np.char.add(np.char.add("SO-", date_prefix[day]),
+                               np.char.add("-", self.order_number[part].astype(str)))
+        order_date = np.char.add(date_text[day], clock[self.hour[part] * 60 + self.minute[part]])
+        status = np.asarray(STATUSES)[self.status[part]]
+
+        return list(zip(
+            order_no.tolist(),
+            self.customer_id[part].tolist(),
+            self.warehouse_id[part].tolist(),
+            order_date.tolist(),
+            self.total_amount[part].tolist(),
+            self.tax_amount[part].tolist(),
+            self.discount_amount[part].tolist(),
+            status.tolist(),
+            [1] * len(day),
+        ))
+
+
+def sales_order_arrays(rng, start_date, days, daily_orders=(50, 80), first_order_number=10001):
+    """生成 start_date 起 days 天的销售订单，返回 SalesOrderArrays
+
+    rng 是 numpy.random.Generator。
+    """
+    require_numpy()
+    day_dates = [start_date + timedelta(days=d) for d in range(days)]
+    weekend = np.array([d.weekday() >= 5 for d in day_dates])
+
+    # 每天的订单数（周末多两成）
+    counts = rng.integers(daily_orders[0], daily_orders[1] + 1, size=days)
+    counts = np.where(weekend, (counts * WEEKEND_ORDER_BOOST).astype(np.int64), counts)
+    day = np.repeat(np.arange(days), counts)
+    n = len(day)
+
+    # 营业时间 9:00-20:59
+    hour = rng.integers(9, 21, size=n)
+    minute = rng.integers(0, 60, size=n)
+    customer_id = rng.integers(1, 7, size=n)
+    warehouse_id = rng.integers(1, 3, size=n)
+
+    # 规模 → 金额区间内均匀取整，再乘日常波动和周末系数后取整
+    size_class = ORDER_SIZE.sample(rng, n)
+    base_amount = rng.integers(np.asarray(SIZE_LOW)[size_class], np.asarray(SIZE_HIGH)[size_class] + 1)
+    variation = rng.uniform(0.8, 1.2, size=n)
+    multiplier = np.where(weekend, WEEKEND_MULTIPLIER, WEEKDAY_MULTIPLIER)[day]
+    total_amount = (base_amount * variation * multiplier).astype(np.int64)
+
+    tax_amount = np.round(total_amount * TAX_RATE, 2)
+    has_discount = rng.random(size=n) < DISCOUNT_RATE
+    discount_high = np.minimum(200, total_amount // 10)
+    discount_amount = np.where(has_discount, rng.integers(10, np.maximum(discount_high, 10) + 1), 0)
+
+    status = SALES_STATUS.sample(rng, n)
+
+    return SalesOrderArrays(start_date, day_dates, day, {
+        "order_number": first_order_number + np.arange(n),
+        "hour": hour,
+        "minute": minute,
+        "customer_id": customer_id,
+        "warehouse_id": warehouse_id,
+        "size_class": size_class,
+        "total_amount": total_amount,
+        "tax_amount": tax_amount,
+        "discount_amount": discount_amount,
+        "status": status,
+    })